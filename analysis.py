@@ -0,0 +1,1104 @@
+import argparse
+import os
+import sys
+from collections import Counter
+from datetime import datetime, timedelta
+
+import numpy as np
+import pandas as pd
+
+from config import get_config
+from macd import (apply_macd, first_changed_row, update_macd, resume_state, load_macd_state, save_macd_state,
+                  DAILY_PARAMS as DAILY_MACD_PARAMS, WEEKLY_PARAMS as WEEKLY_MACD_PARAMS)
+from krx_codes import CodeResolver, load_code_table, merge_code_tables, append_code_changes, load_code_changes
+from fetcher import RateLimiter, PageReport, map_concurrently, plan_pages
+from http_client import HttpClient, parse_host_overrides
+from http_cache import get_cache
+from storage import get_store, MemoryCachedStore, PRICE_COLUMNS
+from panel import open_panel, build_panel
+from indicators import apply_indicators
+from resample import resample_weekly, period_keys
+from trading_calendar import load_calendar
+from naver_parser import parse_sise_day_pages, page_dates
+from screener import screen_universe
+from pipeline import CpuStage, resolve_workers
+from manifest import RunManifest, source_version, file_size
+from notifier import DiscordNotifier
+from tracing import get_tracer, span, traced, count, trace_path
+
+# 공유 객체 (처음 사용할 때 설정값으로 생성)
+_http_client = None
+_page_report = None
+_store = None
+_panel = None
+_calendar = None
+_manifest = None
+
+
+def get_http_client():
+    """
+    모든 네트워크 호출이 공유하는 HTTP 클라이언트 (커넥션 풀, 타임아웃, 재시도, 호스트별 속도 제한)
+    HTTP_HOST_OVERRIDES로 특정 호스트를 로컬 스텁 서버로 대체할 수 있고,
+    HTTP_CACHE를 켜면 KRX/네이버 응답을 HTTP_CACHE_DIR에 저장해 두고 다시 사용한다.
+    """
+    global _http_client
+    if _http_client is None:
+        config = get_config()
+        _http_client = HttpClient(
+            pool_size=max(10, config.fetch_workers),
+            rate_limiter=RateLimiter(config.fetch_rate),
+            host_overrides=parse_host_overrides(config.host_overrides),
+            cache=get_cache(config.http_cache, config.http_cache_dir, config.http_cache_max_mb),
+        )
+    return _http_client
+
+
+def get_page_report():
+    """종목별 네이버 시세 페이지 요청 현황"""
+    global _page_report
+    if _page_report is None:
+        _page_report = PageReport()
+    return _page_report
+
+
+def get_price_store():
+    """종목별 일간/주간 시세 저장소"""
+    global _store
+    if _store is None:
+        config = get_config()
+        _store = get_store(config.storage_format, 'stock_data', config.storage_export_csv)
+    return _store
+
+
+def get_price_panel():
+    """
+    전 종목 시세 패널 (PRICE_PANEL을 켰을 때만, 꺼져 있으면 None)
+    stock_data/panel이 없으면 저장된 일간 시세로 처음 한 번 만든다.
+    """
+    global _panel
+    if _panel is None and get_config().price_panel:
+        _panel = open_panel(mode='r+')
+        if _panel is None:
+            print("시세 패널 생성 중: stock_data/panel")
+            with span('panel.build'):
+                _panel = build_panel(get_price_store())
+    return _panel
+
+
+def keep_prices_in_memory():
+    """
+    시세 저장소를 메모리 캐시로 감쌈 (상주 모드용)
+    한 번 읽거나 저장한 종목 시세는 메모리에 두고 다시 읽지 않는다. (저장은 파일에도 그대로 함)
+    """
+    global _store
+    store = get_price_store()
+    if not isinstance(store, MemoryCachedStore):
+        _store = MemoryCachedStore(store)
+    return _store
+
+
+def get_calendar():
+    """KRX 거래일 달력 (stock_data/krx_holidays.csv 휴장일 테이블 기반)"""
+    global _calendar
+    if _calendar is None:
+        _calendar = load_calendar('stock_data')
+    return _calendar
+
+# 실행 매니페스트 파일과, 코드 버전(해시)에 포함하는 모듈 (결과 계산에 쓰이는 모듈)
+MANIFEST_PATH = os.path.join('stock_data', 'run_manifest.json')
+MANIFEST_MODULES = ('analysis', 'macd', 'resample', 'indicators', 'storage', 'naver_parser')
+
+def get_run_manifest():
+    """종목별 실행 매니페스트 (RUN_MANIFEST를 껐으면 None)"""
+    global _manifest
+    if _manifest is None and get_config().run_manifest:
+        version = source_version([sys.modules[name].__file__ for name in MANIFEST_MODULES])
+        _manifest = RunManifest(MANIFEST_PATH, version)
+    return _manifest
+
+# KRX 종목 목록 조회 설정
+KRX_URL = 'http://data.krx.co.kr/comm/bldAttendant/getJsonData.cmd'
+KRX_HEADERS = {
+    'Referer': 'http://data.krx.co.kr/contents/MDC/MDI/mdiLoader',
+    'User-Agent': 'Mozilla/5.0',
+    'X-Requested-With': 'XMLHttpRequest'
+}
+KRX_CODE_LISTS = {
+    'stock': {
+        'label': '일반 주식',
+        'key': 'OutBlock_1',
+        'params': {'bld': 'dbms/MDC/STAT/standard/MDCSTAT01901', 'mktId': 'ALL', 'share': '1', 'csvxls_isNo': 'false'},
+    },
+    'etf': {
+        'label': 'ETF',
+        'key': 'output',  # 'OutBlock_1' 대신 'output' 사용
+        'params': {'bld': 'dbms/MDC/STAT/standard/MDCSTAT04301', 'locale': 'ko_KR', 'share': '1', 'money': '1',
+                   'csvxls_isNo': 'false'},
+    },
+}
+KRX_CODE_COLUMNS = ['name', 'code', 'kind']
+KRX_CHANGES_FILE = 'krx_code_changes.csv'
+KRX_CHANGE_LABELS = {'listed': '신규 상장', 'delisted': '상장폐지', 'renamed': '이름 변경'}
+KRX_DEBUG_DIR = 'debug'  # 조회 실패 시 KRX 응답을 저장할 디렉토리
+
+@traced()
+def get_krx_code(market=None, force_update=False):
+    """
+    주식 종목 코드 조회 (ETF 포함)
+    force_update: True일 경우 캐시된 파일을 무시하고 새로 데이터를 가져옴
+    
+    일반 주식과 ETF 목록을 동시에 받아 저장된 코드표와 비교하고, 신규 상장/상장폐지/이름 변경이 있을 때만
+    krx_code.csv를 다시 쓰고 krx_code_changes.csv에 변경 내역을 추가한다.
+    """
+    # 캐시 파일 경로
+    cache_dir = 'stock_data'
+    if not os.path.exists(cache_dir):
+        os.makedirs(cache_dir)
+    cache_file = os.path.join(cache_dir, 'krx_code.csv')
+    
+    # 오늘 날짜
+    today = datetime.now().date()
+    
+    # 캐시된 파일이 있고 오늘 생성된 것이면 그것을 사용
+    if not force_update and os.path.exists(cache_file):
+        file_mtime = datetime.fromtimestamp(os.path.getmtime(cache_file)).date()
+        if file_mtime == today:
+            print(f"캐시된 종목 코드 데이터 사용 (생성일: {file_mtime})")
+            with span('get_krx_code.read_cache'):
+                return pd.read_csv(cache_file, dtype={'code': str})
+    
+    print("KRX에서 종목 코드 데이터 새로 가져오기...")
+    
+    # 일반 주식/ETF 목록을 동시에 조회 (실패한 목록은 예외 객체)
+    kinds = list(KRX_CODE_LISTS)
+    results = map_concurrently(fetch_krx_list, [(kind,) for kind in kinds], len(kinds))
+    fetched = {}
+    for kind, result in zip(kinds, results):
+        label = KRX_CODE_LISTS[kind]['label']
+        if isinstance(result, Exception):
+            print(f"{label} 데이터 조회 실패: {str(result)}")
+            fetched[kind] = None
+        else:
+            print(f"{label} 데이터 조회 성공: {len(result)}개")
+            fetched[kind] = result
+    
+    # 저장된 코드표와 비교 (조회에 실패한 목록은 저장된 행 유지)
+    old_rows = load_code_table(cache_file) if os.path.exists(cache_file) else []
+    try:
+        rows, changes = merge_code_tables(old_rows, fetched)
+    except ValueError:
+        raise Exception("주식 및 ETF 데이터를 모두 가져오는데 실패했습니다.")
+    code_df = pd.DataFrame(rows, columns=KRX_CODE_COLUMNS)
+    count('rows.krx_codes', len(code_df))
+    
+    # 바뀐 내용이 있을 때만 저장 (없으면 오늘 확인했다는 표시로 수정 시각만 갱신)
+    upgraded = bool(old_rows) and 'kind' not in old_rows[0]
+    if changes or upgraded or not os.path.exists(cache_file):
+        with span('get_krx_code.save_cache'):
+            code_df.to_csv(cache_file, index=False)
+            version = append_code_changes(os.path.join(cache_dir, KRX_CHANGES_FILE), changes if old_rows else [],
+                                          today.isoformat())
+        summary = Counter(change['change'] for change in changes) if old_rows else {}
+        detail = ', '.join(f"{KRX_CHANGE_LABELS[name]} {summary[name]}개" for name in KRX_CHANGE_LABELS if summary.get(name))
+        print(f"전체 {len(code_df)}개 종목 데이터 저장 완료: {cache_file}"
+              + (f" (변경 내역 {version}: {detail})" if version else ''))
+    else:
+        os.utime(cache_file)
+        print(f"종목 코드 변경 없음: {len(code_df)}개 종목 (저장 생략)")
+    
+    return code_df
+
+def fetch_krx_list(kind):
+    """
+    KRX 종목 목록 하나 조회 (kind: stock 또는 etf)
+    반환값: [(종목코드, 종목명), ...]
+    응답에 종목이 없으면 (전부 상장폐지로 처리되지 않도록) 예외를 발생시킨다.
+    """
+    spec = KRX_CODE_LISTS[kind]
+    params = dict(spec['params'])
+    if kind == 'etf':
+        params['trdDd'] = datetime.now().strftime('%Y%m%d')
+    response = None
+    try:
+        with span(f'get_krx_code.fetch_{kind}'):
+            response = get_http_client().post(KRX_URL, data=params, headers=KRX_HEADERS)
+            data = response.json()
+        rows = data.get(spec['key'])
+        if not rows:
+            message = data.get('message', '') if isinstance(data, dict) else ''
+            raise ValueError(f"응답에 '{spec['key']}' 목록이 없습니다. {message}".strip())
+        return [(str(row['ISU_SRT_CD']).zfill(6), row['ISU_ABBRV']) for row in rows]
+    except Exception:
+        if response is not None:
+            os.makedirs(KRX_DEBUG_DIR, exist_ok=True)
+            debug_file = os.path.join(KRX_DEBUG_DIR, f'{kind}_api_error.txt')
+            with open(debug_file, 'w', encoding='utf-8') as f:
+                f.write(f"Status Code: {response.status_code}\n\n")
+                f.write(response.text[:10000])  # 처음 10000자만 저장
+            print(f"오류 응답이 {debug_file}에 저장되었습니다.")
+        raise
+
+# 프로세스 내에서 재사용하는 종목코드 변환기
+_code_resolver = None
+_code_resolver_date = None
+
+def get_code_resolver(force_update=False):
+    """
+    종목명/종목코드 변환기 조회
+    최초 호출 시 get_krx_code() 결과로 생성하고 이후에는 재사용
+    (종목 코드 캐시가 하루 단위로 갱신되므로 날짜가 바뀌면 다시 생성)
+    """
+    global _code_resolver, _code_resolver_date
+    today = datetime.now().date()
+    if _code_resolver is None or force_update or _code_resolver_date != today:
+        code_df = get_krx_code(force_update=force_update)
+        with span('get_code_resolver.build'):
+            _code_resolver = CodeResolver(code_df, load_code_changes(os.path.join('stock_data', KRX_CHANGES_FILE)))
+        _code_resolver_date = today
+    return _code_resolver
+
+def is_trading_day(date):
+    """
+    주어진 날짜가 거래일인지 확인
+    - 주말(토,일) 제외
+    - 휴장일(공휴일, 연말 휴장일 등) 제외
+    """
+    return get_calendar().is_trading_day(date)
+
+def calculate_macd_daily(df):
+    """
+    일간 MACD 지표 계산 (12, 26, 9)
+    
+    1. MACD Line = 12일 EMA - 26일 EMA
+    2. Signal Line = MACD Line의 9일 EMA
+    3. MACD Histogram = MACD Line - Signal Line (편향 보정 없음)
+    """
+    return apply_macd(df, DAILY_MACD_PARAMS)
+
+def calculate_macd_weekly(df):
+    """
+    주간 MACD 지표 계산 (12, 26, 9)
+    
+    1. MACD Line = 12일 EMA - 26일 EMA (알파값: 2 / (기간 + 1.15))
+    2. Signal Line = MACD Line의 9일 EMA
+    3. MACD Histogram = MACD Line - Signal Line - 1.0 (편향 보정 적용)
+    """
+    return apply_macd(df, WEEKLY_MACD_PARAMS)
+
+def load_daily_data(code):
+    """저장된 일간 데이터 로드 (없으면 빈 데이터프레임)"""
+    return get_price_store().load(code, 'daily')
+
+# 분석에 쓰는 최근 일간 시세 기간 (주)
+RECENT_WEEKS = 30
+
+def macd_state_path(code, timeframe):
+    """종목의 일간/주간 MACD 상태 파일 경로"""
+    return os.path.join('stock_data', f'{code}_{timeframe}_macd.json')
+
+def can_load_window():
+    """
+    최근 구간만 읽어도 되는지 (지표 계산, 메모리 캐시 저장소, 시세 패널은 전체 시세가 필요)
+    """
+    config = get_config()
+    return not (config.indicators or config.price_panel or isinstance(get_price_store(), MemoryCachedStore))
+
+def load_price_window(code, timeframe, since, min_rows, params):
+    """
+    저장된 시세 중 since 이후 행과 최소 min_rows개의 마지막 행만 로드 (가격은 int32로 줄여서)
+    저장된 MACD 상태가 마지막 행과 일치해야 그 뒤의 행을 이어서 계산할 수 있으므로,
+    상태가 없거나 맞지 않으면 전체를 로드한다.
+    반환값: (데이터프레임, offset) - offset은 구간 첫 행의 전체 시세상 위치 (전체를 읽었으면 0)
+    """
+    store = get_price_store()
+    if can_load_window():
+        state = load_macd_state(macd_state_path(code, timeframe))
+        if state and state.get('rows'):
+            df = store.load_tail(code, timeframe, since, min_rows, PRICE_COLUMNS)
+            offset = state['rows'] - len(df)
+            if not df.empty and offset >= 0 and resume_state(df, len(df), state, params, offset) is not None:
+                count(f'rows.{timeframe}_skipped', offset)
+                return df, offset
+    return store.load(code, timeframe), 0
+
+def load_daily_window(code, weeks=RECENT_WEEKS):
+    """
+    일간 시세 중 이번 실행에 필요한 구간만 로드 (load_price_window 참고)
+    최근 weeks + 1주와, 오늘 행을 다시 계산할 때 필요한 마지막 두 행
+    """
+    since = datetime.now() - timedelta(weeks=weeks + 1)
+    return load_price_window(code, 'daily', since, 2, DAILY_MACD_PARAMS)
+
+def get_pages_to_fetch(existing_df, num_of_pages, refresh_today=False):
+    """
+    네이버에서 가져와야 할 일별 시세 페이지 수 계산
+    - 기존 데이터가 없으면 num_of_pages 전체
+    - 마지막 데이터 이후의 거래일 수를 담을 수 있는 만큼 (페이지당 10행)
+    - 업데이트가 필요 없으면 0
+    - refresh_today: 마지막 행이 오늘이면 (장중에 받은 값일 수 있으므로) 다시 받음
+    """
+    if existing_df.empty:
+        return num_of_pages  # 전체 데이터 가져오기
+    return get_pages_after(existing_df['date'].max(), num_of_pages, refresh_today)
+
+def get_pages_after(latest_date, num_of_pages, refresh_today=False):
+    """마지막 저장 날짜가 latest_date일 때 가져와야 할 일별 시세 페이지 수 (get_pages_to_fetch 참고)"""
+    # 최신 데이터 날짜와 오늘 사이의 거래일 수 계산 (휴장일만 지났으면 요청하지 않음)
+    today = pd.Timestamp.now().normalize()
+    trading_days = get_calendar().trading_days_between(latest_date, today)
+    if refresh_today and latest_date >= today:
+        trading_days += 1
+    return plan_pages(trading_days, num_of_pages)
+
+def get_legacy_pages(existing_df, num_of_pages):
+    """이전 방식(주말만 제외하고 업데이트 시 항상 2페이지)으로 요청했을 페이지 수 (비교용)"""
+    if existing_df.empty:
+        return num_of_pages
+    latest_date = existing_df['date'].max()
+    today = pd.Timestamp.now().normalize()
+    weekdays = pd.bdate_range(latest_date + pd.Timedelta(days=1), today)
+    return 2 if len(weekdays) else 0
+
+def reaches_stored_rows(page, latest_date):
+    """조회한 페이지가 이미 저장된 날짜까지 내려왔는지 확인"""
+    if latest_date is None:
+        return False
+    dates = page_dates(page)
+    return not dates.empty and dates.min() <= latest_date
+
+def fetch_daily_page(code, page):
+    """네이버 일별 시세 한 페이지 조회 (HTML 반환)"""
+    page_url = f"http://finance.naver.com/item/sise_day.nhn?code={code}&page={page}"
+    with span('naver.fetch_page', code=code, page=page):
+        response = get_http_client().get(page_url, headers={'User-agent': 'Mozilla/5.0'})
+        response.encoding = 'euc-kr'
+        count('naver.pages')
+        return response.text
+
+def parse_daily_pages(pages):
+    """
+    조회한 일별 시세 페이지(HTML)들을 하나의 데이터프레임으로 정리
+    전일비(diff)는 상승/하락 표시에 따라 부호가 있는 값
+    """
+    with span('naver.parse_pages', pages=len(pages)):
+        df = parse_sise_day_pages(pages)
+    count('rows.parsed', len(df))
+    return df
+
+def fetch_daily_prices(code, pages_to_fetch, latest_date=None, max_pages=None):
+    """
+    네이버 일별 시세를 1페이지부터 순서대로 조회
+    - latest_date가 주어지면 저장된 날짜에 닿는 페이지에서 바로 멈춤
+      (계획한 페이지로 부족하면 max_pages까지 더 조회)
+    - latest_date가 없으면 pages_to_fetch 페이지까지 조회
+    """
+    if latest_date is None or max_pages is None:
+        max_pages = pages_to_fetch
+    
+    pages = []
+    for page_no in range(1, max(pages_to_fetch, max_pages) + 1):
+        page = fetch_daily_page(code, page_no)
+        pages.append(page)
+        if reaches_stored_rows(page, latest_date):
+            break
+    return pages
+
+@traced()
+def prefetch_stock_prices(codes, num_of_pages, max_workers=None, refresh_today=False, parse=True, on_ready=None):
+    """
+    여러 종목의 일별 시세 페이지를 병렬로 미리 조회
+    
+    1. 종목별로 거래일 간격에 맞춰 계획한 페이지를 한꺼번에 작업으로 만들어
+       최대 max_workers개씩 동시에 요청한다. (호스트별 요청 간격은 FETCH_RATE로 제한)
+       최초 조회 종목의 페이지들도 서로 독립적이므로 모두 병렬로 요청된다.
+    2. 업데이트 종목 중 아직 저장된 날짜까지 닿지 못한 종목만 다음 페이지를 이어서 요청한다.
+    refresh_today: 오늘 날짜로 저장된 행도 다시 조회 (get_pages_to_fetch 참고)
+    parse: False면 페이지를 파싱하지 않고 'new_df' 대신 'pages'(HTML 목록 또는 None)로 돌려줌
+           (파싱을 CPU 단계 작업 프로세스에서 하도록)
+    on_ready: 종목의 조회가 끝나는 대로 on_ready(종목코드, 결과)를 호출 (다음 단계와 겹쳐 실행하도록)
+    반환값: {종목코드: {'existing_df': 기존 데이터, 'new_df': 새로 조회한 데이터 또는 None,
+                      'offset': 기존 데이터가 최근 구간일 때 첫 행의 위치 (load_daily_window 참고)}}
+           조회에 실패한 종목은 값 자리에 예외 객체가 들어간다.
+    """
+    if max_workers is None:
+        max_workers = get_config().fetch_workers
+    
+    results = {}
+    plans = {}
+    offsets = {}
+    
+    def finish(code, pages):
+        """조회가 끝난 종목의 결과 정리"""
+        existing_df = plans[code][0]
+        error = next((page for page in pages if isinstance(page, Exception)), None)
+        if error is not None:
+            results[code] = error
+        elif not parse:
+            results[code] = {'existing_df': existing_df, 'pages': pages or None, 'offset': offsets[code]}
+        else:
+            try:
+                new_df = parse_daily_pages(pages) if pages else None
+                results[code] = {'existing_df': existing_df, 'new_df': new_df, 'offset': offsets[code]}
+            except Exception as e:
+                results[code] = e
+        if on_ready is not None:
+            on_ready(code, results[code])
+    
+    with span('prefetch_stock_prices.load'):
+        for code in dict.fromkeys(codes):
+            try:
+                existing_df, offsets[code] = load_daily_window(code)
+                latest_date = existing_df['date'].max() if not existing_df.empty else None
+                plans[code] = (existing_df, latest_date, get_pages_to_fetch(existing_df, num_of_pages, refresh_today))
+            except Exception as e:
+                results[code] = e
+                if on_ready is not None:
+                    on_ready(code, e)
+    
+    fetched = {code: [] for code, (_, _, pages_to_fetch) in plans.items() if pages_to_fetch}
+    tasks = [(code, page) for code in fetched for page in range(1, plans[code][2] + 1)]
+    print(f"일별 시세 병렬 조회: {len(plans)}개 종목, {len(tasks)}개 페이지 (동시 요청 {max_workers}개)")
+    
+    # 조회할 페이지가 없는 종목은 바로 완료
+    for code in plans:
+        if code not in fetched:
+            finish(code, [])
+    
+    while tasks:
+        with span('prefetch_stock_prices.fetch', pages=len(tasks)):
+            for (code, _), page in zip(tasks, map_concurrently(fetch_daily_page, tasks, max_workers)):
+                fetched[code].append(page)
+        
+        # 저장된 날짜까지 닿지 못한 업데이트 종목만 다음 페이지 요청, 나머지는 완료
+        pending = {code for code, _ in tasks}
+        tasks = []
+        for code, pages in fetched.items():
+            if code not in pending:
+                continue
+            latest_date = plans[code][1]
+            if (latest_date is None or len(pages) >= num_of_pages
+                    or any(isinstance(page, Exception) for page in pages)
+                    or reaches_stored_rows(pages[-1], latest_date)):
+                finish(code, pages)
+                continue
+            tasks.append((code, len(pages) + 1))
+    
+    for code, (existing_df, _, pages_to_fetch) in plans.items():
+        pages = fetched.get(code, [])
+        get_page_report().record(code, pages_to_fetch, len(pages), get_legacy_pages(existing_df, num_of_pages))
+    get_page_report().print_report()
+    return {code: results[code] for code in dict.fromkeys(codes)}
+
+def merge_daily_prices(existing_df, new_df, refresh_today=False, sort_date=True):
+    """
+    기존 일간 시세와 새로 조회한 시세 병합 (기존 마지막 날짜 이후 행만 추가, refresh_today면 오늘 행 교체)
+    반환값: (병합한 시세, 추가/교체할 새 행 수 - 기존 시세가 없으면 None)
+    """
+    new_rows = None
+    if existing_df.empty:
+        # 마지막 페이지를 넘겨 요청하면 마지막 페이지가 다시 오므로 처음 조회한 데이터도 중복 제거
+        df = new_df.drop_duplicates(subset=['date'], keep='last')
+    else:
+        # 새로운 데이터에서 기존 데이터의 날짜 이후 데이터만 선택 (refresh_today면 오늘 행 포함)
+        latest_date = existing_df['date'].max()
+        if refresh_today and latest_date >= pd.Timestamp.now().normalize():
+            new_df = new_df[new_df['date'] >= latest_date]
+        else:
+            new_df = new_df[new_df['date'] > latest_date]
+        new_rows = len(new_df)
+        
+        # 중복 제거하면서 데이터 병합
+        df = pd.concat([existing_df, new_df])
+        df = df.drop_duplicates(subset=['date'], keep='last')
+    
+    # 날짜 기준으로 정렬
+    if sort_date:
+        df = df.sort_values(by='date').reset_index(drop=True)
+    return df, new_rows
+
+@traced()
+def get_stock_price(code, num_of_pages, sort_date = True, prefetched = None, refresh_today = False,
+                    recent_weeks = RECENT_WEEKS):
+    """
+    일간 시세 업데이트 및 MACD 계산
+    prefetched: prefetch_stock_prices()로 미리 조회한 결과. 주어지면 네트워크 요청 없이 사용
+    refresh_today: 오늘 날짜로 저장된 행을 새로 조회한 값으로 교체 (장중 조회 후 갱신용)
+    recent_weeks: 최근 몇 주의 데이터를 돌려줄지 (None이면 전체)
+    
+    기존 시세는 가능하면 최근 구간만 읽고(load_daily_window), 저장된 MACD 상태에서 이어서 계산한 뒤
+    바뀐 행만 파일 끝에 다시 쓴다. 저장된 기간이 길어져도 읽고 쓰는 양과 메모리 사용량이 늘지 않는다.
+    """
+    # 데이터를 저장할 디렉토리 생성
+    data_dir = 'stock_data'
+    if not os.path.exists(data_dir):
+        os.makedirs(data_dir)
+    
+    # MACD 상태 파일 경로
+    state_path = macd_state_path(code, 'daily')
+    
+    # 기존 데이터 로드 및 업데이트 필요 여부 확인
+    if prefetched is not None:
+        existing_df = prefetched['existing_df']
+        offset = prefetched.get('offset', 0)
+        new_df = prefetched['new_df']
+        need_update = new_df is not None
+    else:
+        with span('get_stock_price.load'):
+            existing_df, offset = load_daily_window(code)
+        pages_to_fetch = get_pages_to_fetch(existing_df, num_of_pages, refresh_today)
+        need_update = pages_to_fetch > 0
+    
+    # 최신 데이터 날짜 확인
+    latest_date = existing_df['date'].max() if not existing_df.empty else pd.Timestamp.min
+    
+    # 오늘 날짜
+    today = pd.Timestamp.now().normalize()
+    
+    # 새로운 데이터를 저장할 데이터프레임
+    df = pd.DataFrame()
+    
+    # 데이터 업데이트가 필요한 경우
+    if need_update:
+        print(f"데이터 업데이트 중: {code}")
+        print(f"최근 데이터 날짜: {latest_date.strftime('%Y-%m-%d')}")
+        print(f"현재 날짜: {today.strftime('%Y-%m-%d')}")
+        
+        if prefetched is None:
+            # 최소한의 페이지만 가져오기 (저장된 날짜에 닿으면 중단)
+            latest = None if existing_df.empty else latest_date
+            with span('get_stock_price.fetch', code=code):
+                pages = fetch_daily_prices(code, pages_to_fetch, latest, num_of_pages)
+            get_page_report().record(code, pages_to_fetch, len(pages), get_legacy_pages(existing_df, num_of_pages))
+            new_df = parse_daily_pages(pages)
+        
+        # 기존 데이터와 새로운 데이터 병합
+        df, new_rows = merge_daily_prices(existing_df, new_df, refresh_today, sort_date)
+        if new_rows is not None:
+            print(f"새로운 데이터 수: {new_rows} 행")
+        
+        # MACD 계산 (기존 행은 저장된 상태를 이어받고 새로 추가된 행만 계산)
+        start = first_changed_row(existing_df, df)
+        macd_state = load_macd_state(state_path)
+        if offset and resume_state(df, start, macd_state, DAILY_MACD_PARAMS, offset) is None:
+            # 구간 안에서 이어서 계산할 수 없으면 (상태가 가리키는 행보다 앞이 바뀜) 전체를 읽어 다시 병합
+            with span('get_stock_price.load'):
+                existing_df, offset = load_daily_data(code), 0
+            df, _ = merge_daily_prices(existing_df, new_df, refresh_today, sort_date)
+            start = first_changed_row(existing_df, df)
+        with span('get_stock_price.macd', rows=len(df) - start):
+            df, macd_state = update_macd(df, start, macd_state, DAILY_MACD_PARAMS, existing_df, offset)
+        count('rows.daily_macd', len(df) - start)
+        
+        # 추가 지표 계산 (요청한 지표만)
+        with span('get_stock_price.indicators'):
+            indicator_columns = apply_indicators(df, get_config().indicators)
+        
+        # 데이터 저장 (구간만 읽었으면 바뀐 행만 파일 끝에 다시 씀)
+        write_start = start if offset else 0
+        with span('get_stock_price.save', rows=len(df) - write_start):
+            if offset:
+                get_price_store().replace_tail(code, 'daily', df[PRICE_COLUMNS].iloc[start:], len(existing_df) - start)
+            else:
+                get_price_store().save(code, 'daily', df[PRICE_COLUMNS + indicator_columns])
+            save_macd_state(state_path, macd_state)
+        count('rows.daily_saved', len(df) - write_start)
+        
+        # 시세 패널에 새 행 반영
+        panel = get_price_panel()
+        if panel is not None:
+            with span('get_stock_price.panel'):
+                count('rows.panel', panel.update(code, df, start))
+        
+        print(f"데이터 업데이트 완료: {offset + len(df)} 행")
+    else:
+        df = existing_df
+        print(f"기존 데이터 사용: {offset + len(df)} 행")
+        
+        # 요청한 지표 컬럼이 저장되어 있지 않으면 계산하여 저장
+        stored_columns = set(existing_df.columns)
+        with span('get_stock_price.indicators'):
+            indicator_columns = apply_indicators(df, get_config().indicators)
+        if not set(indicator_columns) <= stored_columns:
+            with span('get_stock_price.save', rows=len(df)):
+                get_price_store().save(code, 'daily', df[PRICE_COLUMNS + indicator_columns])
+            count('rows.daily_saved', len(df))
+    
+    # 최근 데이터 필터링 (기본 30주)
+    if recent_weeks is not None:
+        df = recent_prices(df, recent_weeks)
+    elif offset:
+        df = load_daily_data(code)
+    
+    return df
+
+def recent_prices(df, weeks=RECENT_WEEKS):
+    """최근 weeks주 데이터만 선택"""
+    weeks_ago = datetime.now() - timedelta(weeks=weeks)
+    return df[df['date'] >= weeks_ago]
+
+def analyze_stock_prices(code, num_of_pages, prefetched=None, refresh_today=False, keep_daily=False):
+    """
+    종목 하나의 시세 갱신 → 주간 변환 → 시그널 검사 (CPU 단계 작업 단위, pipeline.process_stock 참고)
+    keep_daily: 갱신한 전체 일간 시세도 돌려줌
+    반환값: (최근 4주 데이터, 시그널 목록, 전체 일간 시세 또는 None)
+    """
+    daily_df = get_stock_price(code, num_of_pages, prefetched=prefetched, refresh_today=refresh_today,
+                               recent_weeks=None if keep_daily else RECENT_WEEKS)
+    weekly_df = get_weekly_data(recent_prices(daily_df), code)
+    signals = check_macd_signals(weekly_df) if weekly_df is not None else None
+    return weekly_df, signals, daily_df if keep_daily else None
+
+# 주간 시세에서 바뀐 행을 찾을 때 비교하는 컬럼 (MACD는 이 값들에서 다시 계산됨)
+WEEKLY_VALUE_COLUMNS = ('date', 'close', 'open', 'high', 'low', 'volume', 'diff')
+
+def merge_weekly_data(existing_weekly_df, new_weekly_df, offset=0):
+    """
+    기존 주간 시세와 새로 집계한 주간 시세 병합 및 전주 대비 차이 계산
+    offset: 기존 주간 시세가 최근 구간일 때 첫 행의 위치 (첫 행의 diff는 저장된 값 유지)
+    반환값: (병합한 주간 시세, MACD를 다시 계산할 첫 행, 값이 바뀐 첫 행)
+    """
+    if existing_weekly_df.empty:
+        weekly_df = new_weekly_df
+    else:
+        # 새로 집계한 주와 같은 주에 속하는 기존 행은 새 값으로 대체
+        # (연말연초처럼 이전 방식에서 두 행으로 나뉘어 저장된 주도 하나로 합쳐짐)
+        new_weeks = period_keys(new_weekly_df['date'], 'W')
+        existing_weeks = period_keys(existing_weekly_df['date'], 'W')
+        kept_weekly_df = existing_weekly_df[~np.isin(existing_weeks, new_weeks)]
+        weekly_df = pd.concat([kept_weekly_df, new_weekly_df])
+        weekly_df = weekly_df.drop_duplicates(subset=['date'], keep='last')
+    
+    # 날짜 기준으로 정렬
+    weekly_df = weekly_df.sort_values(by='date').reset_index(drop=True)
+    
+    # 전주 대비 차이 계산
+    weekly_df['diff'] = weekly_df['close'].diff().fillna(0).astype(int)
+    if offset and len(weekly_df):
+        weekly_df.loc[0, 'diff'] = existing_weekly_df['diff'].iloc[0]
+    
+    start = first_changed_row(existing_weekly_df, weekly_df)
+    return weekly_df, start, first_changed_row(existing_weekly_df, weekly_df, WEEKLY_VALUE_COLUMNS)
+
+@traced()
+def get_weekly_data(df, code):
+    """
+    일간 데이터를 주간 데이터로 변환 (금요일 기준)
+    기존 주간 시세는 새로 집계한 주 직전까지만 읽고 바뀐 주만 다시 쓴다. (get_stock_price 참고)
+    """
+    # 데이터를 저장할 디렉토리 생성
+    data_dir = 'stock_data'
+    if not os.path.exists(data_dir):
+        os.makedirs(data_dir)
+    
+    # MACD 상태 파일 경로
+    state_path = macd_state_path(code, 'weekly')
+    
+    print(f"입력 데이터 수: {len(df)}")
+    
+    # 주간 데이터 계산 (월요일 시작 주 단위로 묶어 벡터 연산으로 집계)
+    # - date: 주의 마지막 거래일, open: 첫 거래일 시가, close: 마지막 거래일 종가
+    # - high/low: 주의 고가/저가, volume: 주간 거래량 합계
+    with span('get_weekly_data.resample', rows=len(df)):
+        new_weekly_df = resample_weekly(df)
+    count('rows.resampled', len(df))
+    
+    # 기존 주간 데이터 로드 (새로 집계한 첫 주의 2주 전부터, 그 직전 주가 구간에 있어야 이어서 계산 가능)
+    with span('get_weekly_data.load'):
+        since = new_weekly_df['date'].min() - pd.Timedelta(weeks=2) if not new_weekly_df.empty else None
+        existing_weekly_df, offset = load_price_window(code, 'weekly', since, 2, WEEKLY_MACD_PARAMS)
+    
+    # 기존 데이터와 새로운 데이터 병합
+    macd_state = load_macd_state(state_path)
+    weekly_df, start, write_start = merge_weekly_data(existing_weekly_df, new_weekly_df, offset)
+    if offset and (write_start < 1 or resume_state(weekly_df, start, macd_state, WEEKLY_MACD_PARAMS, offset) is None):
+        # 구간 첫 행까지 바뀌었거나 이어서 계산할 수 없으면 전체를 읽어 다시 병합
+        with span('get_weekly_data.load'):
+            existing_weekly_df, offset = get_price_store().load(code, 'weekly'), 0
+        weekly_df, start, write_start = merge_weekly_data(existing_weekly_df, new_weekly_df)
+    
+    # 데이터 확인용 출력
+    print(f"주간 데이터 수: {offset + len(weekly_df)}")
+    
+    # 주간 데이터로 MACD 계산 (변경된 주부터만 계산)
+    with span('get_weekly_data.macd', rows=len(weekly_df) - start):
+        weekly_df, macd_state = update_macd(weekly_df, start, macd_state, WEEKLY_MACD_PARAMS,
+                                            existing_weekly_df, offset)
+    count('rows.weekly_macd', len(weekly_df) - start)
+    
+    # 추가 지표 계산 (요청한 지표만)
+    with span('get_weekly_data.indicators'):
+        indicator_columns = apply_indicators(weekly_df, get_config().indicators)
+    
+    # 데이터 저장 (구간만 읽었으면 바뀐 주만 파일 끝에 다시 씀)
+    write_start = write_start if offset else 0
+    with span('get_weekly_data.save', rows=len(weekly_df) - write_start):
+        if offset:
+            get_price_store().replace_tail(code, 'weekly', weekly_df[PRICE_COLUMNS].iloc[write_start:],
+                                           len(existing_weekly_df) - write_start)
+        else:
+            get_price_store().save(code, 'weekly', weekly_df[PRICE_COLUMNS + indicator_columns])
+        save_macd_state(state_path, macd_state)
+    count('rows.weekly_saved', len(weekly_df) - write_start)
+    
+    return weekly_df.tail(4)
+
+@traced()
+def check_macd_signals(weekly_df):
+    """
+    주간 MACD 히스토그램의 부호 변화를 확인하여 매수/매도 시그널 생성
+    """
+    signals = []
+    
+    # 최소 2주 이상의 데이터가 필요
+    if len(weekly_df) < 2:
+        return signals
+    
+    # 최근 2주간의 데이터만 사용
+    last_two_weeks = weekly_df.tail(2)
+    prev_hist = last_two_weeks.iloc[0]['macd_hist']
+    curr_hist = last_two_weeks.iloc[1]['macd_hist']
+    curr_date = last_two_weeks.iloc[1]['date']
+    curr_price = last_two_weeks.iloc[1]['close']
+    
+    # 음봉 -> 양봉 (매수 시그널)
+    if prev_hist < 0 and curr_hist > 0:
+        signals.append({
+            'type': 'BUY',
+            'date': curr_date,
+            'price': curr_price,
+            'reason': f'MACD 히스토그램 부호 전환 (음 → 양): {prev_hist:.2f} → {curr_hist:.2f}'
+        })
+    
+    # 양봉 -> 음봉 (매도 시그널)
+    elif prev_hist > 0 and curr_hist < 0:
+        signals.append({
+            'type': 'SELL',
+            'date': curr_date,
+            'price': curr_price,
+            'reason': f'MACD 히스토그램 부호 전환 (양 → 음): {prev_hist:.2f} → {curr_hist:.2f}'
+        })
+    
+    return signals
+
+# Discord 알림 기능 추가
+# 웹훅 URL별 전송 큐
+_notifiers = {}
+
+def get_notifier(webhook_url):
+    """웹훅 URL의 전송 큐 조회 (없으면 생성)"""
+    if webhook_url not in _notifiers:
+        _notifiers[webhook_url] = DiscordNotifier(webhook_url, get_http_client(), use_embeds=get_config().discord_use_embeds)
+    return _notifiers[webhook_url]
+
+@traced()
+def send_to_discord(message, webhook_url):
+    """
+    Discord로 메시지 전송
+    전송 큐에 넣고 바로 반환하며, 실제 전송은 백그라운드에서 여러 메시지를 묶어서 한다.
+    """
+    return get_notifier(webhook_url).send(message)
+
+def flush_discord(timeout=None):
+    """대기 중인 Discord 메시지를 모두 전송"""
+    for notifier in _notifiers.values():
+        if not notifier.flush(timeout):
+            print("Discord 메시지 전송이 시간 안에 끝나지 않았습니다.")
+
+def format_discord_message(item_name, stock, signals, weekly_df):
+    """Discord 메시지 포맷팅"""
+    message = f"🔔 **{item_name}({stock}) 주간 MACD 분석 결과**\n\n"
+    
+    # 최근 4주 데이터 요약
+    message += "📊 **최근 4주 요약**\n```\n"
+    message += "날짜          종가      전주비    MACD\n"
+    message += "-" * 40 + "\n"
+    
+    for _, row in weekly_df.iterrows():
+        message += f"{row['date'].strftime('%Y-%m-%d')}  "
+        message += f"{row['close']:8,}  "
+        message += f"{row['diff']:+8,}  "
+        message += f"{row['macd_hist']:+6.2f}\n"
+    message += "```\n"
+    
+    # 매매 시그널
+    if signals:
+        for signal in signals:
+            if signal['type'] == 'BUY':
+                message += "\n🔵 **매수 시그널 발생!**\n"
+            else:
+                message += "\n🔴 **매도 시그널 발생!**\n"
+            
+            message += f"📅 날짜: {signal['date'].strftime('%Y-%m-%d')}\n"
+            message += f"💰 가격: {signal['price']:,}원\n"
+            message += f"📊 {signal['reason']}\n"
+    else:
+        message += "\n💡 현재 매매 시그널 없음\n"
+    
+    return message
+
+def stock_inputs(code):
+    """
+    종목 결과의 입력 지문 (파일 내용 기준이므로 git checkout 후에도 같음)
+    일간/주간 시세 파일 크기와 MACD 상태(마지막 행의 날짜·종가·행 수·EMA), 결과에 영향을 주는 설정
+    """
+    store = get_price_store()
+    config = get_config()
+    inputs = {timeframe: [file_size(store.path(code, timeframe)), load_macd_state(macd_state_path(code, timeframe))]
+              for timeframe in ('daily', 'weekly')}
+    inputs['settings'] = [config.storage_format, repr(config.indicators), RECENT_WEEKS,
+                          DAILY_MACD_PARAMS, WEEKLY_MACD_PARAMS]
+    return inputs
+
+def load_unchanged_results(codes, num_of_pages, refresh_today=False):
+    """
+    마지막 실행 이후 바뀐 것이 없는 종목의 저장된 결과 (실행 매니페스트 기준)
+    입력 지문과 코드 버전이 같고, 마지막 거래일 이후 새로 받을 시세가 없는 종목만 고른다.
+    (재실행이나 휴장일: 시세 파일을 읽거나 요청하지 않고, 다시 계산하거나 저장하지도 않음)
+    반환값: {종목코드: (최근 4주 데이터, 시그널 목록)}
+    """
+    manifest = get_run_manifest()
+    if manifest is None:
+        return {}
+    results = {}
+    with span('run_manifest.lookup'):
+        for code in dict.fromkeys(codes):
+            entry = manifest.lookup(code, stock_inputs(code))
+            if entry is not None:
+                latest_date, weekly_df, signals = entry
+                if get_pages_after(latest_date, num_of_pages, refresh_today) == 0:
+                    results[code] = (weekly_df, signals)
+    count('stocks.unchanged', len(results))
+    return results
+
+def collect_stock_result(stage, code, prefetched):
+    """
+    CPU 단계에서 계산한 종목 결과를 받아 부모 프로세스의 상태에 반영
+    - 작업 프로세스의 콘솔 출력을 종목 순서대로 출력
+    - 메모리 캐시 저장소와 시세 패널을 작업 프로세스가 저장한 시세로 갱신
+    반환값: (최근 4주 데이터, 시그널 목록)
+    """
+    with span('cpu_stage.wait', code=code):
+        outcome = stage.result(code)
+    print(outcome['output'], end='')
+    daily_df = outcome['daily']
+    if daily_df is not None:
+        store = get_price_store()
+        if isinstance(store, MemoryCachedStore):
+            store.remember(code, 'daily', daily_df)
+            store.forget(code, 'weekly')
+        panel = get_price_panel()
+        if panel is not None and prefetched['pages']:
+            with span('get_stock_price.panel'):
+                count('rows.panel', panel.update(code, daily_df, first_changed_row(prefetched['existing_df'], daily_df)))
+    return outcome['weekly_df'], outcome['signals']
+
+def analyze_stocks(announce=True, seen_signals=None, refresh_today=False):
+    """
+    여러 주식 분석 및 Discord 알림 전송
+    announce: 시작/요약 메시지 전송 여부
+    seen_signals: 이미 알린 시그널 (종목코드, 종류, 날짜) 집합. 주어지면 새 시그널만 알리고 집합에 추가 (상주 모드용)
+    refresh_today: 오늘 날짜로 저장된 시세도 다시 조회 (장중 반복 조회용)
+    """
+    config = get_config()
+    all_results = []
+    error_stocks = []
+    signals_found = []
+    
+    # 분석 시작 알림
+    if config.discord_webhook_url and announce:
+        start_message = "🔄 **주식 분석 시작**\n\n"
+        start_message += f"📈 분석 대상 종목 ({len(config.stock_names)}개):\n"
+        for idx, name in enumerate(config.stock_names, 1):
+            start_message += f"{idx}. {name}\n"
+        start_message += f"\n⏰ 시작 시간: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}"
+        send_to_discord(start_message, config.discord_webhook_url)
+    
+    resolver = get_code_resolver()
+    stock_codes, missing_names = resolver.resolve_many(config.stock_names)
+    
+    # 마지막 실행 이후 바뀐 것이 없는 종목은 저장된 결과를 그대로 사용
+    manifest = get_run_manifest()
+    unchanged = load_unchanged_results(stock_codes.values(), config.data_days, refresh_today)
+    codes = [code for code in stock_codes.values() if code not in unchanged]
+    
+    # 나머지 종목의 일별 시세를 병렬로 미리 조회
+    # CPU_WORKERS가 2 이상이면 조회가 끝난 종목부터 프로세스 풀에서 파싱/계산/저장하고 (CPU 단계)
+    # 아래 반복문은 종목 순서대로 결과를 받아 출력/알림만 한다.
+    stage = None
+    prefetched_prices = {}
+    workers = resolve_workers(config.cpu_workers)
+    if workers > 1 and codes:
+        keep_daily = isinstance(get_price_store(), MemoryCachedStore) or get_price_panel() is not None
+        stage = CpuStage(workers, config.data_days, refresh_today, keep_daily)
+        prefetched_prices = prefetch_stock_prices(codes, config.data_days, refresh_today=refresh_today,
+                                                  parse=False, on_ready=stage.submit)
+    elif codes:
+        prefetched_prices = prefetch_stock_prices(codes, config.data_days, refresh_today=refresh_today)
+    
+    for item_name in config.stock_names:
+        try:
+            print(f"\n=== {item_name} 분석 시작 ===")
+            if item_name in missing_names:
+                message = f"종목 코드를 찾을 수 없습니다: {item_name}"
+                suggestions = resolver.suggest(item_name)
+                if suggestions:
+                    message += f" (유사 종목: {', '.join(suggestions)})"
+                raise Exception(message)
+            stock = stock_codes[item_name]
+            if stock in unchanged:
+                weekly_df, signals = unchanged[stock]
+                print("새로운 시세 없음: 마지막 실행 결과 사용")
+            else:
+                if manifest is not None:
+                    manifest.forget(stock)
+                prefetched = prefetched_prices[stock]
+                if stage is not None:
+                    weekly_df, signals = collect_stock_result(stage, stock, prefetched)
+                else:
+                    if isinstance(prefetched, Exception):
+                        raise prefetched
+                    weekly_df, signals, _ = analyze_stock_prices(stock, config.data_days, prefetched=prefetched,
+                                                                 refresh_today=refresh_today)
+                if manifest is not None and weekly_df is not None and not weekly_df.empty:
+                    manifest.record(stock, stock_inputs(stock), weekly_df, signals)
+            
+            if weekly_df is not None:
+                # 콘솔 출력
+                print(f"\n=== {item_name}({stock}) 주간 MACD 분석 결과 ===")
+                print("\n주간          종가      전주비    거래량     MACD히스토그램")
+                print("-" * 65)
+
+                for _, row in weekly_df.iterrows():
+                    print(f"{row['date'].strftime('%Y-%m-%d')}  "
+                          f"{row['close']:8,}  "
+                          f"{row['diff']:+8,}  "
+                          f"{row['volume']:10,}  "
+                          f"{row['macd_hist']:+8.2f}")
+                
+                # 이미 알린 시그널 제외
+                new_signals = signals
+                if seen_signals is not None:
+                    keys = [(stock, signal['type'], signal['date']) for signal in signals]
+                    new_signals = [signal for signal, key in zip(signals, keys) if key not in seen_signals]
+                    seen_signals.update(keys)
+                
+                # Discord 알림 전송 (매매 시그널이 있는 경우에만)
+                if config.discord_webhook_url and new_signals:
+                    message = format_discord_message(item_name, stock, new_signals, weekly_df)
+                    send_to_discord(message, config.discord_webhook_url)
+                    signals_found.append(item_name)
+                
+                all_results.append({
+                    'name': item_name,
+                    'code': stock,
+                    'signals': signals is not None and len(signals) > 0,
+                    'signal_list': signals,
+                })
+                
+        except Exception as e:
+            error_message = f"{item_name} 분석 중 오류 발생: {str(e)}"
+            print(error_message)
+            error_stocks.append(item_name)
+            if config.discord_webhook_url:
+                send_to_discord(f"⚠️ **오류 발생**\n{error_message}", config.discord_webhook_url)
+    
+    if stage is not None:
+        stage.close()
+    if manifest is not None:
+        with span('run_manifest.save'):
+            manifest.save()
+    
+    # 전체 분석 결과 요약
+    if config.discord_webhook_url and all_results and announce:
+        summary = "📊 **전체 분석 결과 요약**\n\n"
+        summary += f"✅ 분석 완료: {len(all_results)}개 종목\n"
+        if error_stocks:
+            summary += f"❌ 분석 실패: {len(error_stocks)}개 종목 ({', '.join(error_stocks)})\n"
+        
+        if signals_found:
+            summary += f"\n🔔 매매 시그널 발생 종목: {', '.join(signals_found)}"
+        else:
+            summary += "\n💡 매매 시그널이 발생한 종목이 없습니다."
+        
+        # 분석 시간 추가
+        current_time = datetime.now().strftime('%Y-%m-%d %H:%M:%S')
+        summary += f"\n\n⏰ 분석 시간: {current_time}"
+        
+        send_to_discord(summary, config.discord_webhook_url)
+    
+    # 남은 알림 전송 완료 대기
+    with span('flush_discord'):
+        flush_discord()
+    for notifier in _notifiers.values():
+        print(f"\nDiscord 전송 통계: {notifier.stats()}")
+    
+    print(f"\nHTTP 요청 통계: {get_http_client().stats()}")
+    if get_http_client().cache is not None:
+        print(f"HTTP 캐시 통계 ({config.http_cache}): {get_http_client().cache.stats()}")
+    
+    # 실행 단계별 시간 요약 (TRACE_DIR이 있으면 trace JSON도 저장)
+    report_trace()
+    
+    return {
+        'success': True,
+        'analyzed': len(all_results),
+        'errors': len(error_stocks),
+        'signals': len(signals_found),
+        'results': all_results,
+        'error_stocks': error_stocks,
+    }
+
+def report_trace():
+    """단계별 시간 요약 출력 및 TRACE_DIR에 실행별 trace JSON 저장"""
+    config = get_config()
+    tracer = get_tracer()
+    tracer.print_summary()
+    if config.trace_dir:
+        extra = {
+            'stocks': config.stock_names,
+            'data_days': config.data_days,
+            'http': get_http_client().stats(),
+            'http_cache': get_http_client().cache.stats() if get_http_client().cache is not None else None,
+            'discord': [notifier.stats() for notifier in _notifiers.values()],
+        }
+        path = tracer.save(trace_path(config.trace_dir, tracer.started), extra)
+        print(f"실행 trace 저장: {path}")
+
+# 전체 종목 스크리너 CLI
+def screen_main(argv=None):
+    """
+    저장된 시세가 있는 전체 종목의 주간 MACD 시그널 검색
+    사용법: python main.py screen [--limit N] [--type BUY|SELL] [--days N] [--output 파일]
+    """
+    parser = argparse.ArgumentParser(prog='main.py screen', description='전체 종목 주간 MACD 시그널 스크리너')
+    parser.add_argument('--limit', type=int, default=30, help='출력할 시그널 수 (기본: 30, 0이면 전체)')
+    parser.add_argument('--type', choices=['BUY', 'SELL'], default=None, help='시그널 종류 필터')
+    parser.add_argument('--days', type=int, default=14, help='마지막 주봉이 최근 N일 이내인 종목만 검색 (기본: 14)')
+    parser.add_argument('--output', default=None, help='결과를 저장할 CSV 파일 경로')
+    args = parser.parse_args(argv)
+
+    codes = get_price_store().codes('daily')
+    print(f"저장된 시세 {len(codes)}개 종목 검색 중...")
+
+    try:
+        resolver = get_code_resolver()
+        names = {code: resolver.name(code) or '' for code in codes}
+    except Exception as e:
+        print(f"종목명 조회 실패, 종목코드만 표시합니다: {str(e)}")
+        names = None
+
+    since = datetime.now() - timedelta(days=args.days) if args.days > 0 else None
+    signals = screen_universe(get_price_store(), codes, names=names, since=since, panel=get_price_panel())
+    if args.type:
+        signals = signals[signals['type'] == args.type].reset_index(drop=True)
+
+    if args.output:
+        signals.to_csv(args.output, index=False, encoding='utf-8-sig')
+        print(f"시그널 {len(signals)}개 저장 완료: {args.output}")
+
+    shown = signals.head(args.limit) if args.limit > 0 else signals
+    if shown.empty:
+        print("발견된 시그널이 없습니다.")
+    else:
+        print(shown.to_string(index=False))
+    return signals
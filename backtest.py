@@ -0,0 +1,255 @@
+import argparse
+
+import numpy as np
+import pandas as pd
+
+from macd import compute_macd, WEEKLY_PARAMS
+from resample import period_keys
+from screener import load_close_panel, weekly_panel
+from storage import get_store
+
+# 거래 비용 기본값
+FEE = 0.00015      # 증권사 수수료 (매수/매도 각각)
+SELL_TAX = 0.002   # 증권거래세 (매도 시)
+SLIPPAGE = 0.001   # 체결가 불리 (매수 시 +, 매도 시 -)
+
+
+def histogram_signals(hist):
+    """
+    히스토그램 행렬에서 모든 부호 전환 위치 계산 (check_macd_signals와 같은 규칙)
+    반환값: (BUY 마스크, SELL 마스크) - 첫 행은 항상 False
+    """
+    buy = np.zeros(hist.shape, dtype=bool)
+    sell = np.zeros(hist.shape, dtype=bool)
+    buy[1:] = (hist[:-1] < 0) & (hist[1:] > 0)
+    sell[1:] = (hist[:-1] > 0) & (hist[1:] < 0)
+    return buy, sell
+
+
+def hold_positions(buy, sell, lag=0):
+    """
+    BUY 이후 SELL 전까지 보유하는 포지션 행렬 (롱 전용)
+
+    마지막으로 발생한 시그널을 아래로 채워(forward fill) 보유 여부를 정한다.
+    lag: 시그널 발생 후 체결까지 지연되는 봉 수
+    """
+    rows = np.arange(len(buy))[:, None]
+    signal_row = np.where(buy | sell, rows, -1)
+    last_signal = np.maximum.accumulate(signal_row, axis=0)
+    columns = np.arange(buy.shape[1])[None, :]
+    position = (last_signal >= 0) & buy[np.maximum(last_signal, 0), columns]
+
+    if lag > 0:
+        delayed = np.zeros_like(position)
+        delayed[lag:] = position[:-lag]
+        position = delayed
+    return position
+
+
+def _trade_bounds(position):
+    """포지션 행렬에서 매수/매도 행 번호 쌍 추출 (종목, 행 순서)"""
+    held = np.zeros((position.shape[0] + 2, position.shape[1]), dtype=bool)
+    held[1:-1] = position
+    change = held[1:] != held[:-1]
+
+    # 열 우선으로 훑어야 같은 종목의 매수/매도가 번갈아 나온다
+    column, row = np.nonzero(change.T)
+    entry_column, entry_row = column[0::2], row[0::2]
+    exit_row = row[1::2] - 1  # 마지막 보유 행 (매도 체결 행은 그다음 행)
+    return entry_column, entry_row, exit_row
+
+
+def trade_costs(fee=FEE, sell_tax=SELL_TAX, slippage=SLIPPAGE):
+    """매수/매도 비용을 로그 수익률로 환산: (매수 비용, 매도 비용)"""
+    entry_cost = -np.log((1 + slippage) * (1 + fee))
+    exit_cost = np.log((1 - slippage) * (1 - fee - sell_tax))
+    return entry_cost, exit_cost
+
+
+def weekly_log_returns(close_matrix):
+    """주간 로그 수익률 행렬 (첫 행과 상장 전은 0)"""
+    prev_close = np.full_like(close_matrix, np.nan)
+    prev_close[1:] = close_matrix[:-1]
+    return np.log1p(np.nan_to_num(close_matrix / prev_close - 1))
+
+
+def equity_curves(close_matrix, position, entry_cost, exit_cost, log_returns=None):
+    """
+    포지션 행렬로 종목별 자산 곡선 계산 (시작 1.0)
+    t-1 주에 보유 중이면 t 주 수익을 반영하고, 매수/매도가 일어난 주에 거래 비용을 반영한다.
+    log_returns: 미리 계산한 weekly_log_returns(close_matrix) (같은 종가로 여러 번 계산할 때 재사용)
+    """
+    if log_returns is None:
+        log_returns = weekly_log_returns(close_matrix)
+    held = np.zeros_like(position)
+    held[1:] = position[:-1]
+    log_growth = np.where(held, log_returns, 0.0)
+
+    entries = position & ~held
+    exits = ~position & held
+    log_growth += entries * entry_cost + exits * exit_cost
+    return np.exp(np.cumsum(log_growth, axis=0))
+
+
+def max_drawdown(equity):
+    """자산 곡선의 최대 낙폭 (열별)"""
+    if len(equity) == 0:
+        return np.zeros(equity.shape[1:])
+    return (equity / np.maximum.accumulate(equity, axis=0) - 1).min(axis=0)
+
+
+def trade_returns(close_matrix, position, entry_cost, exit_cost):
+    """
+    포지션 행렬로 거래별 수익률 계산
+    마지막 행까지 보유 중인 거래는 마지막 종가로 평가한다 (매도 비용 제외).
+    반환값: (종목 번호, 매수 행, 매도 행, 보유 중 여부, 로그 수익률)
+    """
+    entry_column, entry_row, last_row = _trade_bounds(position)
+    is_open = last_row == len(position) - 1
+    exit_row = np.where(is_open, last_row, last_row + 1)
+
+    entry_price = close_matrix[entry_row, entry_column]
+    exit_price = close_matrix[exit_row, entry_column]
+    log_return = np.log(exit_price / entry_price) + entry_cost + np.where(is_open, 0.0, exit_cost)
+    return entry_column, entry_row, exit_row, is_open, log_return
+
+
+def run_backtest(date_matrix, close_matrix, codes, params=WEEKLY_PARAMS,
+                 fee=FEE, sell_tax=SELL_TAX, slippage=SLIPPAGE, lag=0):
+    """
+    주간 MACD 히스토그램 전략 백테스트 (전 종목 동시 계산)
+
+    - 히스토그램이 음수 → 양수로 바뀐 주의 종가에 매수, 양수 → 음수로 바뀐 주의 종가에 매도
+    - 매수 체결가: 종가 × (1 + slippage), 매도 체결가: 종가 × (1 - slippage)
+    - 수수료는 매수/매도 모두, 증권거래세는 매도 시에만 부과
+    - 기간 마지막까지 보유 중인 거래는 마지막 종가로 평가 (open=True)
+    - 포트폴리오: 종목마다 같은 금액을 배정하고 각 종목 자금은 해당 종목 거래에만 쓰는 방식
+
+    반환값: {'summary': 종목별 성과, 'trades': 거래 목록, 'portfolio': 포트폴리오 성과,
+             'equity': 포트폴리오 자산 곡선}
+    """
+    hist = compute_macd(close_matrix, **params)['macd_hist']
+    buy, sell = histogram_signals(hist)
+    position = hold_positions(buy, sell, lag)
+
+    entry_cost, exit_cost = trade_costs(fee, sell_tax, slippage)
+    equity = equity_curves(close_matrix, position, entry_cost, exit_cost)
+
+    trades = _trade_table(date_matrix, close_matrix, codes, position, entry_cost, exit_cost)
+    closed = trades[~trades['open']]
+    win_rate = (closed['return'] > 0).groupby(closed['code']).mean()
+
+    listed_weeks = (~np.isnan(close_matrix)).sum(axis=0)
+    summary = pd.DataFrame({
+        'code': codes,
+        'trades': trades.groupby('code').size().reindex(codes, fill_value=0).to_numpy(),
+        'win_rate': win_rate.reindex(codes).to_numpy(dtype='float64'),
+        'total_return': equity[-1] - 1 if len(equity) else np.zeros(len(codes)),
+        'max_drawdown': max_drawdown(equity),
+        'exposure': position.sum(axis=0) / np.maximum(listed_weeks, 1),
+    })
+
+    week_dates, portfolio_equity = _portfolio_equity(date_matrix, equity)
+    portfolio = {
+        'tickers': len(codes),
+        'trades': len(trades),
+        'win_rate': float((closed['return'] > 0).mean()) if len(closed) else np.nan,
+        'total_return': float(portfolio_equity[-1] - 1) if len(portfolio_equity) else 0.0,
+        'max_drawdown': float(max_drawdown(portfolio_equity)),
+        'start': week_dates[0] if len(week_dates) else None,
+        'end': week_dates[-1] if len(week_dates) else None,
+    }
+    return {
+        'summary': summary,
+        'trades': trades,
+        'portfolio': portfolio,
+        'equity': pd.Series(portfolio_equity, index=week_dates, name='equity'),
+    }
+
+
+def _portfolio_equity(date_matrix, equity):
+    """
+    종목별 자산 곡선을 달력 주 기준으로 맞춘 뒤 평균 (종목마다 같은 금액을 배정한 포트폴리오)
+
+    행렬은 종목마다 마지막 주 기준으로 정렬되어 있어 같은 행이 같은 주라는 보장이 없으므로
+    주 번호로 다시 배치한다. 상장 전에는 현금(1.0), 시세가 끝난 뒤에는 마지막 값을 유지한다.
+    반환값: (주별 마지막 거래일, 포트폴리오 자산 곡선)
+    """
+    valid = ~np.isnat(date_matrix)
+    if not valid.any():
+        return pd.DatetimeIndex([]), np.ones(0)
+
+    dates = date_matrix[valid]
+    keys = period_keys(dates, 'W')
+    weeks = np.unique(keys)
+    row = np.searchsorted(weeks, keys)
+    column = np.nonzero(valid)[1]
+
+    aligned = np.full((len(weeks), date_matrix.shape[1]), np.nan)
+    aligned[row, column] = equity[valid]
+    aligned = pd.DataFrame(aligned).ffill().fillna(1.0).to_numpy()
+
+    week_dates = np.full(len(weeks), np.datetime64('NaT'), dtype='datetime64[D]')
+    np.maximum.at(week_dates.view('int64'), row, dates.view('int64'))
+    return pd.DatetimeIndex(week_dates), aligned.mean(axis=1)
+
+
+def _trade_table(date_matrix, close_matrix, codes, position, entry_cost, exit_cost):
+    """포지션 행렬로 거래 목록 생성"""
+    columns = ['code', 'entry_date', 'entry_price', 'exit_date', 'exit_price', 'weeks', 'return', 'open']
+    entry_column, entry_row, exit_row, is_open, log_return = trade_returns(
+        close_matrix, position, entry_cost, exit_cost)
+    if len(entry_row) == 0:
+        return pd.DataFrame(columns=columns).astype({'return': 'float64', 'open': bool})
+
+    return pd.DataFrame({
+        'code': np.asarray(codes)[entry_column],
+        'entry_date': pd.DatetimeIndex(date_matrix[entry_row, entry_column]),
+        'entry_price': close_matrix[entry_row, entry_column].astype('int64'),
+        'exit_date': pd.DatetimeIndex(date_matrix[exit_row, entry_column]),
+        'exit_price': close_matrix[exit_row, entry_column].astype('int64'),
+        'weeks': exit_row - entry_row,
+        'return': np.round(np.expm1(log_return), 6),
+        'open': is_open,
+    }, columns=columns)
+
+
+def backtest_store(store, codes=None, **kwargs):
+    """저장소의 일간 시세(전체 기간)로 주봉을 만들어 백테스트"""
+    codes = store.codes('daily') if codes is None else codes
+    codes, owner, dates, closes = load_close_panel(store, codes)
+    date_matrix, close_matrix = weekly_panel(owner, dates, closes, len(codes))
+    return run_backtest(date_matrix, close_matrix, codes, **kwargs)
+
+
+def main():
+    parser = argparse.ArgumentParser(description='주간 MACD 히스토그램 전략 백테스트')
+    parser.add_argument('codes', nargs='*', help='종목코드 (생략 시 저장된 전체 종목)')
+    parser.add_argument('--data-dir', default='stock_data')
+    parser.add_argument('--storage-format', default='csv', help='저장 형식 (csv, feather, parquet)')
+    parser.add_argument('--fee', type=float, default=FEE, help=f'수수료율 (기본: {FEE})')
+    parser.add_argument('--tax', type=float, default=SELL_TAX, help=f'매도 세율 (기본: {SELL_TAX})')
+    parser.add_argument('--slippage', type=float, default=SLIPPAGE, help=f'슬리피지 (기본: {SLIPPAGE})')
+    parser.add_argument('--lag', type=int, default=0, help='시그널 후 체결까지 지연 주 수 (기본: 0)')
+    parser.add_argument('--trades', action='store_true', help='거래 목록 출력')
+    args = parser.parse_args()
+
+    store = get_store(args.storage_format, args.data_dir)
+    result = backtest_store(store, args.codes or None, fee=args.fee, sell_tax=args.tax,
+                            slippage=args.slippage, lag=args.lag)
+
+    print(result['summary'].to_string(index=False, float_format=lambda v: f'{v:.4f}'))
+    if args.trades:
+        print()
+        print(result['trades'].to_string(index=False))
+
+    portfolio = result['portfolio']
+    print(f"\n포트폴리오 ({portfolio['tickers']}개 종목, {portfolio['trades']}회 거래)")
+    if portfolio['start'] is not None:
+        print(f"기간: {portfolio['start']:%Y-%m-%d} ~ {portfolio['end']:%Y-%m-%d}")
+    print(f"수익률: {portfolio['total_return']:.2%}, 최대 낙폭: {portfolio['max_drawdown']:.2%}, "
+          f"승률: {portfolio['win_rate']:.2%}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,113 @@
+"""
+네이버 일별 시세(sise_day) 파서 벤치마크
+
+stock_data의 일간 시세로 sise_day 페이지와 같은 구조의 HTML을 만들어
+pd.read_html 기반 이전 파이프라인과 naver_parser의 파싱 시간을 비교한다. (네트워크 사용 안 함)
+
+    python benchmarks/bench_naver_parser.py [종목코드] [페이지 수]
+"""
+import os
+import sys
+import time
+
+import pandas as pd
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from naver_parser import parse_sise_day_pages, parse_with_read_html  # noqa: E402
+
+
+def _diff_cell(diff, style):
+    """전일비 셀 (style: 'img' - 이미지 alt 표시, 'blind' - 숨김 텍스트 표시)"""
+    if diff == 0:
+        return f'<td class="num"><span class="tah p11">\n{diff}\n</span></td>'
+    up = diff > 0
+    if style == 'img':
+        icon = 'ico_up' if up else 'ico_down'
+        alt = '상승' if up else '하락'
+        marker = (f'<img src="https://ssl.pstatic.net/imgstock/images/images4/{icon}.gif" '
+                  f'width="7" height="6" style="margin-right:4px;" alt="{alt}">')
+    else:
+        kind = 'bu_pup' if up else 'bu_pdn'
+        text = '상승' if up else '하락'
+        marker = f'<em class="bu_p {kind}"><span class="blind">{text}</span></em>'
+    color = 'red02' if up else 'nv01'
+    return f'<td class="num">\n{marker}<span class="tah p11 {color}">\n{abs(diff):,}\n</span>\n</td>'
+
+
+def make_page(rows, style='img'):
+    """일간 시세 10행으로 sise_day 페이지 HTML 생성"""
+    html = ['<html><body><table cellspacing="0" class="type2">',
+            '<tr><th>날짜</th><th>종가</th><th>전일비</th><th>시가</th><th>고가</th><th>저가</th><th>거래량</th></tr>',
+            '<tr><td colspan="7" height="8"></td></tr>']
+    for idx, row in enumerate(rows.itertuples(index=False)):
+        html.append('<tr onmouseover="mouseOver(this)" onmouseout="mouseOut(this)">')
+        html.append(f'<td align="center"><span class="tah p10 gray03">{row.date:%Y.%m.%d}</span></td>')
+        html.append(f'<td class="num"><span class="tah p11">{row.close:,}</span></td>')
+        html.append(_diff_cell(row.diff, style))
+        for value in (row.open, row.high, row.low, row.volume):
+            html.append(f'<td class="num"><span class="tah p11">{value:,}</span></td>')
+        html.append('</tr>')
+        if idx == 4:
+            html.append('<tr><td colspan="7" height="8"></td></tr>')
+            html.append('<tr><td colspan="7" class="division"></td></tr>')
+    html.append('<tr><td colspan="7" height="8"></td></tr></table>')
+    html.append('<table summary="페이지 네비게이션 리스트" class="Nnavi"><tr>'
+                '<td class="on"><a href="/item/sise_day.naver?code=000000&amp;page=1">1</a></td>'
+                '</tr></table></body></html>')
+    return '\n'.join(html)
+
+
+def make_pages(daily_df, num_pages, style='blind'):
+    """최신 날짜부터 10행씩 페이지 생성 (전일비는 종가 차이로 부호 포함)"""
+    df = daily_df.sort_values('date', ascending=False).reset_index(drop=True)
+    df['diff'] = (df['close'] - df['close'].shift(-1)).fillna(0).astype(int)
+    pages = []
+    for page in range(num_pages):
+        rows = df.iloc[page * 10:(page + 1) * 10]
+        if rows.empty:
+            break
+        pages.append(make_page(rows, style))
+    return pages, df
+
+
+def best_time(func, repeat=5):
+    times = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = func()
+        times.append(time.perf_counter() - start)
+    return min(times), result
+
+
+def main():
+    code = sys.argv[1] if len(sys.argv) > 1 else '005380'
+    num_pages = int(sys.argv[2]) if len(sys.argv) > 2 else 200
+
+    daily_df = pd.read_csv(os.path.join(ROOT, 'stock_data', f'{code}_daily.csv'), parse_dates=['date'])
+    for style in ('blind', 'img'):
+        run(daily_df, code, num_pages, style)
+
+
+def run(daily_df, code, num_pages, style):
+    pages, expected = make_pages(daily_df, num_pages, style)
+
+    old_time, old_df = best_time(lambda: parse_with_read_html(pages), repeat=3)
+    new_time, new_df = best_time(lambda: parse_sise_day_pages(pages))
+
+    # 결과 비교: 전일비 외 컬럼은 이전 방식과 동일, 전일비는 부호 포함
+    same = (len(old_df) == len(new_df)
+            and all((old_df[c].to_numpy() == new_df[c].to_numpy()).all()
+                    for c in ['date', 'open', 'high', 'low', 'close', 'volume'])
+            and (old_df['diff'].to_numpy() == new_df['diff'].abs().to_numpy()).all())
+    signed = (new_df['diff'].to_numpy() == expected['diff'].to_numpy()[:len(new_df)]).all()
+
+    print(f"\n종목 {code}, {len(pages)}페이지, {len(new_df)}행 (전일비 표시: {style})")
+    print(f"read_html 파이프라인: {old_time * 1000:9.2f} ms")
+    print(f"naver_parser        : {new_time * 1000:9.2f} ms  ({old_time / new_time:.1f}배)")
+    print(f"이전 결과와 일치: {same}, 전일비 부호 일치: {signed}")
+
+
+if __name__ == '__main__':
+    main()
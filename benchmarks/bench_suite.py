@@ -0,0 +1,613 @@
+"""
+핵심 경로 벤치마크 모음
+
+시작 시간(main 모듈 불러오기, 종목코드 조회 명령), MACD 계산(일간/주간), 주봉 변환(get_weekly_data), 시세 CSV 로드/저장, 종목코드 조회(get_krx_code),
+종목별 CPU 단계(페이지 파싱~저장, 한 프로세스/프로세스 풀), 저장된 기간별 일간 갱신의 최대 메모리(최근 구간만 읽기/전체 읽기), 새 시세가 없을 때의 재실행(500종목)을
+저장소의 stock_data 시세와 합성 시세(1만~100만 행, 1,000종목)로 측정한다.
+실행 시간(최소/평균)과 최대 메모리 사용량(tracemalloc)을 JSON 기준값과 비교해
+기준보다 느려지거나 메모리를 더 쓰면 종료 코드 1로 끝난다.
+
+stock_data를 임시 디렉토리에 복사해 그 안에서 실행하며, 네트워크 요청은 모두 가짜 응답으로 대체한다.
+(KRX 종목 코드 요청은 stock_data/krx_code.csv로 만든 응답, 그 밖의 요청은 연결 오류)
+
+    python benchmarks/bench_suite.py --save               # 측정 결과를 기준값으로 저장
+    python benchmarks/bench_suite.py                      # 기준값과 비교
+    python benchmarks/bench_suite.py --quick -k macd      # 합성 데이터 축소, 이름에 macd가 들어간 항목만
+    python benchmarks/bench_suite.py --threshold 0.5 --output result.json
+"""
+import argparse
+import contextlib
+import io
+import json
+import os
+import platform
+import shutil
+import subprocess
+import sys
+import tempfile
+import time
+import tracemalloc
+from datetime import datetime
+from unittest import mock
+
+import numpy as np
+import pandas as pd
+import requests
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from config import get_config, load_config  # noqa: E402
+from krx_codes import CodeResolver  # noqa: E402
+from macd import update_macd, save_macd_state, DAILY_PARAMS, WEEKLY_PARAMS  # noqa: E402
+from resample import resample_weekly  # noqa: E402
+from panel import build_panel, open_panel  # noqa: E402
+from pipeline import CpuStage  # noqa: E402
+from screener import screen_universe  # noqa: E402
+from storage import get_store, PRICE_COLUMNS  # noqa: E402
+
+DEFAULT_BASELINE = os.path.join(ROOT, 'benchmarks', 'baseline.json')
+
+# 합성 시세 크기 (단일 종목 행 수, 전체 종목 수 × 종목당 행 수)
+FULL_SIZES = (10_000, 100_000, 1_000_000)
+QUICK_SIZES = (10_000, 100_000)
+FULL_UNIVERSE = (1_000, 1_000)
+QUICK_UNIVERSE = (100, 1_000)
+
+# 날짜가 필요한 항목(주봉 변환, CSV)의 단일 종목 최대 행 수 (datetime64[ns] 범위: 2262년까지)
+MAX_DATED_ROWS = 100_000
+
+# 저장된 기간별 일간 갱신 메모리 항목의 종목당 행 수 (오늘에서 끝나도록 거꾸로 만들므로 1677년 이후까지)
+MEMORY_SIZES = (1_000, 10_000, 50_000)
+
+# 새 시세가 없을 때 다시 실행하는 항목의 종목 수와 종목당 행 수
+RERUN_UNIVERSE = (500, 300)
+
+# 측정 오차로 보는 최소 차이 (이보다 작은 변화는 회귀로 판정하지 않음)
+MIN_TIME_DELTA = 0.002   # 초
+MIN_MEMORY_DELTA = 1.0   # MB
+
+# 시작 시간 항목의 절대 목표 (초, 새 파이썬 프로세스 실행 시간 포함)
+# 기준값과 상관없이 넘으면 실패로 본다. (무거운 모듈을 시작할 때 불러오게 되는 회귀 방지)
+STARTUP_TARGETS = {
+    'startup/import_main': 0.3,
+    'startup/code_lookup': 0.5,
+}
+
+KRX_STOCK_BLD = 'dbms/MDC/STAT/standard/MDCSTAT01901'
+KRX_ETF_BLD = 'dbms/MDC/STAT/standard/MDCSTAT04301'
+
+
+class OfflineSession:
+    """
+    HttpClient.session.request 대체용 가짜 전송
+
+    KRX 종목/ETF 코드 요청에는 종목 코드 표로 만든 JSON을 돌려주고
+    그 밖의 요청은 연결 오류로 처리해 벤치마크가 네트워크를 쓰지 않도록 한다.
+    """
+
+    def __init__(self, code_df, etf_ratio=0.1):
+        rows = [{'ISU_SRT_CD': code, 'ISU_ABBRV': name}
+                for name, code in zip(code_df['name'], code_df['code'])]
+        split = int(len(rows) * (1 - etf_ratio))
+        self.bodies = {
+            KRX_STOCK_BLD: json.dumps({'OutBlock_1': rows[:split]}).encode('utf-8'),
+            KRX_ETF_BLD: json.dumps({'output': rows[split:]}).encode('utf-8'),
+        }
+        self.requests = 0
+
+    def __call__(self, method, url, data=None, **kwargs):
+        self.requests += 1
+        body = self.bodies.get((data or {}).get('bld')) if 'data.krx.co.kr' in url else None
+        if body is None:
+            raise requests.ConnectionError(f"오프라인 벤치마크에서 차단된 요청: {method} {url}")
+        response = requests.Response()
+        response.status_code = 200
+        response.url = url
+        response.encoding = 'utf-8'
+        response.headers['Content-Type'] = 'application/json'
+        response._content = body
+        return response
+
+
+def load_analysis(workdir):
+    """
+    workdir(stock_data 사본이 있는 디렉토리)에서 analysis 모듈을 불러옴
+    설정은 .env 대신 벤치마크용 값으로 고정하고 네트워크는 OfflineSession으로 대체한다.
+    """
+    load_config(environ={
+        'STORAGE_FORMAT': 'csv',
+        'FETCH_RATE': '0',
+        'HTTP_CACHE': 'off',
+    })
+    os.chdir(workdir)
+    import analysis
+    code_df = pd.read_csv(os.path.join(workdir, 'stock_data', 'krx_code.csv'), dtype={'code': str})
+    analysis.get_http_client().session.request = OfflineSession(code_df)
+    return analysis
+
+
+def make_history(rows, seed=0, start='1800-01-01'):
+    """합성 일간 시세 (로그 정규 랜덤 워크, 영업일 날짜)"""
+    rng = np.random.default_rng(seed)
+    close = np.maximum(10, np.round(10_000 * np.exp(np.cumsum(rng.normal(0, 0.02, rows))))).astype('int64')
+    spread = np.abs(rng.normal(0, 0.01, (3, rows))) * close
+    open_ = np.maximum(1, close + np.round(rng.normal(0, 0.01, rows) * close)).astype('int64')
+    high = (np.maximum(open_, close) + np.round(spread[0])).astype('int64')
+    low = np.maximum(1, np.minimum(open_, close) - np.round(spread[1])).astype('int64')
+    diff = np.zeros(rows, dtype='int64')
+    diff[1:] = close[1:] - close[:-1]
+    return pd.DataFrame({
+        'date': pd.bdate_range(start, periods=rows, unit='s'),
+        'open': open_,
+        'high': high,
+        'low': low,
+        'close': close,
+        'diff': diff,
+        'volume': rng.integers(1_000, 1_000_000, rows),
+    })
+
+
+def make_universe(num_codes, rows, seed=0):
+    """합성 종목 여러 개 {종목코드: 일간 시세} (모두 같은 기간)"""
+    return {f'{900000 + idx:06d}': make_history(rows, seed + idx, start='2000-01-03')
+            for idx in range(num_codes)}
+
+
+def sise_day_page(df):
+    """일간 시세로 만든 네이버 일별 시세 페이지 HTML (최근 날짜부터, parse_daily_pages가 읽는 부분만)"""
+    rows = []
+    for row in df.iloc[::-1].itertuples():
+        marker = 'ico_up' if row.diff > 0 else 'ico_down' if row.diff < 0 else ''
+        cells = ''.join(f'<td class="num"><span>{value:,}</span></td>'
+                        for value in (row.open, row.high, row.low, row.volume))
+        rows.append(f'<tr><td align="center"><span class="tah p10 gray03">{row.date:%Y.%m.%d}</span></td>'
+                    f'<td class="num"><span>{row.close:,}</span></td>'
+                    f'<td class="num"><img src="{marker}.gif"><span>{abs(row.diff):,}</span></td>{cells}</tr>')
+    return '<table class="type2">' + ''.join(rows) + '</table>'
+
+
+def startup_cases(workdir):
+    """
+    새 파이썬 프로세스에서 main 모듈 불러오기와 종목코드 조회(python main.py code) 시간
+    출력은 버리고 실패하면 예외로 알린다. (메모리는 다른 프로세스이므로 측정되지 않음)
+    """
+    python = sys.executable
+    commands = {
+        'startup/python': [python, '-c', 'pass'],
+        'startup/import_main': [python, '-c', f'import sys; sys.path.insert(0, {ROOT!r}); import main'],
+        'startup/code_lookup': [python, os.path.join(ROOT, 'main.py'), 'code', '현대차', '005930'],
+    }
+
+    def run(command):
+        subprocess.run(command, cwd=workdir, check=True, stdout=subprocess.DEVNULL)
+
+    return [(name, 0, 5, lambda c=command: lambda: run(c)) for name, command in commands.items()]
+
+
+def check_targets(results, targets):
+    """절대 목표 시간을 넘은 항목 목록"""
+    failures = []
+    for name, target in targets.items():
+        result = results.get(name)
+        if result is not None and result['time'] > target:
+            print(f"{name}: {result['time'] * 1000:.1f} ms (목표 {target * 1000:.0f} ms 초과)")
+            failures.append((name, ['목표 시간']))
+    return failures
+
+
+def fixture_cases(analysis, workdir):
+    """저장소에 포함된 stock_data 시세 기준 항목"""
+    store = analysis.get_price_store()
+    codes = store.codes('daily')
+    daily = {code: store.load(code, 'daily') for code in codes}
+    weekly = {code: store.load(code, 'weekly') for code in store.codes('weekly')}
+    daily_rows = sum(len(df) for df in daily.values())
+    weekly_rows = sum(len(df) for df in weekly.values())
+    out_store = get_store('csv', os.path.join(workdir, 'bench_fixture'))
+
+    def macd_daily():
+        for df in daily.values():
+            analysis.calculate_macd_daily(df)
+
+    def macd_weekly():
+        for df in weekly.values():
+            analysis.calculate_macd_weekly(df)
+
+    def resample():
+        for df in daily.values():
+            resample_weekly(df)
+
+    def weekly_data():
+        for code, df in daily.items():
+            analysis.get_weekly_data(df, code)
+
+    def csv_load():
+        for code in codes:
+            analysis.load_daily_data(code)
+
+    def csv_save():
+        for code, df in daily.items():
+            out_store.save(code, 'daily', df[PRICE_COLUMNS])
+
+    return [
+        ('fixture/macd_daily', daily_rows, 20, lambda: macd_daily),
+        ('fixture/macd_weekly', weekly_rows, 20, lambda: macd_weekly),
+        ('fixture/resample_weekly', daily_rows, 20, lambda: resample),
+        ('fixture/get_weekly_data', daily_rows, 5, lambda: weekly_data),
+        ('fixture/csv_load', daily_rows, 5, lambda: csv_load),
+        ('fixture/csv_save', daily_rows, 5, lambda: csv_save),
+    ]
+
+
+def krx_cases(analysis):
+    """종목코드 조회 항목 (KRX 응답 파싱/캐시 저장, 캐시 읽기, 종목명 변환)"""
+    cache_file = os.path.join('stock_data', 'krx_code.csv')
+    code_df = pd.read_csv(cache_file, dtype={'code': str})
+    names = code_df['name'].tolist()
+    typos = [name[:-1] + '?' for name in names[::len(names) // 50 or 1]]
+
+    def cached():
+        os.utime(cache_file)  # 오늘 만든 캐시로 취급되도록 수정 시각 갱신
+        return lambda: analysis.get_krx_code()
+
+    def lookup():
+        resolver = CodeResolver(analysis.get_krx_code())
+        resolver.resolve_many(names)
+        for name in typos:
+            resolver.suggest(name)
+
+    return [
+        ('krx/get_krx_code_fetch', len(code_df), 5, lambda: lambda: analysis.get_krx_code(force_update=True)),
+        ('krx/get_krx_code_cached', len(code_df), 10, cached),
+        ('krx/resolve_names', len(names) + len(typos), 5, lambda: lookup),
+    ]
+
+
+def synthetic_cases(analysis, workdir, sizes, universe):
+    """합성 시세 기준 항목 (단일 종목 크기별 + 여러 종목)"""
+    cases = []
+    out_store = get_store('csv', os.path.join(workdir, 'bench_synthetic'))
+
+    for rows in sizes:
+        repeat = 3 if rows >= 1_000_000 else 5
+        history = make_history(rows)
+        cases.append((f'synthetic/macd_daily_{rows}', rows, repeat,
+                      lambda h=history: lambda: analysis.calculate_macd_daily(h)))
+        cases.append((f'synthetic/macd_weekly_{rows}', rows, repeat,
+                      lambda h=history: lambda: analysis.calculate_macd_weekly(h)))
+        if rows > MAX_DATED_ROWS:
+            continue
+        code = f'{rows:06d}'[-6:]
+        cases.append((f'synthetic/resample_weekly_{rows}', rows, repeat,
+                      lambda h=history: lambda: resample_weekly(h)))
+        cases.append((f'synthetic/csv_save_{rows}', rows, repeat,
+                      lambda h=history, c=code: lambda: out_store.save(c, 'daily', h)))
+
+        def load_case(h=history, c=code):
+            out_store.save(c, 'daily', h)
+            return lambda: out_store.load(c, 'daily')
+        cases.append((f'synthetic/csv_load_{rows}', rows, repeat, load_case))
+
+    num_codes, rows = universe
+    label = f'{num_codes}x{rows}'
+    frames = {}
+
+    def universe_frames():
+        if not frames:
+            frames.update(make_universe(num_codes, rows))
+        return frames
+
+    def panel_case():
+        panel = pd.concat([df.assign(code=code) for code, df in universe_frames().items()], ignore_index=True)
+        return lambda: resample_weekly(panel, by='code')
+
+    def save_case():
+        data = universe_frames()
+        return lambda: [out_store.save(code, 'daily', df) for code, df in data.items()]
+
+    def load_case():
+        data = universe_frames()
+        for code, df in data.items():
+            out_store.save(code, 'daily', df)
+        return lambda: [out_store.load(code, 'daily') for code in data]
+
+    panel_dir = os.path.join(workdir, 'bench_panel')
+
+    def saved_universe():
+        data = universe_frames()
+        for code, df in data.items():
+            out_store.save(code, 'daily', df)
+        return list(data)
+
+    def panel_build_case():
+        saved_universe()
+        return lambda: build_panel(out_store, panel_dir)
+
+    def panel_open_case():
+        saved_universe()
+        build_panel(out_store, panel_dir)
+        return lambda: open_panel(panel_dir).matrix('close')[-1].sum()
+
+    def screen_case(use_panel):
+        codes = saved_universe()
+        panel = build_panel(out_store, panel_dir) if use_panel else None
+        return lambda: screen_universe(out_store, codes, panel=panel)
+
+    total = num_codes * rows
+    cases.append((f'universe/resample_weekly_{label}', total, 3, panel_case))
+    cases.append((f'universe/csv_save_{label}', total, 1, save_case))
+    cases.append((f'universe/csv_load_{label}', total, 1, load_case))
+    cases.append((f'universe/panel_build_{label}', total, 1, panel_build_case))
+    cases.append((f'universe/panel_open_{label}', total, 10, panel_open_case))
+    cases.append((f'universe/screen_files_{label}', total, 1, lambda: screen_case(False)))
+    cases.append((f'universe/screen_panel_{label}', total, 3, lambda: screen_case(True)))
+    return cases
+
+
+def pipeline_cases(analysis, universe, new_rows=10):
+    """
+    analyze_stocks의 종목별 CPU 단계 (페이지 파싱 → 병합 → 일간/주간 MACD → 저장 → 시그널)
+    종목마다 저장된 시세 뒤에 new_rows행을 새 페이지로 받은 상황을 한 프로세스와 프로세스 풀(CPU 코어 수, 최소 2)로 측정한다.
+    """
+    num_codes, rows = universe
+    label = f'{num_codes}x{rows}'
+    workers = max(2, os.cpu_count() or 1)
+    inputs = {}
+
+    def stage_inputs():
+        if not inputs:
+            # 주봉 계산 대상(최근 30주)이 있도록 오늘 날짜에서 끝나는 시세
+            start = pd.Timestamp.now().normalize() - pd.offsets.BDay(rows)
+            for idx in range(num_codes):
+                history = make_history(rows, idx, start=start)
+                inputs[f'{800000 + idx:06d}'] = (history.iloc[:-new_rows], [sise_day_page(history.iloc[-new_rows:])])
+        return inputs
+
+    def serial_case():
+        data = stage_inputs()
+
+        def run():
+            for code, (existing_df, pages) in data.items():
+                prefetched = {'existing_df': existing_df, 'new_df': analysis.parse_daily_pages(pages)}
+                analysis.analyze_stock_prices(code, 1, prefetched=prefetched)
+        return run
+
+    def pool_case():
+        data = stage_inputs()
+
+        def run():
+            stage = CpuStage(workers, 1)
+            for code, (existing_df, pages) in data.items():
+                stage.submit(code, {'existing_df': existing_df, 'pages': pages})
+            for code in data:
+                stage.result(code)
+        return run
+
+    total = num_codes * new_rows
+    return [
+        (f'pipeline/cpu_stage_serial_{label}', total, 1, serial_case),
+        (f'pipeline/cpu_stage_pool_{label}', total, 1, pool_case),
+    ]
+
+
+def memory_cases(analysis, sizes=MEMORY_SIZES, new_rows=5):
+    """
+    저장된 기간 길이별 종목 하나의 일간 갱신 (new_rows행 추가 → 일간/주간 MACD → 저장 → 시그널)
+    최근 구간만 읽는 경로(memory/daily_update)와 전체를 읽는 경로(memory/daily_update_full)를 비교한다.
+    앞의 것은 저장된 기간이 길어져도 최대 메모리가 거의 늘지 않아야 한다.
+    매 실행 전에 시세/MACD 상태 파일을 처음 상태로 되돌린다. (실행 시간에 파일 복사 포함)
+    """
+    store = analysis.get_price_store()
+    cases = []
+    for idx, rows in enumerate(sizes):
+        code = f'{700000 + idx:06d}'
+
+        def prepare(rows=rows, code=code, seed=idx):
+            start = pd.Timestamp.now().normalize() - pd.offsets.BDay(rows)
+            history = make_history(rows, seed, start=start)
+            daily, daily_state = update_macd(history.iloc[:-new_rows].copy(), 0, None, DAILY_PARAMS)
+            weekly = resample_weekly(daily)
+            weekly['diff'] = weekly['close'].diff().fillna(0).astype(int)
+            weekly, weekly_state = update_macd(weekly, 0, None, WEEKLY_PARAMS)
+            store.save(code, 'daily', daily[PRICE_COLUMNS])
+            store.save(code, 'weekly', weekly[PRICE_COLUMNS])
+            save_macd_state(analysis.macd_state_path(code, 'daily'), daily_state)
+            save_macd_state(analysis.macd_state_path(code, 'weekly'), weekly_state)
+            paths = [store.path(code, 'daily'), store.path(code, 'weekly'),
+                     analysis.macd_state_path(code, 'daily'), analysis.macd_state_path(code, 'weekly')]
+            for path in paths:
+                shutil.copyfile(path, path + '.orig')
+            new_df = analysis.parse_daily_pages([sise_day_page(history.iloc[-new_rows:])])
+            return paths, new_df
+
+        def update_case(windowed, prepare=prepare, code=code):
+            paths, new_df = prepare()
+
+            def run():
+                for path in paths:
+                    shutil.copyfile(path + '.orig', path)
+                with mock.patch.object(analysis, 'can_load_window', return_value=windowed):
+                    existing_df, offset = analysis.load_daily_window(code)
+                    prefetched = {'existing_df': existing_df, 'new_df': new_df, 'offset': offset}
+                    analysis.analyze_stock_prices(code, 1, prefetched=prefetched)
+            return run
+
+        cases.append((f'memory/daily_update_{rows}', rows, 3, lambda u=update_case: u(True)))
+        cases.append((f'memory/daily_update_full_{rows}', rows, 3, lambda u=update_case: u(False)))
+    return cases
+
+
+def rerun_cases(analysis, universe=RERUN_UNIVERSE):
+    """
+    새 시세가 없을 때 analyze_stocks 재실행 (워크플로 재실행, 휴장일)
+    종목 코드표 앞쪽 종목들의 시세를 오늘까지 저장하고 한 번 분석해 둔 뒤 다시 실행한다.
+    실행 매니페스트로 모든 종목을 다시 계산하지 않아야 하므로 1초보다 훨씬 짧아야 한다.
+    """
+    num_codes, rows = universe
+    label = f'{num_codes}x{rows}'
+
+    def rerun_case():
+        code_df = pd.read_csv(os.path.join('stock_data', 'krx_code.csv'), dtype={'code': str})
+        code_df = code_df.drop_duplicates('name').drop_duplicates('code').head(num_codes)
+        start = pd.Timestamp.now().normalize() - pd.offsets.BDay(rows - 1)
+        for idx, code in enumerate(code_df['code'].str.zfill(6)):
+            history = make_history(rows, idx, start=start)
+            prefetched = {'existing_df': pd.DataFrame(), 'new_df': history, 'offset': 0}
+            analysis.analyze_stock_prices(code, 1, prefetched=prefetched)
+        get_config().stock_names = code_df['name'].tolist()
+        analysis.analyze_stocks(announce=False)
+        return lambda: analysis.analyze_stocks(announce=False)
+
+    return [(f'manifest/rerun_unchanged_{label}', num_codes, 5, rerun_case)]
+
+
+def measure(func, repeat):
+    """
+    실행 시간과 최대 메모리 측정
+    첫 실행은 tracemalloc을 켜고 최대 메모리만 재며(워밍업 겸용), 이후 repeat번 실행 시간을 잰다.
+    """
+    with contextlib.redirect_stdout(io.StringIO()):
+        tracemalloc.start()
+        try:
+            func()
+            _, peak = tracemalloc.get_traced_memory()
+        finally:
+            tracemalloc.stop()
+
+        times = []
+        for _ in range(repeat):
+            start = time.perf_counter()
+            func()
+            times.append(time.perf_counter() - start)
+    return {
+        'time': round(min(times), 6),
+        'mean': round(sum(times) / len(times), 6),
+        'peak_mb': round(peak / 2 ** 20, 3),
+        'repeat': repeat,
+    }
+
+
+def run_cases(cases, keywords=None):
+    """이름에 keywords 중 하나가 들어간 항목만 실행하여 {이름: 결과} 반환"""
+    results = {}
+    for name, rows, repeat, make in cases:
+        if keywords and not any(keyword in name for keyword in keywords):
+            continue
+        with contextlib.redirect_stdout(io.StringIO()):
+            func = make()
+        result = measure(func, repeat)
+        result['rows'] = rows
+        results[name] = result
+        print(f"{name:40s} {rows:>10,}행 {result['time'] * 1000:10.2f} ms  {result['peak_mb']:9.2f} MB")
+    return results
+
+
+def compare(results, baseline, threshold, memory_threshold):
+    """
+    기준값과 비교하여 회귀 목록 반환
+    시간은 최소 실행 시간 기준, threshold(비율)와 MIN_TIME_DELTA를 모두 넘으면 회귀로 본다.
+    """
+    regressions = []
+    print(f"\n{'항목':38s} {'기준(ms)':>10s} {'현재(ms)':>10s} {'배율':>6s} {'기준(MB)':>9s} {'현재(MB)':>9s}")
+    for name, result in results.items():
+        base = baseline.get('cases', {}).get(name)
+        if base is None:
+            print(f"{name:40s} {'(기준 없음)':>10s}")
+            continue
+        ratio = result['time'] / base['time'] if base['time'] else float('inf')
+        flags = []
+        if result['time'] - base['time'] > max(threshold * base['time'], MIN_TIME_DELTA):
+            flags.append('시간')
+        if result['peak_mb'] - base['peak_mb'] > max(memory_threshold * base['peak_mb'], MIN_MEMORY_DELTA):
+            flags.append('메모리')
+        mark = f"  ← 회귀 ({', '.join(flags)})" if flags else ''
+        print(f"{name:40s} {base['time'] * 1000:10.2f} {result['time'] * 1000:10.2f} {ratio:6.2f} "
+              f"{base['peak_mb']:9.2f} {result['peak_mb']:9.2f}{mark}")
+        if flags:
+            regressions.append((name, flags))
+    return regressions
+
+
+def environment_info(quick):
+    return {
+        'created': datetime.now().isoformat(timespec='seconds'),
+        'python': platform.python_version(),
+        'pandas': pd.__version__,
+        'numpy': np.__version__,
+        'platform': platform.platform(),
+        'cpu_count': os.cpu_count(),
+        'quick': quick,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description='핵심 경로 벤치마크 (오프라인)')
+    parser.add_argument('-k', '--keyword', action='append', help='이름에 이 문자열이 들어간 항목만 실행 (여러 번 지정 가능)')
+    parser.add_argument('--quick', action='store_true', help='합성 데이터를 10만 행, 100종목까지로 축소')
+    parser.add_argument('--baseline', default=DEFAULT_BASELINE, help='기준값 JSON 파일 경로')
+    parser.add_argument('--save', action='store_true', help='측정 결과를 기준값으로 저장 (기존 항목은 덮어씀)')
+    parser.add_argument('--threshold', type=float, default=0.25, help='허용하는 실행 시간 증가 비율 (기본 0.25)')
+    parser.add_argument('--memory-threshold', type=float, default=0.25, help='허용하는 최대 메모리 증가 비율 (기본 0.25)')
+    parser.add_argument('--output', help='측정 결과를 저장할 JSON 파일 경로')
+    args = parser.parse_args()
+
+    sizes = QUICK_SIZES if args.quick else FULL_SIZES
+    universe = QUICK_UNIVERSE if args.quick else FULL_UNIVERSE
+    baseline_path = os.path.abspath(args.baseline)
+    output_path = os.path.abspath(args.output) if args.output else None
+    cwd = os.getcwd()
+
+    with tempfile.TemporaryDirectory(prefix='bench_suite_') as workdir:
+        shutil.copytree(os.path.join(ROOT, 'stock_data'), os.path.join(workdir, 'stock_data'),
+                        ignore=shutil.ignore_patterns('__pycache__'))
+        try:
+            analysis = load_analysis(workdir)
+            cases = (startup_cases(workdir)
+                     + fixture_cases(analysis, workdir)
+                     + krx_cases(analysis)
+                     + synthetic_cases(analysis, workdir, sizes, universe)
+                     + pipeline_cases(analysis, universe)
+                     + memory_cases(analysis)
+                     + rerun_cases(analysis))
+            results = run_cases(cases, args.keyword)
+            network_requests = analysis.get_http_client().session.request.requests
+        finally:
+            os.chdir(cwd)
+
+    failures = check_targets(results, STARTUP_TARGETS)
+    report = {'meta': environment_info(args.quick), 'cases': results}
+    print(f"\n가짜 KRX 응답으로 처리한 요청 수: {network_requests}")
+    if output_path:
+        with open(output_path, 'w', encoding='utf-8') as f:
+            json.dump(report, f, ensure_ascii=False, indent=2)
+        print(f"측정 결과 저장: {output_path}")
+
+    if args.save:
+        baseline = {'cases': {}}
+        if os.path.exists(baseline_path):
+            with open(baseline_path, encoding='utf-8') as f:
+                baseline = json.load(f)
+        baseline['meta'] = report['meta']
+        baseline.setdefault('cases', {}).update(results)
+        with open(baseline_path, 'w', encoding='utf-8') as f:
+            json.dump(baseline, f, ensure_ascii=False, indent=2)
+        print(f"기준값 저장: {baseline_path} ({len(results)}개 항목)")
+        return 1 if failures else 0
+
+    if not os.path.exists(baseline_path):
+        print(f"기준값 파일이 없습니다: {baseline_path} (--save로 먼저 저장하세요)")
+        return 1 if failures else 0
+
+    with open(baseline_path, encoding='utf-8') as f:
+        baseline = json.load(f)
+    regressions = compare(results, baseline, args.threshold, args.memory_threshold) + failures
+    if regressions:
+        print(f"\n성능 회귀 {len(regressions)}건: " + ', '.join(f"{name}({'/'.join(flags)})" for name, flags in regressions))
+        return 1
+    print("\n성능 회귀 없음")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
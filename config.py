@@ -0,0 +1,108 @@
+import os
+
+from tracing import parse_profile_modes
+
+# .env 파일 위치 (이 파일과 같은 디렉토리)
+ENV_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), '.env')
+
+
+def _flag(value):
+    return (value or '').strip().lower() in ('1', 'true', 'yes')
+
+
+class Config:
+    """
+    실행 설정 (환경변수 / .env)
+
+    모듈을 불러올 때가 아니라 get_config()를 처음 호출할 때 읽는다.
+    pandas 등 무거운 모듈을 불러오지 않으므로 종목코드 조회 같은 가벼운 명령에서도 쓸 수 있다.
+    """
+
+    def __init__(self, environ):
+        get = environ.get
+        self.environ = dict(environ)  # 읽은 환경변수 (CPU 작업 프로세스에 같은 설정을 넘길 때 사용)
+        self.discord_webhook_url = get('DISCORD_WEBHOOK_URL') or None
+        self.discord_use_embeds = _flag(get('DISCORD_USE_EMBEDS'))  # 메시지를 embed로 묶어 전송
+        self.stock_names = [name.strip() for name in get('STOCK_NAME', '티웨이홀딩스').split(',')]
+        self.data_days = int(get('DATA_DAYS', '200').strip())  # 분석할 과거 데이터 일수
+        self.fetch_workers = int(get('FETCH_WORKERS', '8').strip())  # 동시에 보내는 최대 요청 수
+        self.cpu_workers = int(get('CPU_WORKERS', '1').strip() or 1)  # 시세 계산/저장 프로세스 수 (1이면 한 프로세스, 0이면 CPU 코어 수)
+        self.fetch_rate = float(get('FETCH_RATE', '10').strip())  # 호스트별 초당 최대 요청 수 (0이면 제한 없음)
+        self.host_overrides = get('HTTP_HOST_OVERRIDES', '')  # 테스트용 스텁 서버로 대체할 호스트
+        self.storage_format = get('STORAGE_FORMAT', 'csv').strip()  # 시세 저장 형식 (csv, feather, parquet)
+        self.storage_export_csv = _flag(get('STORAGE_EXPORT_CSV'))  # CSV 사본 저장 여부
+        self.price_panel = _flag(get('PRICE_PANEL'))  # 전 종목 시세 패널(stock_data/panel) 사용 및 갱신
+        self.run_manifest = _flag(get('RUN_MANIFEST', '1'))  # 입력이 그대로인 종목은 마지막 실행 결과 재사용 (stock_data/run_manifest.json)
+        self.indicators_text = get('INDICATORS', '')  # MACD 외에 함께 계산/저장할 지표 (예: rsi,bb:20:2,atr)
+        self.trace_dir = get('TRACE_DIR', '').strip()  # 실행별 단계 시간 요약/trace JSON을 저장할 디렉토리 (비우면 출력만)
+        self.profile = parse_profile_modes(get('PROFILE', ''))  # 프로파일링 방식 (cprofile, tracemalloc)
+        self.http_cache = get('HTTP_CACHE', 'off').strip().lower()  # KRX/네이버 응답 캐시 (off, cache, record, replay)
+        self.http_cache_dir = get('HTTP_CACHE_DIR', 'http_cache').strip()  # 응답 캐시 디렉토리
+        self.http_cache_max_mb = float(get('HTTP_CACHE_MAX_MB', '200').strip())  # 응답 캐시 최대 크기 (MB)
+        self.schedule_daily = get('SCHEDULE_DAILY', '15:40').strip()  # 상주 모드: 거래일 장 마감 후 분석 시각 (비우면 끔)
+        self.schedule_weekly = get('SCHEDULE_WEEKLY', 'fri 16:00').strip()  # 상주 모드: 주간 분석 요일/시각 (비우면 끔)
+        self.schedule_intraday = int(get('SCHEDULE_INTRADAY', '0').strip() or 0)  # 상주 모드: 장중 조회 간격 (분, 0이면 끔)
+        self.status_port = int(get('STATUS_PORT', '8765').strip() or 0)  # 상주 모드: 상태 조회 HTTP 포트 (127.0.0.1, 0이면 끔)
+        self.notices = []
+        self._indicators = None
+
+        # 재생 모드에서는 네트워크를 쓰지 않으므로 Discord 알림도 보내지 않음
+        if self.http_cache == 'replay' and self.discord_webhook_url:
+            self.notices.append("HTTP_CACHE=replay: 네트워크를 사용하지 않으므로 Discord 알림을 보내지 않습니다.")
+            self.discord_webhook_url = None
+
+    @property
+    def indicators(self):
+        """INDICATORS를 파싱한 지표 목록 [(이름, 파라미터), ...] (처음 사용할 때 한 번만 파싱)"""
+        if self._indicators is None:
+            from indicators import parse_indicators
+            self._indicators = parse_indicators(self.indicators_text)
+        return self._indicators
+
+
+_config = None
+
+
+def load_dotenv_file(env_path=ENV_PATH, verbose=False):
+    """
+    .env 파일을 환경변수로 읽음 (이미 설정된 환경변수는 유지)
+    python-dotenv는 이 함수를 호출할 때만 불러온다.
+    """
+    if verbose:
+        print(f"Looking for .env file at: {env_path}")
+    if not os.path.exists(env_path):
+        if verbose:
+            print(f"Warning: .env file not found at {env_path}")
+        return False
+    if verbose:
+        print(".env file found and exists")
+    from dotenv import load_dotenv
+    load_dotenv(dotenv_path=env_path)
+    return True
+
+
+def load_config(environ=None, env_path=ENV_PATH, verbose=False):
+    """
+    설정을 새로 읽어 기본 설정으로 등록
+    environ을 주면 .env와 os.environ 대신 그 값만 사용한다. (테스트/벤치마크용)
+    verbose: .env 위치와 주요 환경변수 원래 값을 출력
+    """
+    global _config
+    if environ is None:
+        load_dotenv_file(env_path, verbose)
+        environ = os.environ
+    if verbose:
+        print("\nCurrent environment variables:")
+        for key in ['DISCORD_WEBHOOK_URL', 'STOCK_NAME', 'DATA_DAYS']:
+            print(f"{key} raw value: '{environ.get(key)}'")
+    _config = Config(environ)
+    for notice in _config.notices:
+        print(notice)
+    return _config
+
+
+def get_config():
+    """기본 설정 (처음 호출할 때 .env와 환경변수에서 읽음)"""
+    if _config is None:
+        return load_config()
+    return _config
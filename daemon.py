@@ -0,0 +1,377 @@
+import argparse
+import json
+import signal
+import threading
+import time
+from datetime import datetime, timedelta, timezone
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from importlib import import_module
+from urllib.error import URLError
+from urllib.parse import parse_qs, urlsplit
+from urllib.request import Request, urlopen
+
+from config import get_config, load_config
+from tracing import get_tracer
+
+KST = timezone(timedelta(hours=9))
+
+# 장 시작/마감 시각 (한국 시간)
+MARKET_OPEN = (9, 0)
+MARKET_CLOSE = (15, 30)
+
+WEEKDAYS = ('mon', 'tue', 'wed', 'thu', 'fri', 'sat', 'sun')
+
+# 실행 종류: daily(장 마감 후), weekly(주 1회), intraday(장중 반복)
+CYCLE_KINDS = ('daily', 'weekly', 'intraday')
+
+
+def _analysis():
+    return import_module('analysis')
+
+
+def parse_clock(text):
+    """'15:40' → (15, 40)"""
+    hour, minute = text.strip().split(':')
+    hour, minute = int(hour), int(minute)
+    if not (0 <= hour < 24 and 0 <= minute < 60):
+        raise ValueError(f"잘못된 시각입니다: {text}")
+    return hour, minute
+
+
+def parse_weekly(text):
+    """'fri 16:00' → (4, 16, 0) (요일 번호: 월요일 0)"""
+    day, clock = text.strip().lower().split()
+    if day[:3] not in WEEKDAYS:
+        raise ValueError(f"잘못된 요일입니다: {day} (가능: {', '.join(WEEKDAYS)})")
+    return (WEEKDAYS.index(day[:3]),) + parse_clock(clock)
+
+
+def _at(day, clock):
+    return datetime(day.year, day.month, day.day, clock[0], clock[1], tzinfo=KST)
+
+
+def next_daily(now, clock, is_trading_day):
+    """now 이후 처음 오는 거래일 clock 시각"""
+    day = now.date()
+    for _ in range(370):
+        if is_trading_day(day) and _at(day, clock) > now:
+            return _at(day, clock)
+        day += timedelta(days=1)
+    return None
+
+
+def next_weekly(now, weekday, clock):
+    """now 이후 처음 오는 weekday 요일 clock 시각 (휴장일이어도 실행)"""
+    day = now.date() + timedelta(days=(weekday - now.weekday()) % 7)
+    if _at(day, clock) <= now:
+        day += timedelta(days=7)
+    return _at(day, clock)
+
+
+def next_intraday(now, minutes, is_trading_day):
+    """now 이후 처음 오는 장중 조회 시각 (거래일 장 시작부터 minutes분 간격, 장 마감까지)"""
+    day = now.date()
+    for _ in range(370):
+        if is_trading_day(day):
+            opens, closes = _at(day, MARKET_OPEN), _at(day, MARKET_CLOSE)
+            if now < opens:
+                return opens
+            if now < closes:
+                steps = int((now - opens).total_seconds() // (minutes * 60)) + 1
+                at = opens + timedelta(minutes=minutes * steps)
+                if at <= closes:
+                    return at
+        day += timedelta(days=1)
+        now = _at(day, (0, 0))
+    return None
+
+
+class StockDaemon:
+    """
+    상주 실행 (정해진 시각마다 분석)
+
+    한 프로세스에서 계속 실행되므로 설정, 종목코드 변환기, 종목별 시세(MACD 포함)를 메모리에 두고
+    매번 새로 추가된 시세만 조회/계산한다. 장중 조회로 저장된 오늘 시세는 다음 실행에서 다시 받아 교체한다.
+    이미 알린 시그널은 다시 알리지 않으며, 시작/요약 메시지는 장중 조회에서는 보내지 않는다.
+    """
+
+    def __init__(self, config):
+        self.config = config
+        self.schedule = {}
+        if config.schedule_daily:
+            self.schedule['daily'] = parse_clock(config.schedule_daily)
+        if config.schedule_weekly:
+            self.schedule['weekly'] = parse_weekly(config.schedule_weekly)
+        if config.schedule_intraday > 0:
+            self.schedule['intraday'] = config.schedule_intraday
+        self.seen_signals = set()
+        self._lock = threading.Lock()
+        self._wake = threading.Event()
+        self._stopping = False
+        self._requested = []
+        self._state = {
+            'started': datetime.now(KST).isoformat(timespec='seconds'),
+            'status': 'starting',
+            'schedule': {kind: _describe(kind, spec) for kind, spec in self.schedule.items()},
+            'cycles': 0,
+            'warm_up': None,
+            'current': None,
+            'next_run': None,
+            'last_run': None,
+        }
+
+    def status(self):
+        """상태 (JSON으로 변환 가능한 사본)"""
+        with self._lock:
+            return json.loads(json.dumps(self._state, default=str))
+
+    def request_run(self, kind='daily'):
+        """다음 예약 시각을 기다리지 않고 바로 실행 요청"""
+        if kind not in CYCLE_KINDS:
+            raise ValueError(f"지원하지 않는 실행 종류입니다: {kind} (가능: {', '.join(CYCLE_KINDS)})")
+        with self._lock:
+            self._requested.append(kind)
+        self._wake.set()
+
+    def stop(self):
+        self._stopping = True
+        self._wake.set()
+
+    def next_run(self, now):
+        """다음 예약 (시각, 종류)"""
+        analysis = _analysis()
+        candidates = []
+        for kind, spec in self.schedule.items():
+            if kind == 'daily':
+                at = next_daily(now, spec, analysis.is_trading_day)
+            elif kind == 'weekly':
+                at = next_weekly(now, spec[0], spec[1:])
+            else:
+                at = next_intraday(now, spec, analysis.is_trading_day)
+            if at is not None:
+                candidates.append((at, CYCLE_KINDS.index(kind), kind))
+        if not candidates:
+            return None
+        at, _, kind = min(candidates)
+        return at, kind
+
+    def warm_up(self):
+        """종목코드 변환기와 분석 대상 종목의 저장된 시세를 미리 메모리에 올림"""
+        analysis = _analysis()
+        start = time.perf_counter()
+        self._set(status='warming_up')
+        store = analysis.keep_prices_in_memory()
+        codes, _ = analysis.get_code_resolver().resolve_many(self.config.stock_names)
+        for code in codes.values():
+            for timeframe in ('daily', 'weekly'):
+                store.load(code, timeframe)
+        elapsed = round(time.perf_counter() - start, 3)
+        self._set(status='idle', warm_up={'seconds': elapsed, 'stocks': len(codes)})
+        print(f"[상주] 준비 완료: {len(codes)}개 종목 시세 로드 ({elapsed:.2f}초)")
+
+    def run_cycle(self, kind):
+        """분석 1회 실행 (새로 추가된 시세만 조회/계산)"""
+        analysis = _analysis()
+        tracer = get_tracer()
+        tracer.reset()
+        started = datetime.now(KST)
+        self._set(status='running', current={'kind': kind, 'started': started.isoformat(timespec='seconds')})
+        print(f"\n[상주] {kind} 실행 시작: {started.strftime('%Y-%m-%d %H:%M:%S')}")
+
+        start = time.perf_counter()
+        try:
+            result = analysis.analyze_stocks(announce=kind != 'intraday', seen_signals=self.seen_signals,
+                                             refresh_today=True)
+            error = None
+        except Exception as e:
+            result, error = None, str(e)
+            print(f"[상주] {kind} 실행 중 오류 발생: {error}")
+        elapsed = time.perf_counter() - start
+
+        summary = tracer.summary()
+        last_run = {
+            'kind': kind,
+            'started': started.isoformat(timespec='seconds'),
+            'seconds': round(elapsed, 3),
+            'error': error,
+            'analyzed': result['analyzed'] if result else 0,
+            'errors': result['error_stocks'] if result else [],
+            'signals': [{'name': item['name'], 'code': item['code'], 'type': signal['type'],
+                         'date': signal['date'].strftime('%Y-%m-%d'), 'price': int(signal['price']),
+                         'reason': signal['reason']}
+                        for item in (result['results'] if result else []) for signal in item['signal_list']],
+            'stages': {name: {'count': stats['count'], 'total': stats['total']}
+                       for name, stats in summary['stages'].items()},
+            'counters': summary['counters'],
+            'http': analysis.get_http_client().stats(),
+        }
+        with self._lock:
+            self._state['cycles'] += 1
+        self._set(status='idle', current=None, last_run=last_run)
+        print(f"[상주] {kind} 실행 완료: {elapsed:.2f}초, 시그널 {len(last_run['signals'])}개")
+        return last_run
+
+    def run(self):
+        """예약 시각마다 실행 (stop()을 호출할 때까지)"""
+        while not self._stopping:
+            with self._lock:
+                kind = self._requested.pop(0) if self._requested else None
+            if kind is not None:
+                self.run_cycle(kind)
+                continue
+
+            now = datetime.now(KST)
+            upcoming = self.next_run(now)
+            self._set(next_run=upcoming and {'kind': upcoming[1], 'at': upcoming[0].isoformat(timespec='seconds')})
+            timeout = None if upcoming is None else max(0.0, (upcoming[0] - now).total_seconds())
+            if self._wake.wait(timeout):
+                self._wake.clear()
+                continue
+            if upcoming is not None and not self._stopping:
+                self.run_cycle(upcoming[1])
+        self._set(status='stopped', next_run=None)
+
+    def _set(self, **values):
+        with self._lock:
+            self._state.update(values)
+
+
+def _describe(kind, spec):
+    if kind == 'daily':
+        return f"거래일 {spec[0]:02d}:{spec[1]:02d}"
+    if kind == 'weekly':
+        return f"{WEEKDAYS[spec[0]]} {spec[1]:02d}:{spec[2]:02d}"
+    return f"장중 {spec}분 간격"
+
+
+def make_status_handler(daemon):
+    """
+    상태 조회 HTTP 핸들러
+    GET /status: 전체 상태, GET /signals: 마지막 실행의 시그널, POST /run?kind=daily: 바로 실행
+    """
+
+    class StatusHandler(BaseHTTPRequestHandler):
+        def do_GET(self):
+            path = urlsplit(self.path).path
+            if path in ('/', '/status'):
+                self._reply(200, daemon.status())
+            elif path == '/signals':
+                last_run = daemon.status()['last_run']
+                self._reply(200, last_run['signals'] if last_run else [])
+            else:
+                self._reply(404, {'error': f'not found: {path}'})
+
+        def do_POST(self):
+            parts = urlsplit(self.path)
+            if parts.path != '/run':
+                self._reply(404, {'error': f'not found: {parts.path}'})
+                return
+            kind = parse_qs(parts.query).get('kind', ['daily'])[0]
+            try:
+                daemon.request_run(kind)
+            except ValueError as e:
+                self._reply(400, {'error': str(e)})
+                return
+            self._reply(202, {'requested': kind})
+
+        def _reply(self, status, body):
+            data = json.dumps(body, ensure_ascii=False, indent=2, default=str).encode('utf-8')
+            self.send_response(status)
+            self.send_header('Content-Type', 'application/json; charset=utf-8')
+            self.send_header('Content-Length', str(len(data)))
+            self.end_headers()
+            self.wfile.write(data)
+
+        def log_message(self, format, *args):
+            pass
+
+    return StatusHandler
+
+
+def start_status_server(daemon, port):
+    """127.0.0.1:port에서 상태 조회 서버를 백그라운드 스레드로 시작"""
+    server = ThreadingHTTPServer(('127.0.0.1', port), make_status_handler(daemon))
+    threading.Thread(target=server.serve_forever, name='status-server', daemon=True).start()
+    return server
+
+
+# 상주 실행 CLI
+def serve_main(argv=None):
+    """
+    정해진 시각마다 분석을 반복 실행 (SCHEDULE_DAILY, SCHEDULE_WEEKLY, SCHEDULE_INTRADAY)
+    사용법: python main.py serve [--port N] [--run-now daily|weekly|intraday] [--once daily|weekly|intraday]
+    """
+    parser = argparse.ArgumentParser(prog='main.py serve', description='상주 실행 (예약 분석 + 상태 조회)')
+    parser.add_argument('--port', type=int, default=None, help='상태 조회 포트 (기본: STATUS_PORT, 0이면 끔)')
+    parser.add_argument('--run-now', choices=CYCLE_KINDS, default=None, help='시작하자마자 한 번 실행')
+    parser.add_argument('--once', choices=CYCLE_KINDS, default=None, help='한 번만 실행하고 종료')
+    args = parser.parse_args(argv)
+
+    config = load_config(verbose=True)
+    daemon = StockDaemon(config)
+    daemon.warm_up()
+
+    if args.once:
+        last_run = daemon.run_cycle(args.once)
+        return 1 if last_run['error'] else 0
+
+    port = config.status_port if args.port is None else args.port
+    server = start_status_server(daemon, port) if port else None
+    if server is not None:
+        print(f"[상주] 상태 조회: http://127.0.0.1:{port}/status")
+    print(f"[상주] 예약: {', '.join(_describe(kind, spec) for kind, spec in daemon.schedule.items()) or '없음'}")
+
+    signal.signal(signal.SIGTERM, lambda signum, frame: daemon.stop())
+    if args.run_now:
+        daemon.request_run(args.run_now)
+    try:
+        daemon.run()
+    except KeyboardInterrupt:
+        daemon.stop()
+    finally:
+        if server is not None:
+            server.shutdown()
+        print("[상주] 종료")
+    return 0
+
+
+# 상태 조회 CLI
+def status_main(argv=None):
+    """
+    실행 중인 상주 프로세스의 상태 조회
+    사용법: python main.py status [--port N] [--run daily|weekly|intraday] [--json]
+    """
+    parser = argparse.ArgumentParser(prog='main.py status', description='상주 실행 상태 조회')
+    parser.add_argument('--port', type=int, default=None, help='상태 조회 포트 (기본: STATUS_PORT)')
+    parser.add_argument('--run', choices=CYCLE_KINDS, default=None, help='바로 실행 요청')
+    parser.add_argument('--json', action='store_true', help='JSON 그대로 출력')
+    args = parser.parse_args(argv)
+
+    port = get_config().status_port if args.port is None else args.port
+    base = f'http://127.0.0.1:{port}'
+    try:
+        if args.run:
+            with urlopen(Request(f'{base}/run?kind={args.run}', method='POST'), timeout=5) as response:
+                print(f"실행 요청: {json.load(response)['requested']}")
+        with urlopen(f'{base}/status', timeout=5) as response:
+            state = json.load(response)
+    except (URLError, OSError) as e:
+        print(f"상주 프로세스에 연결할 수 없습니다 ({base}): {e}")
+        return 1
+
+    if args.json:
+        print(json.dumps(state, ensure_ascii=False, indent=2))
+        return 0
+    print(f"상태: {state['status']} (시작 {state['started']}, 실행 {state['cycles']}회)")
+    if state['next_run']:
+        print(f"다음 실행: {state['next_run']['at']} ({state['next_run']['kind']})")
+    last_run = state['last_run']
+    if last_run:
+        print(f"마지막 실행: {last_run['started']} ({last_run['kind']}, {last_run['seconds']:.2f}초, "
+              f"{last_run['analyzed']}개 종목{', 오류: ' + last_run['error'] if last_run['error'] else ''})")
+        stages = sorted(last_run['stages'].items(), key=lambda item: item[1]['total'], reverse=True)[:5]
+        for name, stats in stages:
+            print(f"  {name:40s} {stats['count']:5d}회 {stats['total']:8.3f}초")
+        for item in last_run['signals']:
+            print(f"  {item['type']} {item['name']}({item['code']}) {item['date']} {item['price']:,}원")
+    return 0
@@ -0,0 +1,110 @@
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from urllib.parse import urlsplit
+
+
+class RateLimiter:
+    """
+    호스트별 요청 속도 제한기 (스레드 안전)
+
+    같은 호스트로 가는 요청 사이에 최소 1 / rate 초 간격을 둔다.
+    rate가 0 이하이면 제한하지 않는다.
+    """
+
+    def __init__(self, rate):
+        self.rate = rate
+        self._lock = threading.Lock()
+        self._next_time = {}
+
+    def wait(self, url):
+        """url의 호스트에 요청을 보내도 될 때까지 대기"""
+        if self.rate <= 0:
+            return
+        host = urlsplit(url).netloc
+        interval = 1.0 / self.rate
+
+        # 다음 요청 가능 시각을 먼저 예약하고 잠금 밖에서 대기
+        with self._lock:
+            now = time.monotonic()
+            scheduled = max(now, self._next_time.get(host, now))
+            self._next_time[host] = scheduled + interval
+
+        delay = scheduled - now
+        if delay > 0:
+            time.sleep(delay)
+
+
+def map_concurrently(func, items, max_workers=8):
+    """
+    items의 각 항목(인자 튜플)에 func를 병렬 적용
+
+    - 동시에 실행되는 작업 수는 max_workers개로 제한
+    - 결과는 입력 순서대로 반환
+    - 한 항목에서 발생한 예외는 다른 항목에 영향을 주지 않고 결과 자리에 예외 객체로 반환
+    """
+    items = list(items)
+    if not items:
+        return []
+
+    results = [None] * len(items)
+    with ThreadPoolExecutor(max_workers=max(1, min(max_workers, len(items)))) as executor:
+        futures = [executor.submit(func, *item) for item in items]
+        for idx, future in enumerate(futures):
+            try:
+                results[idx] = future.result()
+            except Exception as e:
+                results[idx] = e
+    return results
+
+
+# 네이버 일별 시세 한 페이지에 담기는 행 수
+ROWS_PER_PAGE = 10
+
+
+def plan_pages(missing_rows, max_pages, rows_per_page=ROWS_PER_PAGE):
+    """빠진 거래일 수(missing_rows)를 채우는 데 필요한 최소 페이지 수 (최대 max_pages)"""
+    if missing_rows <= 0:
+        return 0
+    return min(max_pages, -(-missing_rows // rows_per_page))
+
+
+class PageReport:
+    """
+    종목별 페이지 요청 현황 (스레드 안전)
+
+    planned: 거래일 간격으로 계산한 페이지 수
+    fetched: 실제로 요청한 페이지 수
+    legacy: 이전 방식(업데이트 시 항상 2페이지, 최초 조회 시 전체)으로 요청했을 페이지 수
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._rows = {}
+
+    def record(self, code, planned, fetched, legacy):
+        with self._lock:
+            self._rows[code] = {'planned': planned, 'fetched': fetched, 'legacy': legacy}
+
+    def rows(self):
+        with self._lock:
+            return dict(self._rows)
+
+    def summary(self):
+        """전체 합계 (saved: 이전 방식 대비 줄어든 요청 수)"""
+        rows = self.rows().values()
+        total = {key: sum(row[key] for row in rows) for key in ('planned', 'fetched', 'legacy')}
+        total['saved'] = total['legacy'] - total['fetched']
+        return total
+
+    def print_report(self):
+        rows = self.rows()
+        if not rows:
+            return
+        print("\n종목코드    계획  요청  이전방식")
+        print("-" * 32)
+        for code, row in rows.items():
+            print(f"{code:8}  {row['planned']:5}  {row['fetched']:4}  {row['legacy']:8}")
+        total = self.summary()
+        print(f"페이지 요청 합계: {total['fetched']}개 (계획 {total['planned']}개, "
+              f"이전 방식 {total['legacy']}개 대비 {total['saved']}개 절약)")
@@ -0,0 +1,304 @@
+import hashlib
+import json
+import os
+import threading
+import time
+from datetime import datetime, timedelta, timezone
+from urllib.parse import parse_qsl, urlsplit, urlunsplit, urlencode
+
+import requests
+from requests.structures import CaseInsensitiveDict
+
+# 캐시 동작 방식
+# - cache: 유효 기간이 남은 응답은 디스크에서, 나머지는 네트워크에서 받아 저장
+# - record: 항상 네트워크에서 받아 저장 (캐시 갱신)
+# - replay: 디스크에 저장된 응답만 사용 (유효 기간 무시, 없으면 오류, 네트워크 사용 안 함)
+CACHE_MODES = ('off', 'cache', 'record', 'replay')
+
+KST = timezone(timedelta(hours=9))
+
+# 네이버 일별 시세가 새 거래일 행으로 밀리기 시작하는 시각 (장 시작)
+MARKET_OPEN_HOUR = 9
+
+# 첫 페이지(당일 시세 포함)의 유효 기간 (초)
+FIRST_PAGE_TTL = 600
+
+# 저장할 응답 헤더
+STORED_HEADERS = ('Content-Type', 'Content-Encoding', 'Last-Modified', 'ETag')
+
+
+class CacheMiss(requests.ConnectionError):
+    """재생(replay) 모드에서 저장된 응답이 없는 요청"""
+
+
+def next_kst_time(now, hour):
+    """now 이후 처음 오는 한국 시간 hour시 (epoch 초)"""
+    local = datetime.fromtimestamp(now, KST)
+    target = local.replace(hour=hour, minute=0, second=0, microsecond=0)
+    if target <= local:
+        target += timedelta(days=1)
+    return target.timestamp()
+
+
+def naver_sise_expiry(url, data, now):
+    """
+    네이버 일별 시세 페이지의 만료 시각
+    1페이지는 장중에 계속 바뀌므로 짧게, 2페이지 이후는 새 거래일 행이 들어와 한 행씩 밀리기 전
+    (다음 장 시작)까지 유효하다.
+    """
+    page = dict(parse_qsl(urlsplit(url).query)).get('page', '1')
+    if page == '1':
+        return now + FIRST_PAGE_TTL
+    return next_kst_time(now, MARKET_OPEN_HOUR)
+
+
+def krx_expiry(url, data, now):
+    """KRX 종목/ETF 목록: 한국 시간 자정까지 (기존 krx_code.csv 일 1회 갱신과 같은 주기)"""
+    return next_kst_time(now, 0)
+
+
+# 엔드포인트별 규칙: (호스트, 경로에 포함된 문자열, 만료 시각 함수, 요청 키에서 뺄 파라미터)
+# 규칙에 없는 요청(Discord 등)은 캐시하지 않는다.
+# KRX ETF 목록의 조회일(trdDd)은 매일 바뀌지만 만료 시각으로 갱신되므로 키에서 뺀다. (재생 모드에서 다른 날에도 사용)
+DEFAULT_RULES = [
+    ('finance.naver.com', '/item/sise_day', naver_sise_expiry, ()),
+    ('data.krx.co.kr', '/comm/bldAttendant/getJsonData.cmd', krx_expiry, ('trdDd',)),
+]
+
+
+def request_key(method, url, params=None, data=None, json_body=None, ignore=()):
+    """요청 키 (메서드 + 정렬한 쿼리/본문의 SHA-256, ignore의 파라미터는 제외)"""
+    parts = urlsplit(url)
+    query = parse_qsl(parts.query, keep_blank_values=True)
+    if params:
+        query += [(str(k), str(v)) for k, v in dict(params).items()]
+    query = sorted((k, v) for k, v in query if k not in ignore)
+    if isinstance(data, dict):
+        data = sorted((str(k), str(v)) for k, v in data.items() if k not in ignore)
+    canonical = {
+        'method': method.upper(),
+        'url': urlunsplit((parts.scheme, parts.netloc.lower(), parts.path, urlencode(query), '')),
+        'data': data,
+        'json': json_body,
+    }
+    text = json.dumps(canonical, sort_keys=True, ensure_ascii=False, default=str)
+    return hashlib.sha256(text.encode('utf-8')).hexdigest()
+
+
+class ResponseCache:
+    """
+    디스크 HTTP 응답 캐시 (스레드 안전)
+
+    - 요청 키(URL + 파라미터 해시)별 메타 파일이 응답 본문의 SHA-256으로 저장한 본문 파일을 가리킨다.
+      같은 내용의 응답은 본문 파일 하나를 공유한다.
+    - 요청마다 rules로 만료 시각을 정하고, 규칙에 없는 요청은 캐시하지 않는다.
+    - 본문 전체 크기가 max_bytes를 넘으면 가장 오래전에 사용한 항목부터 지운다. (LRU)
+
+    저장 위치: {cache_dir}/entries/{키 앞 2자}/{키}.json, {cache_dir}/blobs/{해시 앞 2자}/{해시}
+    """
+
+    def __init__(self, cache_dir='http_cache', mode='cache', max_bytes=200 * 2 ** 20, rules=None):
+        if mode not in CACHE_MODES:
+            raise ValueError(f"지원하지 않는 캐시 방식입니다: {mode} (가능: {', '.join(CACHE_MODES)})")
+        self.cache_dir = cache_dir
+        self.mode = mode
+        self.max_bytes = max_bytes
+        self.rules = DEFAULT_RULES if rules is None else rules
+        self._lock = threading.Lock()
+        self._entries = None   # 요청 키 → 메타
+        self._blob_refs = {}   # 본문 해시 → 참조하는 항목 수
+        self._bytes = 0
+        self._stats = {'hits': 0, 'misses': 0, 'stores': 0, 'evictions': 0}
+
+    @property
+    def replay(self):
+        return self.mode == 'replay'
+
+    def rule(self, url):
+        """url에 적용할 규칙 (캐시 대상이 아니면 None)"""
+        parts = urlsplit(url)
+        for rule in self.rules:
+            if parts.netloc == rule[0] and rule[1] in parts.path:
+                return rule
+        return None
+
+    def key(self, method, url, params=None, data=None, json_body=None):
+        rule = self.rule(url)
+        return request_key(method, url, params, data, json_body, rule[3] if rule else ())
+
+    def get(self, method, url, params=None, data=None, json_body=None):
+        """
+        저장된 응답 조회 (없거나 만료되었으면 None)
+        재생 모드에서는 만료 여부와 상관없이 반환하고, 없으면 CacheMiss를 발생시킨다.
+        """
+        if self.mode == 'record' or (not self.replay and self.rule(url) is None):
+            return None
+        key = self.key(method, url, params, data, json_body)
+        with self._lock:
+            self._load_index()
+            entry = self._entries.get(key)
+            fresh = entry is not None and (self.replay or entry['expires'] > time.time())
+            if fresh:
+                entry['accessed'] = time.time()
+                self._stats['hits'] += 1
+            else:
+                self._stats['misses'] += 1
+        if not fresh:
+            if self.replay:
+                raise CacheMiss(f"HTTP 캐시 재생 모드: 저장된 응답이 없습니다 ({method} {url})")
+            return None
+
+        try:
+            with open(self._blob_path(entry['blob']), 'rb') as f:
+                content = f.read()
+            os.utime(self._entry_path(key))  # 다음 실행에도 LRU 순서가 유지되도록 사용 시각 기록
+        except OSError:
+            with self._lock:
+                self._drop(key)
+            if self.replay:
+                raise CacheMiss(f"HTTP 캐시 재생 모드: 응답 본문이 없습니다 ({method} {url})")
+            return None
+        return self._response(entry, content)
+
+    def put(self, method, url, response, params=None, data=None, json_body=None):
+        """성공한(200) 응답을 저장 (캐시 대상이 아니면 무시)"""
+        if self.replay or response.status_code != 200:
+            return False
+        rule = self.rule(url)
+        if rule is None:
+            return False
+
+        key = self.key(method, url, params, data, json_body)
+        expires = rule[2](url, data, time.time())
+        content = response.content
+        blob = hashlib.sha256(content).hexdigest()
+        now = time.time()
+        entry = {
+            'url': url,
+            'method': method.upper(),
+            'status': response.status_code,
+            'headers': {name: response.headers[name] for name in STORED_HEADERS if name in response.headers},
+            'blob': blob,
+            'size': len(content),
+            'stored': now,
+            'expires': expires,
+            'accessed': now,
+        }
+        with self._lock:
+            self._load_index()
+            self._drop(key)
+            blob_path = self._blob_path(blob)
+            if blob not in self._blob_refs or not os.path.exists(blob_path):
+                _write_atomic(blob_path, content)
+            _write_atomic(self._entry_path(key), json.dumps(entry, ensure_ascii=False).encode('utf-8'))
+            self._add(key, entry)
+            self._stats['stores'] += 1
+            self._evict()
+        return True
+
+    def stats(self):
+        with self._lock:
+            self._load_index()
+            stats = dict(self._stats)
+            stats['entries'] = len(self._entries)
+            stats['bytes'] = self._bytes
+        return stats
+
+    def clear(self):
+        """저장된 응답 모두 삭제"""
+        with self._lock:
+            self._load_index()
+            for key in list(self._entries):
+                self._drop(key)
+
+    def _response(self, entry, content):
+        response = requests.Response()
+        response.status_code = entry['status']
+        response.url = entry['url']
+        response.headers = CaseInsensitiveDict(entry['headers'])
+        response._content = content
+        response.reason = 'OK (cache)'
+        return response
+
+    def _load_index(self):
+        """처음 사용할 때 디스크의 메타 파일을 읽어 인덱스 구성 (잠금 안에서 호출)"""
+        if self._entries is not None:
+            return
+        self._entries = {}
+        root = os.path.join(self.cache_dir, 'entries')
+        if not os.path.isdir(root):
+            return
+        for directory, _, files in os.walk(root):
+            for name in files:
+                if not name.endswith('.json'):
+                    continue
+                path = os.path.join(directory, name)
+                try:
+                    with open(path, encoding='utf-8') as f:
+                        entry = json.load(f)
+                    entry['accessed'] = os.path.getmtime(path)
+                except (OSError, ValueError):
+                    continue
+                if os.path.exists(self._blob_path(entry['blob'])):
+                    self._add(name[:-len('.json')], entry)
+
+    def _add(self, key, entry):
+        self._entries[key] = entry
+        refs = self._blob_refs.get(entry['blob'], 0)
+        if refs == 0:
+            self._bytes += entry['size']
+        self._blob_refs[entry['blob']] = refs + 1
+
+    def _drop(self, key):
+        """항목 삭제 (본문을 참조하는 항목이 더 없으면 본문 파일도 삭제)"""
+        entry = self._entries.pop(key, None)
+        if entry is None:
+            return
+        _remove(self._entry_path(key))
+        refs = self._blob_refs.get(entry['blob'], 1) - 1
+        if refs > 0:
+            self._blob_refs[entry['blob']] = refs
+            return
+        self._blob_refs.pop(entry['blob'], None)
+        self._bytes -= entry['size']
+        _remove(self._blob_path(entry['blob']))
+
+    def _evict(self):
+        if self._bytes <= self.max_bytes:
+            return
+        for key in sorted(self._entries, key=lambda k: self._entries[k]['accessed']):
+            if self._bytes <= self.max_bytes:
+                break
+            self._drop(key)
+            self._stats['evictions'] += 1
+
+    def _entry_path(self, key):
+        return os.path.join(self.cache_dir, 'entries', key[:2], f'{key}.json')
+
+    def _blob_path(self, blob):
+        return os.path.join(self.cache_dir, 'blobs', blob[:2], blob)
+
+
+def _write_atomic(path, content):
+    """임시 파일에 쓴 뒤 교체 (동시에 읽는 쪽이 쓰다 만 파일을 보지 않도록)"""
+    directory = os.path.dirname(path)
+    os.makedirs(directory, exist_ok=True)
+    temp_path = f'{path}.{os.getpid()}.{threading.get_ident()}.tmp'
+    with open(temp_path, 'wb') as f:
+        f.write(content)
+    os.replace(temp_path, path)
+
+
+def _remove(path):
+    try:
+        os.remove(path)
+    except OSError:
+        pass
+
+
+def get_cache(mode, cache_dir='http_cache', max_mb=200):
+    """설정값으로 응답 캐시 생성 (mode가 off이거나 비어 있으면 None)"""
+    mode = (mode or 'off').strip().lower()
+    if mode == 'off':
+        return None
+    return ResponseCache(cache_dir, mode, int(max_mb * 2 ** 20))
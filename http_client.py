@@ -0,0 +1,162 @@
+import threading
+import time
+from urllib.parse import urlsplit, urlunsplit
+
+import requests
+from requests.adapters import HTTPAdapter
+
+from tracing import span, count
+
+# 재시도 대상 상태 코드 (요청 과다 + 서버 오류)
+RETRY_STATUS = {429, 500, 502, 503, 504}
+
+
+def parse_host_overrides(value):
+    """
+    호스트 대체 설정 파싱
+    'finance.naver.com=http://127.0.0.1:8000,data.krx.co.kr=http://127.0.0.1:8000'
+    → {'finance.naver.com': 'http://127.0.0.1:8000', ...}
+    """
+    overrides = {}
+    for item in (value or '').split(','):
+        if '=' in item:
+            host, base_url = item.split('=', 1)
+            overrides[host.strip()] = base_url.strip().rstrip('/')
+    return overrides
+
+
+class HttpClient:
+    """
+    모든 네트워크 호출이 공유하는 HTTP 전송 계층
+
+    - 호스트별 커넥션 풀(keep-alive) 재사용
+    - 연결/읽기 타임아웃 지정
+    - 429/5xx 응답과 연결 오류에 대해 지수 백오프로 재시도 (Retry-After 헤더 우선)
+    - 요청 수, 커넥션 재사용률, 재시도 수, 수신 바이트 통계
+    - host_overrides로 특정 호스트를 로컬 스텁 서버로 대체 가능 (테스트용)
+    - cache(ResponseCache)가 주어지면 저장된 응답을 먼저 사용하고 받은 응답을 저장 (재생 모드에서는 네트워크 사용 안 함)
+    """
+
+    def __init__(self, connect_timeout=5, read_timeout=15, max_retries=3, backoff=0.5,
+                 max_backoff=30, pool_size=10, rate_limiter=None, host_overrides=None,
+                 headers=None, cache=None):
+        self.timeout = (connect_timeout, read_timeout)
+        self.max_retries = max_retries
+        self.backoff = backoff
+        self.max_backoff = max_backoff
+        self.rate_limiter = rate_limiter
+        self.host_overrides = dict(host_overrides or {})
+        self.cache = cache
+
+        self.session = requests.Session()
+        if headers:
+            self.session.headers.update(headers)
+        self._adapter = HTTPAdapter(pool_connections=pool_size, pool_maxsize=pool_size, max_retries=0)
+        self.session.mount('http://', self._adapter)
+        self.session.mount('https://', self._adapter)
+
+        self._lock = threading.Lock()
+        self._stats = {'requests': 0, 'retries': 0, 'errors': 0, 'bytes': 0, 'cache_hits': 0}
+
+    def get(self, url, **kwargs):
+        return self.request('GET', url, **kwargs)
+
+    def post(self, url, **kwargs):
+        return self.request('POST', url, **kwargs)
+
+    def request(self, method, url, max_retries=None, **kwargs):
+        """
+        재시도/백오프를 적용한 HTTP 요청
+        max_retries: 이 요청에만 적용할 최대 재시도 횟수 (0이면 재시도 없이 응답을 그대로 반환)
+        """
+        host = urlsplit(url).netloc
+        cache_key = (method, url, kwargs.get('params'), kwargs.get('data'), kwargs.get('json'))
+        if self.cache is not None:
+            cached = self.cache.get(*cache_key)
+            if cached is not None:
+                self._count('cache_hits')
+                count(f'http.cache_hits.{host}')
+                return cached
+
+        url = self._rewrite_url(url)
+        kwargs.setdefault('timeout', self.timeout)
+        max_retries = self.max_retries if max_retries is None else max_retries
+
+        attempt = 0
+        while True:
+            if self.rate_limiter is not None:
+                self.rate_limiter.wait(url)
+            self._count('requests')
+            count(f'http.requests.{host}')
+
+            try:
+                with span(f'http.{host}', method=method, attempt=attempt):
+                    response = self.session.request(method, url, **kwargs)
+            except (requests.ConnectionError, requests.Timeout):
+                if attempt >= max_retries:
+                    self._count('errors')
+                    raise
+                delay = self._backoff_delay(attempt)
+            else:
+                if response.status_code not in RETRY_STATUS or attempt >= max_retries:
+                    self._count('bytes', len(response.content))
+                    if self.cache is not None:
+                        self.cache.put(cache_key[0], cache_key[1], response, *cache_key[2:])
+                    return response
+                delay = self._retry_after(response, attempt)
+                response.close()
+                count(f'http.retries.{host}')
+
+            self._count('retries')
+            attempt += 1
+            time.sleep(delay)
+
+    def stats(self):
+        """전송 통계 (재사용률 = 1 - 새 커넥션 수 / 요청 수)"""
+        with self._lock:
+            stats = dict(self._stats)
+        stats['connections'] = self._new_connections()
+        if stats['requests']:
+            stats['reuse_ratio'] = round(max(0.0, 1 - stats['connections'] / stats['requests']), 4)
+        else:
+            stats['reuse_ratio'] = 0.0
+        return stats
+
+    def close(self):
+        self.session.close()
+
+    def _count(self, key, value=1):
+        with self._lock:
+            self._stats[key] += value
+
+    def _rewrite_url(self, url):
+        """대체 호스트가 지정된 경우 URL의 scheme/host 부분을 교체"""
+        if not self.host_overrides:
+            return url
+        parts = urlsplit(url)
+        base_url = self.host_overrides.get(parts.netloc)
+        if base_url is None:
+            return url
+        base = urlsplit(base_url)
+        return urlunsplit((base.scheme, base.netloc, base.path + parts.path, parts.query, parts.fragment))
+
+    def _backoff_delay(self, attempt):
+        return min(self.max_backoff, self.backoff * (2 ** attempt))
+
+    def _retry_after(self, response, attempt):
+        """Retry-After 헤더(초)가 있으면 우선 사용하고 없으면 지수 백오프"""
+        retry_after = response.headers.get('Retry-After')
+        try:
+            return min(self.max_backoff, max(0.0, float(retry_after)))
+        except (TypeError, ValueError):
+            return self._backoff_delay(attempt)
+
+    def _new_connections(self):
+        """커넥션 풀에서 새로 연 커넥션 수 합계"""
+        pools = self._adapter.poolmanager.pools
+        total = 0
+        for key in list(pools.keys()):
+            pool = pools.get(key)
+            if pool is not None:
+                total += pool.num_connections
+        return total
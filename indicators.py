@@ -0,0 +1,235 @@
+import numpy as np
+import pandas as pd
+
+from macd import ema, ema_alpha
+
+# 등록된 지표: 이름 → {'func', 'inputs', 'defaults'}
+INDICATORS = {}
+
+
+def register(name, inputs, defaults=()):
+    """
+    지표 등록 데코레이터
+
+    inputs: 지표 계산에 필요한 시세 컬럼
+    defaults: 파라미터 기본값 (지표 문자열에서 생략된 값에 사용)
+    등록하는 함수는 (graph, *params)를 받아 {컬럼명: 배열}을 반환한다.
+    """
+    def decorator(func):
+        INDICATORS[name] = {'func': func, 'inputs': tuple(inputs), 'defaults': tuple(defaults)}
+        return func
+    return decorator
+
+
+class IndicatorGraph:
+    """
+    종목 하나의 지표 계산 그래프
+
+    EMA, 이동평균, 이동표준편차 같은 중간 결과를 (종류, 입력, 파라미터) 키로 메모이제이션하여
+    여러 지표가 같은 중간 결과를 쓰면 한 번만 계산한다.
+    키의 입력 자리에는 컬럼 키 ('column', 이름)나 다른 중간 결과 키가 올 수 있다.
+    """
+
+    def __init__(self, df):
+        self.df = df
+        self._cache = {}
+        self.hits = 0
+
+    def get(self, key):
+        """중간 결과 조회 (없으면 계산 후 저장)"""
+        if key in self._cache:
+            self.hits += 1
+            return self._cache[key]
+        kind, *args = key
+        value = _NODES[kind](self, *args)
+        self._cache[key] = value
+        return value
+
+    def column(self, name):
+        return self.get(('column', name))
+
+    def ema(self, source, alpha):
+        return self.get(('ema', source, alpha))
+
+    def sma(self, source, window):
+        return self.get(('sma', source, window))
+
+    def stats(self):
+        """계산된 중간 결과 수와 재사용 횟수"""
+        return {'nodes': len(self._cache), 'hits': self.hits}
+
+
+def _node_column(graph, name):
+    return graph.df[name].to_numpy(dtype='float64')
+
+
+def _node_ema(graph, source, alpha):
+    return ema(graph.get(source), alpha)
+
+
+def _node_sma(graph, source, window):
+    return pd.Series(graph.get(source)).rolling(window, min_periods=window).mean().to_numpy()
+
+
+def _node_std(graph, source, window):
+    return pd.Series(graph.get(source)).rolling(window, min_periods=window).std(ddof=0).to_numpy()
+
+
+def _node_change(graph, source):
+    values = graph.get(source)
+    change = np.full(len(values), np.nan)
+    change[1:] = values[1:] - values[:-1]
+    return change
+
+
+def _node_gain(graph, source):
+    return np.clip(graph.get(('change', source)), 0, None)
+
+
+def _node_loss(graph, source):
+    return np.clip(-graph.get(('change', source)), 0, None)
+
+
+def _node_true_range(graph):
+    high = graph.column('high')
+    low = graph.column('low')
+    prev_close = np.full(len(high), np.nan)
+    prev_close[1:] = graph.column('close')[:-1]
+    ranges = np.vstack([high - low, np.abs(high - prev_close), np.abs(low - prev_close)])
+    return np.nanmax(ranges, axis=0) if len(high) else high
+
+
+def _node_macd_line(graph, fast, slow, alpha_offset):
+    close = ('column', 'close')
+    return (graph.ema(close, ema_alpha(fast, alpha_offset))
+            - graph.ema(close, ema_alpha(slow, alpha_offset)))
+
+
+_NODES = {
+    'column': _node_column,
+    'ema': _node_ema,
+    'sma': _node_sma,
+    'std': _node_std,
+    'change': _node_change,
+    'gain': _node_gain,
+    'loss': _node_loss,
+    'true_range': _node_true_range,
+    'macd_line': _node_macd_line,
+}
+
+CLOSE = ('column', 'close')
+
+
+@register('sma', inputs=['close'], defaults=[20])
+def sma_indicator(graph, window):
+    """단순 이동평균"""
+    return {f'sma_{window}': np.round(graph.sma(CLOSE, window), 4)}
+
+
+@register('ema', inputs=['close'], defaults=[20])
+def ema_indicator(graph, span):
+    """지수 이동평균 (알파값: 2 / (기간 + 1))"""
+    return {f'ema_{span}': np.round(graph.ema(CLOSE, ema_alpha(span)), 4)}
+
+
+@register('macd', inputs=['close'], defaults=[12, 26, 9])
+def macd_indicator(graph, fast, slow, signal):
+    """
+    MACD (기본 컬럼 ema12/ema26/macd_line/signal_line/macd_hist와 별도의 변형용)
+    반올림 규칙은 compute_macd()와 같다.
+    """
+    macd_line = graph.get(('macd_line', fast, slow, 1.0))
+    signal_line = graph.ema(('macd_line', fast, slow, 1.0), ema_alpha(signal))
+    line = np.round(macd_line, 4)
+    sig = np.round(signal_line, 4)
+    prefix = f'macd_{fast}_{slow}_{signal}'
+    return {
+        f'{prefix}_line': line,
+        f'{prefix}_signal': sig,
+        f'{prefix}_hist': np.round(line - sig, 2),
+    }
+
+
+@register('rsi', inputs=['close'], defaults=[14])
+def rsi_indicator(graph, period):
+    """RSI (Wilder 평활: 알파값 1 / 기간)"""
+    alpha = 1 / period
+    avg_gain = graph.ema(('gain', CLOSE), alpha)
+    avg_loss = graph.ema(('loss', CLOSE), alpha)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        rsi = 100 - 100 / (1 + avg_gain / avg_loss)
+    rsi = np.where((avg_loss == 0) & (avg_gain > 0), 100.0, rsi)
+    return {f'rsi_{period}': np.round(rsi, 2)}
+
+
+@register('bb', inputs=['close'], defaults=[20, 2.0])
+def bollinger_indicator(graph, window, width):
+    """볼린저 밴드 (중심선: 단순 이동평균, 폭: 모표준편차 × width)"""
+    middle = graph.sma(CLOSE, window)
+    deviation = graph.get(('std', CLOSE, window))
+    suffix = f'{window}_{width:g}'
+    return {
+        f'bb_middle_{suffix}': np.round(middle, 4),
+        f'bb_upper_{suffix}': np.round(middle + width * deviation, 4),
+        f'bb_lower_{suffix}': np.round(middle - width * deviation, 4),
+    }
+
+
+@register('atr', inputs=['high', 'low', 'close'], defaults=[14])
+def atr_indicator(graph, period):
+    """ATR (True Range의 Wilder 평활)"""
+    return {f'atr_{period}': np.round(graph.ema(('true_range',), 1 / period), 4)}
+
+
+@register('obv', inputs=['close', 'volume'])
+def obv_indicator(graph):
+    """OBV (종가 상승일 거래량 +, 하락일 거래량 -의 누적)"""
+    direction = np.sign(np.nan_to_num(graph.get(('change', CLOSE))))
+    return {'obv': np.cumsum(direction * graph.column('volume')).astype('int64')}
+
+
+def parse_indicators(text):
+    """
+    지표 목록 문자열 파싱
+    예: "rsi,bb:20:2,macd:5:35:5,ema:50,obv" → [('rsi', (14,)), ('bb', (20, 2)), ...]
+    """
+    specs = []
+    for item in (text or '').split(','):
+        item = item.strip().lower()
+        if not item:
+            continue
+        name, *values = item.split(':')
+        if name not in INDICATORS:
+            raise ValueError(f"지원하지 않는 지표입니다: {name} (가능: {', '.join(INDICATORS)})")
+        defaults = INDICATORS[name]['defaults']
+        if len(values) > len(defaults):
+            raise ValueError(f"{name} 지표의 파라미터가 너무 많습니다: {item}")
+        params = tuple(type(default)(float(value)) for value, default in zip(values, defaults))
+        specs.append((name, params + defaults[len(params):]))
+    return specs
+
+
+def compute_indicators(df, specs, graph=None):
+    """
+    요청한 지표만 계산하여 {컬럼명: 배열} 반환
+    graph를 넘기면 이전 계산의 중간 결과를 이어서 재사용한다.
+    """
+    graph = graph or IndicatorGraph(df)
+    result = {}
+    for name, params in specs:
+        indicator = INDICATORS[name]
+        missing = [column for column in indicator['inputs'] if column not in df.columns]
+        if missing:
+            raise ValueError(f"{name} 지표 계산에 필요한 컬럼이 없습니다: {', '.join(missing)}")
+        result.update(indicator['func'](graph, *params))
+    return result
+
+
+def apply_indicators(df, specs):
+    """지표 컬럼을 데이터프레임에 추가하고 추가한 컬럼명 목록 반환"""
+    if not specs or df.empty:
+        return []
+    values = compute_indicators(df, specs)
+    for column, array in values.items():
+        df[column] = array
+    return list(values)
@@ -0,0 +1,250 @@
+import csv
+import os
+from bisect import bisect_left
+from collections import Counter
+from difflib import SequenceMatcher
+
+# 종목 코드 변경 내역 파일 컬럼
+# version: 갱신 번호 (한 번의 갱신에서 발견한 변경은 같은 번호), change: listed/delisted/renamed
+CHANGE_COLUMNS = ['version', 'date', 'change', 'code', 'name', 'old_name']
+
+
+def normalize_name(name):
+    """비교용 종목명 정규화 (공백 제거, 대문자 변환)"""
+    return ''.join(str(name).split()).upper()
+
+
+def _bigrams(text):
+    """문자 2-gram 집합 (한 글자 이름은 그 글자 자체)"""
+    if len(text) < 2:
+        return {text}
+    return {text[i:i + 2] for i in range(len(text) - 1)}
+
+
+class CodeResolver:
+    """
+    종목명 ↔ 종목코드 변환기
+
+    get_krx_code()의 결과로 한 번만 만들어 두고 재사용한다.
+    - 정확한 이름/코드 조회는 딕셔너리로 O(1)
+    - 접두어 검색은 정렬된 정규화 이름 목록에서 이진 탐색
+    - 유사 이름 추천은 2-gram 역색인으로 후보를 좁힌 뒤 유사도로 정렬
+    - changes(종목 코드 변경 내역)를 주면 이름이 바뀌었거나 상장폐지된 종목의 예전 이름도 찾는다.
+      (현재 종목명에 없을 때만 사용하므로 저장된 과거 시세의 종목명을 계속 쓸 수 있음)
+    """
+
+    def __init__(self, code_df, changes=()):
+        self._build(code_df['name'].astype(str).tolist(), code_df['code'].astype(str).str.zfill(6).tolist(), changes)
+
+    @classmethod
+    def from_csv(cls, path, changes_path=None):
+        """종목 코드 캐시 파일(krx_code.csv)에서 바로 생성 (pandas 없이 읽음)"""
+        rows = load_code_table(path)
+        resolver = cls.__new__(cls)
+        changes = load_code_changes(changes_path) if changes_path else ()
+        resolver._build([row['name'] for row in rows], [row['code'] for row in rows], changes)
+        return resolver
+
+    def _build(self, names, codes, changes=()):
+        # 같은 이름이 여러 번 나오면 첫 번째 항목 사용 (기존 query(...).iloc[0]과 동일)
+        self._name_to_code = {}
+        self._code_to_name = {}
+        for name, code in zip(names, codes):
+            self._name_to_code.setdefault(name, code)
+            self._code_to_name.setdefault(code, name)
+
+        # 예전 이름(이름 변경 전, 상장폐지) → 종목코드 (나중 기록 우선)
+        self._former_codes = {}
+        self._former_names = {}
+        for change in changes:
+            code = change['code'].zfill(6)
+            if change['change'] == 'renamed':
+                self._former_codes[normalize_name(change['old_name'])] = code
+            elif change['change'] == 'delisted':
+                self._former_codes[normalize_name(change['name'])] = code
+                self._former_names[code] = change['name']
+
+        # 정규화 이름 인덱스
+        self._normalized = {}
+        for name in self._name_to_code:
+            self._normalized.setdefault(normalize_name(name), name)
+        self._sorted_keys = sorted(self._normalized)
+
+        # 2-gram 역색인
+        self._bigram_index = {}
+        for key in self._sorted_keys:
+            for gram in _bigrams(key):
+                self._bigram_index.setdefault(gram, []).append(key)
+
+    def __len__(self):
+        return len(self._name_to_code)
+
+    def __contains__(self, name):
+        return name in self._name_to_code
+
+    def code(self, name):
+        """종목명 → 종목코드 (없으면 None)"""
+        code = self._name_to_code.get(name)
+        if code is None:
+            # 공백/대소문자만 다른 경우
+            matched = self._normalized.get(normalize_name(name))
+            if matched is not None:
+                code = self._name_to_code[matched]
+            else:
+                # 이름이 바뀌었거나 상장폐지된 종목의 예전 이름
+                code = self._former_codes.get(normalize_name(name))
+        return code
+
+    def name(self, code):
+        """종목코드 → 종목명 (없으면 None, 상장폐지 종목은 마지막 이름)"""
+        code = str(code).zfill(6)
+        return self._code_to_name.get(code, self._former_names.get(code))
+
+    def resolve_many(self, names):
+        """
+        여러 종목명을 한 번에 변환
+        반환값: ({종목명: 종목코드}, [찾지 못한 종목명])
+        """
+        resolved = {}
+        missing = []
+        for name in names:
+            code = self.code(name)
+            if code is None:
+                missing.append(name)
+            else:
+                resolved[name] = code
+        return resolved, missing
+
+    def prefix(self, prefix, limit=10):
+        """접두어로 시작하는 종목명 목록"""
+        key = normalize_name(prefix)
+        start = bisect_left(self._sorted_keys, key)
+        matches = []
+        for candidate in self._sorted_keys[start:]:
+            if not candidate.startswith(key) or len(matches) >= limit:
+                break
+            matches.append(self._normalized[candidate])
+        return matches
+
+    def suggest(self, name, limit=5, cutoff=0.5):
+        """오타 등으로 찾지 못한 종목명에 대해 유사한 종목명 추천"""
+        key = normalize_name(name)
+        if not key:
+            return []
+
+        # 접두어가 일치하는 종목 우선
+        suggestions = self.prefix(key, limit)
+        if len(suggestions) >= limit:
+            return suggestions
+
+        # 2-gram을 많이 공유하는 후보만 유사도 계산
+        counts = Counter()
+        for gram in _bigrams(key):
+            counts.update(self._bigram_index.get(gram, ()))
+        scored = []
+        for candidate, _ in counts.most_common(50):
+            ratio = SequenceMatcher(None, key, candidate).ratio()
+            if ratio >= cutoff:
+                scored.append((ratio, candidate))
+        scored.sort(key=lambda item: (-item[0], item[1]))
+
+        for _, candidate in scored:
+            matched = self._normalized[candidate]
+            if matched not in suggestions:
+                suggestions.append(matched)
+            if len(suggestions) >= limit:
+                break
+        return suggestions
+
+
+def load_code_table(path):
+    """종목 코드 캐시 파일(krx_code.csv) 읽기 [{'name', 'code', 'kind'}] (pandas 없이 읽음)"""
+    with open(path, encoding='utf-8-sig', newline='') as f:
+        rows = list(csv.DictReader(f))
+    for row in rows:
+        row['code'] = row['code'].zfill(6)
+    return rows
+
+
+def diff_codes(old, new, removable=None):
+    """
+    두 종목 코드표 비교 ({종목코드: 종목명})
+    removable: 상장폐지로 볼 수 있는 기존 종목코드 (기본: 전체, 조회에 실패한 구분의 종목은 빼고 넘김)
+    반환값: [{'change': 'listed'/'delisted'/'renamed', 'code', 'name', 'old_name'}] (종목코드순)
+    """
+    changes = []
+    for code in sorted(set(old) | set(new)):
+        if code not in old:
+            changes.append({'change': 'listed', 'code': code, 'name': new[code], 'old_name': ''})
+        elif code not in new:
+            if removable is None or code in removable:
+                changes.append({'change': 'delisted', 'code': code, 'name': old[code], 'old_name': ''})
+        elif old[code] != new[code]:
+            changes.append({'change': 'renamed', 'code': code, 'name': new[code], 'old_name': old[code]})
+    return changes
+
+
+def merge_code_tables(old_rows, fetched):
+    """
+    새로 조회한 종목 목록과 기존 코드표를 합침
+
+    old_rows: 기존 코드표 [{'name', 'code', 'kind'}] (kind가 없는 이전 형식 포함)
+    fetched: {구분(stock/etf): [(종목코드, 종목명), ...] 또는 None(조회 실패)} (이 순서대로 합침)
+    조회에 실패한 구분은 기존 행을 그대로 두고, 그 구분의 종목은 상장폐지로 보지 않는다.
+    같은 종목코드가 여러 번 나오면 첫 번째 항목을 사용한다.
+    반환값: (합친 코드표, 변경 내역)
+    """
+    failed = [kind for kind, items in fetched.items() if items is None]
+    if len(failed) == len(fetched):
+        raise ValueError("조회에 성공한 종목 목록이 없습니다.")
+
+    rows, seen = [], set()
+    for kind, items in fetched.items():
+        if items is None:
+            candidates = [row for row in old_rows if row.get('kind') == kind]
+        else:
+            candidates = [{'name': name, 'code': code, 'kind': kind} for code, name in items]
+        for row in candidates:
+            if row['code'] not in seen:
+                seen.add(row['code'])
+                rows.append(row)
+    if failed:
+        # 구분을 알 수 없는 이전 형식의 행은 실패한 구분의 종목일 수 있으므로 유지
+        for row in old_rows:
+            if not row.get('kind') and row['code'] not in seen:
+                seen.add(row['code'])
+                rows.append(dict(row, kind=''))
+
+    old = {row['code']: row['name'] for row in old_rows}
+    new = {row['code']: row['name'] for row in rows}
+    removable = None
+    if failed:
+        removable = {row['code'] for row in old_rows if row.get('kind') and row['kind'] not in failed}
+    return rows, diff_codes(old, new, removable)
+
+
+def load_code_changes(path):
+    """종목 코드 변경 내역 읽기 (파일이 없으면 빈 목록)"""
+    if not path or not os.path.exists(path):
+        return []
+    with open(path, encoding='utf-8-sig', newline='') as f:
+        return list(csv.DictReader(f))
+
+
+def append_code_changes(path, changes, date):
+    """
+    종목 코드 변경 내역을 새 갱신 번호로 파일 끝에 추가
+    반환값: 갱신 번호 (변경이 없으면 None)
+    """
+    if not changes:
+        return None
+    previous = load_code_changes(path)
+    version = max((int(row['version']) for row in previous), default=0) + 1
+    write_header = not os.path.exists(path)
+    with open(path, 'a', encoding='utf-8', newline='') as f:
+        writer = csv.DictWriter(f, fieldnames=CHANGE_COLUMNS)
+        if write_header:
+            writer.writeheader()
+        for change in changes:
+            writer.writerow(dict(change, version=version, date=date))
+    return version
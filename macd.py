@@ -0,0 +1,282 @@
+import json
+import os
+
+import numpy as np
+import pandas as pd
+
+# MACD 결과 컬럼 (CSV 저장 순서와 동일)
+MACD_COLUMNS = ['ema12', 'ema26', 'macd_line', 'signal_line', 'macd_hist']
+
+# 일간 MACD 파라미터 (12, 26, 9) - 편향 보정 없음
+DAILY_PARAMS = {
+    'fast': 12,
+    'slow': 26,
+    'signal': 9,
+    'alpha_offset': 1.0,
+    'bias': 0.0,
+}
+
+# 주간 MACD 파라미터 - 알파값 조정(+1.15) 및 히스토그램 편향 보정(-1.0) 적용
+WEEKLY_PARAMS = {
+    'fast': 12,
+    'slow': 26,
+    'signal': 9,
+    'alpha_offset': 1.15,
+    'bias': -1.0,
+}
+
+
+def ema_alpha(span, alpha_offset=1.0):
+    """EMA 알파값 계산: 2 / (span + alpha_offset)"""
+    return 2 / (span + alpha_offset)
+
+
+def ema(values, alpha, seed=None):
+    """
+    지수이동평균(EMA) 계산 (벡터화)
+
+    ema[0] = values[0]
+    ema[i] = values[i] * alpha + ema[i-1] * (1 - alpha)
+
+    values가 2차원 배열(행: 날짜, 열: 종목)이면 열 단위로 한 번에 계산한다.
+    열마다 앞쪽의 NaN은 건너뛰고 첫 유효값부터 재귀가 시작되므로
+    상장일이 다른 종목을 하나의 행렬로 묶어도 된다.
+    seed: 직전 행의 EMA 값. 주어지면 ema[-1] = seed로 보고 이어서 계산한다.
+    """
+    values = np.asarray(values, dtype='float64')
+    if seed is not None:
+        seed_row = np.broadcast_to(np.asarray(seed, dtype='float64'), values.shape[1:])
+        values = np.concatenate([seed_row[None], values])
+    frame = pd.DataFrame(values[:, None] if values.ndim == 1 else values)
+    result = frame.ewm(alpha=alpha, adjust=False).mean().to_numpy()
+    result = result.reshape(values.shape)
+    return result if seed is None else result[1:]
+
+
+def ema_many(values, alphas):
+    """
+    여러 알파값의 EMA를 한 번에 계산 (파라미터 탐색용)
+
+    values: (행, 열) 배열, alphas: 알파값 목록
+    반환값: (알파 수, 행, 열) 배열 - 알파마다 ema(values, alpha)를 계산한 것과 비트 단위로 같다.
+    행 방향 재귀는 한 번만 돌고, 각 행에서 모든 알파/열을 한 번에 계산한다.
+    열마다 앞쪽의 NaN은 ema()와 같이 건너뛴다.
+    """
+    values = np.asarray(values, dtype='float64')
+    squeeze = values.ndim == 1
+    if squeeze:
+        values = values[:, None]
+
+    # pandas ewm과 같은 연산 순서를 따라야 결과가 같다 (alpha → com → alpha 변환 포함)
+    alphas = np.asarray(alphas, dtype='float64').reshape(-1, 1)
+    alphas = 1.0 / (1.0 + (1.0 - alphas) / alphas)
+    keep = 1.0 - alphas
+    norm = keep + alphas
+
+    result = np.empty((len(alphas),) + values.shape)
+    prev = np.full((len(alphas), values.shape[1]), np.nan)
+    for idx, row in enumerate(values):
+        updated = (keep * prev + alphas * row) / norm
+        prev = np.where(np.isnan(prev) | (prev == row), row, updated)
+        result[:, idx] = prev
+    return result[:, :, 0] if squeeze else result
+
+
+def compute_macd(close,fast=12, slow=26, signal=9, alpha_offset=1.0, bias=0.0):
+    """
+    종가 배열로 MACD 지표 계산
+
+    1. MACD Line = fast EMA - slow EMA
+    2. Signal Line = MACD Line의 signal EMA
+    3. MACD Histogram = MACD Line - Signal Line (+ bias)
+
+    반올림 규칙은 기존 계산과 동일하다.
+    (EMA/MACD/Signal: 소수점 4자리, Histogram: 반올림된 값끼리 빼서 소수점 2자리)
+    close가 2차원 배열이면 종목(열)별로 동시에 계산한다.
+    """
+    raw = _macd_raw(close, fast, slow, signal, alpha_offset)
+    return _round_macd(*raw, bias)
+
+
+def _macd_raw(close, fast, slow, signal, alpha_offset, state=None):
+    """반올림 전 EMA/MACD/Signal 계산 (state가 있으면 그 다음 행부터 이어서 계산)"""
+    close = np.asarray(close, dtype='float64')
+    state = state or {}
+
+    ema_fast = ema(close, ema_alpha(fast, alpha_offset), state.get('ema_fast'))
+    ema_slow = ema(close, ema_alpha(slow, alpha_offset), state.get('ema_slow'))
+    macd_line = ema_fast - ema_slow
+    signal_line = ema(macd_line, ema_alpha(signal, alpha_offset), state.get('signal'))
+
+    return ema_fast, ema_slow, macd_line, signal_line
+
+
+def _round_macd(ema_fast, ema_slow, macd_line, signal_line, bias):
+    """MACD 결과를 저장 정밀도로 반올림하여 컬럼별 딕셔너리로 반환"""
+    macd_rounded = np.round(macd_line, 4)
+    signal_rounded = np.round(signal_line, 4)
+    hist = macd_rounded - signal_rounded
+    if bias:
+        hist = hist + bias
+
+    return {
+        'ema12': np.round(ema_fast, 4),
+        'ema26': np.round(ema_slow, 4),
+        'macd_line': macd_rounded,
+        'signal_line': signal_rounded,
+        'macd_hist': np.round(hist, 2),
+    }
+
+
+def apply_macd(df, params=DAILY_PARAMS):
+    """데이터프레임의 close 컬럼으로 MACD를 계산하여 결과 컬럼을 추가"""
+    result = compute_macd(df['close'].to_numpy(), **params)
+    for column in MACD_COLUMNS:
+        df[column] = result[column]
+    return df
+
+
+def first_changed_row(existing_df, df, columns=('date', 'close')):
+    """
+    기존 데이터와 비교하여 처음으로 달라진(또는 새로 추가된) 행 번호 반환
+    두 데이터프레임 모두 날짜순으로 정렬되어 있어야 한다.
+    """
+    if existing_df.empty:
+        return 0
+
+    count = min(len(existing_df), len(df))
+    for column in columns:
+        if column not in existing_df.columns:
+            return 0
+        old = existing_df[column].to_numpy()[:count]
+        new = df[column].to_numpy()[:count]
+        changed = np.flatnonzero(old != new)
+        if len(changed):
+            count = changed[0]
+    return int(count)
+
+
+def update_macd(df, start, state, params=DAILY_PARAMS, existing_df=None, offset=0):
+    """
+    증분 MACD 계산
+
+    start 이전 행은 기존 데이터(existing_df)의 MACD 값을 그대로 쓰고 start 행부터만 계산한다.
+    state는 마지막으로 계산한 행(과 그 직전 행, 'previous')의 (반올림 전) EMA/Signal 값으로,
+    둘 중 start - 1 행과 날짜/종가/파라미터가 일치하는 것이 있을 때만 이어서 계산하므로
+    결과는 전체 재계산과 비트 단위로 동일하다.
+    조건이 맞지 않으면(과거 행 변경, 상태 없음) 전체를 다시 계산한다.
+    offset: df가 저장된 시세의 offset번째 행부터의 구간일 때 (앞쪽 행을 읽지 않은 경우)
+            이때는 전체를 다시 계산할 수 없으므로 이어서 계산할 수 없으면 ValueError
+
+    반환값: (MACD가 계산된 데이터프레임, 마지막 행 기준의 새 상태)
+    """
+    if existing_df is not None and 0 < start <= len(existing_df):
+        if all(column in existing_df.columns for column in MACD_COLUMNS):
+            for column in MACD_COLUMNS:
+                values = np.full(len(df), np.nan)
+                values[:start] = existing_df[column].to_numpy(dtype='float64')[:start]
+                df[column] = values
+
+    state = resume_state(df, start, state, params, offset)
+    if state is None:
+        if offset:
+            raise ValueError("앞쪽 행을 읽지 않은 구간은 저장된 MACD 상태에서 이어서 계산해야 합니다.")
+        start = 0
+
+    close = df['close'].to_numpy()[start:]
+    raw = _macd_raw(close, params['fast'], params['slow'], params['signal'],
+                    params['alpha_offset'], state)
+    result = _round_macd(*raw, params['bias'])
+
+    if start == 0:
+        for column in MACD_COLUMNS:
+            df[column] = result[column]
+    else:
+        for column in MACD_COLUMNS:
+            if column in df.columns:
+                values = df[column].to_numpy(dtype='float64', copy=True)
+            else:
+                values = np.full(len(df), np.nan)
+            values[start:] = result[column]
+            df[column] = values
+
+    if len(df) == 0:
+        return df, None
+
+    # 마지막 행과 그 직전 행의 상태 (다음 실행에서 마지막 행만 바뀌어도 이어서 계산할 수 있도록)
+    if len(close):
+        ema_fast, ema_slow, _, signal_line = raw
+        new_state = _state_values(ema_fast, ema_slow, signal_line, -1)
+        if len(close) >= 2:
+            previous = _state_values(ema_fast, ema_slow, signal_line, -2)
+        else:
+            previous = None if state is None else _state_values_of(state)
+    else:
+        new_state = _state_values_of(state)
+        previous = state.get('previous')
+
+    new_state.update(_state_row(df, len(df) - 1, offset, params))
+    if previous is not None and len(df) >= 2:
+        previous.update(_state_row(df, len(df) - 2, offset, params))
+        new_state['previous'] = previous
+    return df, new_state
+
+
+def _state_values(ema_fast, ema_slow, signal_line, idx):
+    return {'ema_fast': float(ema_fast[idx]), 'ema_slow': float(ema_slow[idx]), 'signal': float(signal_line[idx])}
+
+
+def _state_values_of(state):
+    return {key: state[key] for key in ('ema_fast', 'ema_slow', 'signal')}
+
+
+def _state_row(df, idx, offset, params):
+    """상태가 가리키는 행 정보 (rows: 그 행까지의 전체 행 수)"""
+    row = df.iloc[idx]
+    return {
+        'date': pd.Timestamp(row['date']).strftime('%Y-%m-%d'),
+        'close': float(row['close']),
+        'rows': offset + idx + 1,
+        'params': dict(params),
+    }
+
+
+def resume_state(df, start, state, params, offset=0):
+    """
+    저장된 상태(마지막 행 또는 직전 행) 중 start - 1 행과 일치하는 것 (없으면 None)
+    offset이 있으면(구간만 읽은 경우) start 이전 행은 저장하지 않으므로 MACD 값이 있는지 확인하지 않는다.
+    """
+    if not state or start <= 0 or start > len(df):
+        return None
+    if not offset:
+        if any(column not in df.columns for column in MACD_COLUMNS):
+            return None
+        if df[MACD_COLUMNS].iloc[:start].isna().any().any():
+            return None
+
+    seed_row = df.iloc[start - 1]
+    seed_date = pd.Timestamp(seed_row['date']).strftime('%Y-%m-%d')
+    for candidate in (state, state.get('previous')):
+        if (candidate and candidate.get('params') == dict(params) and candidate.get('rows') == offset + start
+                and candidate.get('date') == seed_date and candidate.get('close') == float(seed_row['close'])):
+            return candidate
+    return None
+
+
+def load_macd_state(file_path):
+    """저장된 MACD 상태 로드 (없거나 읽을 수 없으면 None)"""
+    if not os.path.exists(file_path):
+        return None
+    try:
+        with open(file_path, encoding='utf-8') as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return None
+
+
+def save_macd_state(file_path, state):
+    """MACD 상태 저장"""
+    if state is None:
+        return
+    with open(file_path, 'w', encoding='utf-8') as f:
+        json.dump(state, f, ensure_ascii=False, indent=2)
@@ -0,0 +1,130 @@
+import hashlib
+import json
+import os
+
+import numpy as np
+import pandas as pd
+
+from storage import COLUMN_DTYPES
+
+# 매니페스트 파일 형식 번호 (저장 형식이 바뀌면 올림)
+MANIFEST_FORMAT = 1
+
+
+def source_version(paths):
+    """결과에 영향을 주는 소스 파일 내용의 해시 (코드가 바뀌면 저장된 결과를 쓰지 않도록)"""
+    digest = hashlib.sha1()
+    for path in paths:
+        with open(path, 'rb') as f:
+            digest.update(f.read())
+    return digest.hexdigest()
+
+
+def file_size(path):
+    """
+    파일 크기 (없으면 None)
+    수정 시각은 git checkout(GitHub Actions)마다 바뀌므로 지문에 넣지 않는다.
+    """
+    try:
+        return os.path.getsize(path)
+    except FileNotFoundError:
+        return None
+
+
+def frame_to_json(df):
+    """데이터프레임 → JSON으로 저장할 컬럼별 값 목록 (날짜는 ISO 문자열, 실수는 그대로)"""
+    data = {}
+    for column in df.columns:
+        if pd.api.types.is_datetime64_any_dtype(df[column]):
+            data[column] = [value.isoformat() for value in df[column]]
+        else:
+            data[column] = df[column].tolist()
+    return data
+
+
+def frame_from_json(data):
+    """
+    frame_to_json()으로 저장한 값 → 데이터프레임 (컬럼 타입은 저장한 시세와 같게)
+    종목마다 호출되므로 pandas 타입 추론 없이 numpy 배열로 바로 만든다.
+    """
+    arrays = {}
+    for column, values in data.items():
+        if column == 'date':
+            arrays[column] = np.array(values, dtype='datetime64[ns]')
+        else:
+            arrays[column] = np.array(values, dtype=COLUMN_DTYPES.get(column, 'float64'))
+    return pd.DataFrame(arrays, copy=False)
+
+
+def signals_to_json(signals):
+    return [dict(signal, date=pd.Timestamp(signal['date']).isoformat(), price=int(signal['price']))
+            for signal in signals]
+
+
+def signals_from_json(signals):
+    return [dict(signal, date=pd.Timestamp(signal['date'])) for signal in signals]
+
+
+class RunManifest:
+    """
+    종목별 실행 매니페스트 (stock_data/run_manifest.json)
+
+    종목마다 마지막으로 계산했을 때의 입력 지문(시세 파일 크기와 마지막 행의 MACD 상태, 설정)과
+    마지막 거래일, 결과(최근 4주 주간 시세, 시그널)를 저장한다.
+    다음 실행에서 입력 지문이 같으면 파일을 읽거나 다시 계산하지 않고 저장된 결과를 쓸 수 있다.
+    version(계산 코드의 해시)이 바뀌면 저장된 결과를 모두 버린다.
+    """
+
+    def __init__(self, path, version):
+        self.path = path
+        self.version = version
+        self.entries = {}
+        self.dirty = False
+        if os.path.exists(path):
+            try:
+                with open(path, encoding='utf-8') as f:
+                    data = json.load(f)
+            except (OSError, ValueError):
+                data = {}
+            if data.get('format') == MANIFEST_FORMAT and data.get('version') == version:
+                self.entries = data.get('entries', {})
+            else:
+                self.dirty = True
+
+    def lookup(self, code, inputs):
+        """
+        입력 지문이 같을 때의 저장된 결과 (없으면 None)
+        반환값: (마지막 거래일, 최근 4주 주간 시세, 시그널 목록)
+        """
+        entry = self.entries.get(code)
+        if entry is None or entry['inputs'] != inputs:
+            return None
+        return (pd.Timestamp(entry['latest_date']), frame_from_json(entry['weekly']),
+                signals_from_json(entry['signals']))
+
+    def record(self, code, inputs, weekly_df, signals):
+        """계산한 결과 저장 (weekly_df의 마지막 날짜를 마지막 거래일로 기록)"""
+        self.entries[code] = {
+            'inputs': inputs,
+            'latest_date': weekly_df['date'].iloc[-1].isoformat(),
+            'weekly': frame_to_json(weekly_df),
+            'signals': signals_to_json(signals),
+        }
+        self.dirty = True
+
+    def forget(self, code):
+        """종목 결과 삭제 (분석에 실패한 종목)"""
+        if self.entries.pop(code, None) is not None:
+            self.dirty = True
+
+    def save(self):
+        """바뀐 내용이 있으면 파일에 저장 (임시 파일에 쓴 뒤 교체)"""
+        if not self.dirty:
+            return
+        os.makedirs(os.path.dirname(self.path) or '.', exist_ok=True)
+        temp_path = self.path + '.tmp'
+        with open(temp_path, 'w', encoding='utf-8') as f:
+            json.dump({'format': MANIFEST_FORMAT, 'version': self.version, 'entries': self.entries},
+                      f, ensure_ascii=False)
+        os.replace(temp_path, self.path)
+        self.dirty = False
@@ -0,0 +1,161 @@
+import re
+from io import StringIO
+
+import numpy as np
+import pandas as pd
+
+# 파싱 결과 컬럼 (parse_daily_pages 결과와 동일한 순서)
+DAILY_COLUMNS = ['date', 'open', 'high', 'low', 'close', 'diff', 'volume']
+
+# 한 페이지 기본 행 수 (배열 미리 할당용)
+ROWS_PER_PAGE = 10
+
+# 날짜 셀: <span class="tah p10 gray03">2024.01.05</span>
+_DATE_RE = re.compile(r'<td[^>]*>\s*<span[^>]*>(\d{4})\.(\d{2})\.(\d{2})</span>\s*</td>')
+# 숫자 셀 내용: >6,680<
+_NUMBER_RE = re.compile(r'>\s*([\d,]+)\s*<')
+_ROW_END = '</tr>'
+
+# 전일비 부호 표시 (이미지 alt, 숨김 텍스트, 아이콘/색상 클래스)
+_DOWN_MARKERS = ('하락', '하한가', 'ico_down', 'bu_pdn', 'nv01')
+_UP_MARKERS = ('상승', '상한가', 'ico_up', 'bu_pup', 'red02')
+
+
+def _diff_sign(cell):
+    """전일비 셀의 부호 (+1: 상승, -1: 하락, 0: 보합/표시 없음)"""
+    if any(marker in cell for marker in _DOWN_MARKERS):
+        return -1
+    if any(marker in cell for marker in _UP_MARKERS):
+        return 1
+    return 0
+
+
+def _to_int(text):
+    return int(text.replace(',', ''))
+
+
+class _Columns:
+    """미리 할당한 컬럼 배열 (부족하면 두 배로 늘림)"""
+
+    def __init__(self, capacity):
+        self.size = 0
+        self.year = np.empty(capacity, dtype='int64')
+        self.month = np.empty(capacity, dtype='int64')
+        self.day = np.empty(capacity, dtype='int64')
+        self.values = np.empty((capacity, 6), dtype='int64')  # close, diff, open, high, low, volume
+
+    def append(self, year, month, day, values):
+        if self.size == len(self.year):
+            self._grow()
+        idx = self.size
+        self.year[idx] = year
+        self.month[idx] = month
+        self.day[idx] = day
+        self.values[idx] = values
+        self.size += 1
+
+    def _grow(self):
+        capacity = max(1, len(self.year) * 2)
+        for name in ('year', 'month', 'day', 'values'):
+            old = getattr(self, name)
+            new = np.empty((capacity,) + old.shape[1:], dtype=old.dtype)
+            new[:len(old)] = old
+            setattr(self, name, new)
+
+    def to_frame(self):
+        n = self.size
+        months = (self.year[:n] - 1970) * 12 + (self.month[:n] - 1)
+        dates = months.astype('datetime64[M]').astype('datetime64[D]') + (self.day[:n] - 1)
+        close, diff, open_, high, low, volume = self.values[:n].T
+        return pd.DataFrame({
+            'date': dates.astype('datetime64[ns]'),
+            'open': open_,
+            'high': high,
+            'low': low,
+            'close': close,
+            'diff': diff,
+            'volume': volume,
+        }, columns=DAILY_COLUMNS)
+
+
+def _parse_into(html, columns):
+    """한 페이지의 시세 행을 columns에 추가하고 추가한 행 수 반환"""
+    added = 0
+    for match in _DATE_RE.finditer(html):
+        row_end = html.find(_ROW_END, match.end())
+        if row_end < 0:
+            row_end = len(html)
+        body = html[match.end():row_end]
+
+        numbers = _NUMBER_RE.findall(body)
+        if len(numbers) != 6:
+            continue
+
+        # 전일비 셀 (종가 다음 셀)에서 부호 확인
+        cells = body.split('</td>')
+        sign = _diff_sign(cells[1]) if len(cells) > 1 else 0
+
+        close, diff, open_, high, low, volume = (_to_int(number) for number in numbers)
+        columns.append(int(match.group(1)), int(match.group(2)), int(match.group(3)),
+                       (close, sign * diff, open_, high, low, volume))
+        added += 1
+    return added
+
+
+def parse_sise_day(html):
+    """네이버 일별 시세(sise_day) 한 페이지 파싱"""
+    return parse_sise_day_pages([html])
+
+
+def parse_sise_day_pages(htmls):
+    """
+    네이버 일별 시세(sise_day) 여러 페이지를 하나의 데이터프레임으로 파싱
+
+    read_html처럼 DOM을 만들지 않고 표의 행을 정규식으로 훑으며
+    미리 할당한 NumPy 배열에 바로 채운다.
+    전일비(diff)는 상승/하락 표시를 반영한 부호 있는 값이다.
+    """
+    htmls = list(htmls)
+    columns = _Columns(max(1, len(htmls) * ROWS_PER_PAGE))
+    for html in htmls:
+        added = _parse_into(html, columns)
+        if added == 0 and '날짜' in html and '종가' in html:
+            # 표는 있는데 행을 찾지 못한 경우: 페이지 구조가 바뀐 것으로 보고 read_html로 처리
+            for row in parse_with_read_html([html]).itertuples(index=False):
+                date = row.date
+                columns.append(date.year, date.month, date.day,
+                               (row.close, row.diff, row.open, row.high, row.low, row.volume))
+    return columns.to_frame()
+
+
+def page_dates(html):
+    """페이지에 있는 날짜 목록 (행 전체를 파싱하지 않고 날짜만 추출)"""
+    return pd.to_datetime([f'{y}-{m}-{d}' for y, m, d in _DATE_RE.findall(html)])
+
+
+def parse_with_read_html(htmls):
+    """
+    pd.read_html 기반 파싱 (이전 방식, 비교 및 예비용)
+    이전 방식과 같이 전일비는 부호 없이 숫자만 추출한다.
+    """
+    pages = [pd.read_html(StringIO(html))[0] for html in htmls]
+    new_df = pd.concat(pages, ignore_index=True)
+
+    new_df = new_df.rename(columns={'날짜': 'date', '종가': 'close', '전일비': 'diff',
+                                    '시가': 'open', '고가': 'high', '저가': 'low', '거래량': 'volume'})
+    new_df['date'] = pd.to_datetime(new_df['date'])
+    new_df = new_df.dropna()
+
+    for col in ['close', 'open', 'high', 'low', 'volume']:
+        if not pd.api.types.is_numeric_dtype(new_df[col]):
+            new_df[col] = new_df[col].str.replace(',', '').astype(int)
+        else:
+            new_df[col] = new_df[col].astype(int)
+
+    if not pd.api.types.is_numeric_dtype(new_df['diff']):
+        new_df['diff'] = new_df['diff'].str.extract(r'([\d,]+)').fillna('0')
+        new_df['diff'] = new_df['diff'].str.replace(',', '').astype(int)
+    else:
+        new_df['diff'] = new_df['diff'].astype(int)
+
+    return new_df[DAILY_COLUMNS].reset_index(drop=True)
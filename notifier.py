@@ -0,0 +1,241 @@
+import atexit
+import threading
+import time
+from collections import deque
+
+import requests
+
+# Discord 웹훅 제한
+CONTENT_LIMIT = 2000          # content 최대 글자 수
+EMBED_DESCRIPTION_LIMIT = 4096  # embed description 최대 글자 수
+EMBEDS_PER_MESSAGE = 10       # 메시지 하나당 최대 embed 수
+EMBEDS_TOTAL_LIMIT = 6000     # 메시지 하나의 embed 전체 글자 수
+
+MESSAGE_SEPARATOR = '\n\n'
+CODE_FENCE = '```'
+
+
+def split_message(message, limit=CONTENT_LIMIT):
+    """
+    limit보다 긴 메시지를 줄 단위로 나눔
+    코드 블록(```) 중간에서 나뉘면 앞 조각은 블록을 닫고 다음 조각은 다시 연다.
+    한 줄이 너무 길면 글자 수로 자른다.
+    """
+    if len(message) <= limit:
+        return [message]
+
+    closing = '\n' + CODE_FENCE
+    width = limit - 2 * len(closing)  # 코드 블록을 다시 열고 닫을 자리를 남긴 줄 길이
+    lines = []
+    for line in message.split('\n'):
+        lines.extend(line[idx:idx + width] for idx in range(0, max(len(line), 1), width))
+
+    chunks = []
+    current = None
+    in_code = False
+    for line in lines:
+        after = in_code != (line.count(CODE_FENCE) % 2 == 1)
+        candidate = line if current is None else current + '\n' + line
+        if current is not None and len(candidate) + (len(closing) if after else 0) > limit:
+            chunks.append(current + (closing if in_code else ''))
+            candidate = (CODE_FENCE + '\n' if in_code else '') + line
+        current = candidate
+        in_code = after
+    chunks.append(current)
+    return chunks
+
+
+def pack_messages(messages, limit=CONTENT_LIMIT, separator=MESSAGE_SEPARATOR):
+    """
+    메시지들을 순서대로 limit 이하의 content로 묶음 (가능한 한 적은 수의 전송이 되도록)
+    반환값: content 문자열 목록
+    """
+    payloads = []
+    current = ''
+    for message in messages:
+        for chunk in split_message(message, limit):
+            if current and len(current) + len(separator) + len(chunk) <= limit:
+                current += separator + chunk
+            else:
+                if current:
+                    payloads.append(current)
+                current = chunk
+    if current:
+        payloads.append(current)
+    return payloads
+
+
+def pack_embeds(messages):
+    """
+    메시지를 embed로 묶음 (메시지 하나 = embed 하나)
+    전송 하나에 embed 10개, 전체 6000자까지 담는다.
+    반환값: embed 목록의 목록
+    """
+    payloads = []
+    current, total = [], 0
+    for message in messages:
+        for chunk in split_message(message, EMBED_DESCRIPTION_LIMIT):
+            if current and (len(current) >= EMBEDS_PER_MESSAGE or total + len(chunk) > EMBEDS_TOTAL_LIMIT):
+                payloads.append(current)
+                current, total = [], 0
+            current.append({'description': chunk})
+            total += len(chunk)
+    if current:
+        payloads.append(current)
+    return payloads
+
+
+class DiscordNotifier:
+    """
+    Discord 웹훅 전송 큐
+
+    - send()는 메시지를 큐에 넣고 바로 반환하며, 백그라운드 스레드가 전송한다.
+    - 잠시(linger초) 모인 메시지를 2000자(또는 embed) 제한 안에서 최대한 묶어 보낸다.
+    - 429 응답의 retry_after와 X-RateLimit-Remaining/Reset-After 헤더를 따라 대기한다.
+    - flush()로 남은 메시지를 모두 보낼 때까지 기다리며, 프로그램 종료 시에도 자동으로 flush한다.
+    """
+
+    def __init__(self, webhook_url, http_client, username='주식 알리미',
+                 avatar_url='https://cdn-icons-png.flaticon.com/512/2474/2474475.png',
+                 use_embeds=False, linger=0.5, max_attempts=5, backoff=1.0, max_wait=60):
+        self.webhook_url = webhook_url
+        self.http_client = http_client
+        self.username = username
+        self.avatar_url = avatar_url
+        self.use_embeds = use_embeds
+        self.linger = linger
+        self.max_attempts = max_attempts
+        self.backoff = backoff
+        self.max_wait = max_wait
+
+        self._cond = threading.Condition()
+        self._pending = deque()
+        self._busy = False
+        self._flushing = False
+        self._closed = False
+        self._thread = None
+        self._resume_at = 0.0
+        self._stats = {'messages': 0, 'payloads': 0, 'rate_limited': 0, 'failed': 0}
+
+    def send(self, message):
+        """메시지를 전송 큐에 추가 (웹훅 URL이 없거나 종료된 경우 False)"""
+        if not self.webhook_url:
+            return False
+        with self._cond:
+            if self._closed:
+                return False
+            self._pending.append(message)
+            self._stats['messages'] += 1
+            if self._thread is None:
+                self._thread = threading.Thread(target=self._run, name='discord-notifier', daemon=True)
+                self._thread.start()
+                atexit.register(self.close)
+            self._cond.notify_all()
+        return True
+
+    def flush(self, timeout=None):
+        """큐에 남은 메시지를 모두 보낼 때까지 대기 (시간 안에 끝나면 True)"""
+        with self._cond:
+            self._flushing = True
+            self._cond.notify_all()
+            done = self._cond.wait_for(lambda: not self._pending and not self._busy, timeout)
+            self._flushing = False
+            return done
+
+    def close(self, timeout=None):
+        """남은 메시지를 보내고 전송 스레드 종료"""
+        with self._cond:
+            self._closed = True
+            self._cond.notify_all()
+        if self._thread is not None:
+            self._thread.join(timeout)
+
+    def stats(self):
+        with self._cond:
+            return dict(self._stats)
+
+    def _run(self):
+        while True:
+            with self._cond:
+                self._cond.wait_for(lambda: self._pending or self._closed)
+                if not self._pending:
+                    return
+                # 뒤따르는 메시지를 잠시 기다려 함께 묶음 (flush/종료 중이면 바로 전송)
+                self._cond.wait_for(lambda: self._flushing or self._closed, self.linger)
+                batch = list(self._pending)
+                self._pending.clear()
+                self._busy = True
+            try:
+                for payload in self._payloads(batch):
+                    self._deliver(payload)
+            finally:
+                with self._cond:
+                    self._busy = False
+                    self._cond.notify_all()
+
+    def _payloads(self, messages):
+        base = {'username': self.username, 'avatar_url': self.avatar_url}
+        if self.use_embeds:
+            return [dict(base, embeds=embeds) for embeds in pack_embeds(messages)]
+        return [dict(base, content=content) for content in pack_messages(messages)]
+
+    def _deliver(self, payload):
+        """전송 하나를 보냄 (요청 과다/서버 오류는 대기 후 재시도)"""
+        for attempt in range(self.max_attempts):
+            self._wait_bucket()
+            try:
+                response = self.http_client.post(self.webhook_url, json=payload, max_retries=0)
+            except requests.RequestException as e:
+                print(f"Discord 메시지 전송 실패 (재시도 {attempt + 1}/{self.max_attempts}): {str(e)}")
+                time.sleep(min(self.max_wait, self.backoff * (2 ** attempt)))
+                continue
+
+            self._update_bucket(response)
+            if response.status_code == 429:
+                self._count('rate_limited')
+                time.sleep(self._retry_after(response, attempt))
+                continue
+            if response.status_code >= 500:
+                time.sleep(min(self.max_wait, self.backoff * (2 ** attempt)))
+                continue
+            if response.status_code >= 400:
+                print(f"Discord 메시지 전송 실패: HTTP {response.status_code} {response.text[:200]}")
+                break
+
+            self._count('payloads')
+            return True
+
+        self._count('failed')
+        return False
+
+    def _wait_bucket(self):
+        delay = self._resume_at - time.monotonic()
+        if delay > 0:
+            time.sleep(delay)
+
+    def _update_bucket(self, response):
+        """남은 요청 수가 0이면 버킷이 초기화될 때까지 다음 전송을 미룸"""
+        remaining = response.headers.get('X-RateLimit-Remaining')
+        reset_after = response.headers.get('X-RateLimit-Reset-After')
+        if remaining == '0' and reset_after:
+            try:
+                self._resume_at = time.monotonic() + min(self.max_wait, float(reset_after))
+            except ValueError:
+                pass
+
+    def _retry_after(self, response, attempt):
+        """429 응답의 대기 시간 (본문 retry_after → Retry-After 헤더 → 지수 백오프 순)"""
+        try:
+            retry_after = response.json().get('retry_after')
+        except ValueError:
+            retry_after = None
+        if retry_after is None:
+            retry_after = response.headers.get('Retry-After')
+        try:
+            return min(self.max_wait, max(0.0, float(retry_after)))
+        except (TypeError, ValueError):
+            return min(self.max_wait, self.backoff * (2 ** attempt))
+
+    def _count(self, key):
+        with self._cond:
+            self._stats[key] += 1
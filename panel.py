@@ -0,0 +1,369 @@
+import argparse
+import json
+import os
+import threading
+
+import numpy as np
+import pandas as pd
+
+from storage import get_store, PRICE_COLUMNS, COLUMN_DTYPES
+
+# 패널에 담는 기본 컬럼 (일간 시세 파일의 날짜 외 컬럼)
+PANEL_COLUMNS = [column for column in PRICE_COLUMNS if column != 'date']
+
+PANEL_DIR = os.path.join('stock_data', 'panel')
+META_FILE = 'meta.json'
+
+# 처음 만들 때 확보하는 최소 크기 (부족하면 두 배씩 늘림)
+MIN_DATE_CAPACITY = 256
+MIN_CODE_CAPACITY = 64
+
+
+class PricePanel:
+    """
+    전 종목 일간 시세 패널 (메모리 맵 파일)
+
+    정렬된 거래일 축 하나와 컬럼별 [날짜 × 종목] 행렬을 panel_dir에 저장한다.
+    - dates.bin: 거래일 (datetime64[D])
+    - {컬럼}.bin: 가격/거래량은 int64, 지표는 float64 행렬 (행 우선, 한 날짜의 전 종목이 연속)
+    - valid.bin: 해당 날짜에 그 종목 시세가 있는지 (bool 행렬)
+    - meta.json: 종목 목록, 컬럼 타입, 사용 중인 날짜 수와 확보한 크기
+
+    파일을 메모리 맵으로 열기만 하므로 종목 수와 상관없이 바로 열리고,
+    matrix()/series()/row()는 복사 없이 NumPy 뷰를 돌려준다.
+    update()는 새 거래일/종목을 파일에 직접 반영한다. (날짜는 뒤에 추가하면 파일만 늘리고,
+    종목 수가 확보한 크기를 넘을 때만 파일을 새로 쓴다)
+    """
+
+    def __init__(self, panel_dir, meta, mode='r'):
+        self.panel_dir = panel_dir
+        self.mode = mode
+        self.columns = dict(meta['columns'])
+        self._codes = list(meta['codes'])
+        self._index = {code: idx for idx, code in enumerate(self._codes)}
+        self._num_dates = meta['num_dates']
+        self._date_capacity = meta['date_capacity']
+        self._code_capacity = meta['code_capacity']
+        self._lock = threading.RLock()
+        self._map()
+
+    @classmethod
+    def create(cls, panel_dir=PANEL_DIR, columns=None, date_capacity=MIN_DATE_CAPACITY,
+               code_capacity=MIN_CODE_CAPACITY):
+        """빈 패널 생성 (columns: 담을 컬럼 목록, 기본 PANEL_COLUMNS)"""
+        os.makedirs(panel_dir, exist_ok=True)
+        meta = {
+            'codes': [],
+            'columns': {column: COLUMN_DTYPES.get(column, 'float64') for column in columns or PANEL_COLUMNS},
+            'num_dates': 0,
+            'date_capacity': max(date_capacity, 1),
+            'code_capacity': max(code_capacity, 1),
+        }
+        for name, dtype in _files(meta['columns']).items():
+            shape = (meta['date_capacity'],) if name == 'dates' else (meta['date_capacity'], meta['code_capacity'])
+            _allocate(os.path.join(panel_dir, f'{name}.bin'), shape, dtype)
+        _write_meta(panel_dir, meta)
+        return cls(panel_dir, meta, 'r+')
+
+    # 조회 (복사 없는 뷰)
+
+    @property
+    def codes(self):
+        return list(self._codes)
+
+    @property
+    def dates(self):
+        """거래일 축 (datetime64[D])"""
+        return self._maps['dates'][:self._num_dates]
+
+    @property
+    def valid(self):
+        """시세 존재 여부 [날짜 × 종목]"""
+        return self._maps['valid'][:self._num_dates, :len(self._codes)]
+
+    def __contains__(self, code):
+        return code in self._index
+
+    def __len__(self):
+        return len(self._codes)
+
+    def code_index(self, code):
+        return self._index[code]
+
+    def matrix(self, column):
+        """컬럼 행렬 [날짜 × 종목] (시세가 없는 칸은 0이므로 valid와 함께 사용)"""
+        return self._maps[column][:self._num_dates, :len(self._codes)]
+
+    def series(self, code, column):
+        """한 종목의 컬럼 값 (날짜 축 전체)"""
+        return self.matrix(column)[:, self._index[code]]
+
+    def row(self, date, column):
+        """한 거래일의 전 종목 컬럼 값 (거래일 축에 없는 날짜면 KeyError)"""
+        return self.matrix(column)[self.date_index(date)]
+
+    def date_index(self, date):
+        date = np.datetime64(pd.Timestamp(date).date(), 'D')
+        idx = int(np.searchsorted(self.dates, date))
+        if idx == self._num_dates or self.dates[idx] != date:
+            raise KeyError(f"패널에 없는 거래일입니다: {date}")
+        return idx
+
+    def window(self, start=None, end=None):
+        """start~end(포함) 거래일 행 범위 (matrix(...)[window] 형태로 사용)"""
+        dates = self.dates
+        first = 0 if start is None else int(np.searchsorted(dates, np.datetime64(pd.Timestamp(start).date(), 'D')))
+        last = len(dates) if end is None else int(np.searchsorted(dates, np.datetime64(pd.Timestamp(end).date(), 'D'), 'right'))
+        return slice(first, last)
+
+    def masked(self, column):
+        """시세가 없는 칸을 NaN으로 채운 float64 행렬 (복사본)"""
+        values = self.matrix(column).astype('float64')
+        values[~self.valid] = np.nan
+        return values
+
+    def last_date(self, code):
+        """종목의 마지막 거래일 (패널에 없으면 None)"""
+        if code not in self._index:
+            return None
+        rows = np.flatnonzero(self.valid[:, self._index[code]])
+        return self.dates[rows[-1]] if len(rows) else None
+
+    def frame(self, code, columns=None):
+        """한 종목의 시세를 데이터프레임으로 (시세 파일과 같은 형식, 복사본)"""
+        idx = self._index[code]
+        rows = np.flatnonzero(self.valid[:, idx])
+        data = {'date': self.dates[rows].astype('datetime64[ns]')}
+        for column in columns or self.columns:
+            data[column] = self._maps[column][rows, idx]
+        return pd.DataFrame(data)
+
+    # 갱신
+
+    def update(self, code, df, start=0):
+        """
+        종목 시세를 패널에 반영 (df: 시세 파일과 같은 컬럼의 데이터프레임)
+        start: 새로 추가/변경된 첫 행. 패널에 저장된 이 종목의 마지막 날짜가 그 직전 행 날짜보다
+        이르면 (패널이 뒤처져 있으면) df 전체를 반영한다.
+        반환값: 반영한 행 수
+        """
+        if self.mode == 'r':
+            raise ValueError("읽기 전용으로 연 패널은 갱신할 수 없습니다.")
+        dates = _to_days(df['date'])
+        if start > 0:
+            last_date = self.last_date(code)
+            if start > len(df) or last_date is None or last_date < dates[start - 1]:
+                start = 0
+        df, dates = df.iloc[start:], dates[start:]
+        keep = ~np.isnat(dates)
+        if not keep.all():
+            df, dates = df[keep], dates[keep]
+        if len(df) == 0:
+            return 0
+
+        with self._lock:
+            if code not in self._index:
+                self._add_code(code)
+            self._add_dates(np.unique(dates))
+            rows = np.searchsorted(self.dates, dates)
+            idx = self._index[code]
+            for column, dtype in self.columns.items():
+                if column in df.columns:
+                    self._maps[column][rows, idx] = _values(df[column], dtype)
+            self._maps['valid'][rows, idx] = True
+            self.flush()
+        return len(df)
+
+    def flush(self):
+        """변경 내용을 파일에 쓰고 메타 갱신"""
+        with self._lock:
+            for values in self._maps.values():
+                values.flush()
+            _write_meta(self.panel_dir, self._meta())
+
+    def _meta(self):
+        return {
+            'codes': self._codes,
+            'columns': self.columns,
+            'num_dates': self._num_dates,
+            'date_capacity': self._date_capacity,
+            'code_capacity': self._code_capacity,
+        }
+
+    def _map(self):
+        self._maps = {}
+        for name, dtype in _files(self.columns).items():
+            shape = (self._date_capacity,) if name == 'dates' else (self._date_capacity, self._code_capacity)
+            self._maps[name] = np.memmap(os.path.join(self.panel_dir, f'{name}.bin'), dtype=dtype,
+                                         mode=self.mode, shape=shape)
+
+    def _add_code(self, code):
+        if len(self._codes) == self._code_capacity:
+            self._resize(self._date_capacity, self._code_capacity * 2)
+        self._index[code] = len(self._codes)
+        self._codes.append(code)
+        idx = self._index[code]
+        for column, dtype in self.columns.items():
+            self._maps[column][:, idx] = _missing(dtype)
+        self._maps['valid'][:, idx] = False
+
+    def _add_dates(self, new_dates):
+        """거래일 축에 없는 날짜 추가 (마지막 날짜 이후면 뒤에 붙이고, 중간이면 기존 행을 뒤로 밀어 삽입)"""
+        dates = self.dates
+        new_dates = new_dates[~np.isin(new_dates, dates)]
+        if len(new_dates) == 0:
+            return
+        num_dates = self._num_dates + len(new_dates)
+        if num_dates > self._date_capacity:
+            self._resize(max(num_dates, self._date_capacity * 2), self._code_capacity)
+
+        if self._num_dates == 0 or new_dates[0] > dates[-1]:
+            rows = np.arange(self._num_dates, num_dates)
+        else:
+            merged = np.union1d(dates, new_dates)
+            moved = np.searchsorted(merged, dates)
+            for name, values in self._maps.items():
+                values[moved] = np.array(values[:self._num_dates])
+            rows = np.searchsorted(merged, new_dates)
+
+        self._maps['dates'][rows] = new_dates
+        for column, dtype in self.columns.items():
+            self._maps[column][rows] = _missing(dtype)
+        self._maps['valid'][rows] = False
+        self._num_dates = num_dates
+
+    def _resize(self, date_capacity, code_capacity):
+        """
+        확보 크기 변경
+        종목 수는 그대로이고 날짜만 늘리면 행 우선 배치라 파일 뒤를 늘리기만 하면 되고,
+        종목 수를 늘리면 새 파일에 기존 값을 옮겨 쓴 뒤 교체한다.
+        """
+        for values in self._maps.values():
+            values.flush()
+        for name, dtype in _files(self.columns).items():
+            path = os.path.join(self.panel_dir, f'{name}.bin')
+            if name == 'dates' or code_capacity == self._code_capacity:
+                shape = (date_capacity,) if name == 'dates' else (date_capacity, code_capacity)
+                _allocate(path, shape, dtype)
+                continue
+            temp_path = f'{path}.tmp'
+            _allocate(temp_path, (date_capacity, code_capacity), dtype)
+            resized = np.memmap(temp_path, dtype=dtype, mode='r+', shape=(date_capacity, code_capacity))
+            resized[:self._num_dates, :len(self._codes)] = self._maps[name][:self._num_dates, :len(self._codes)]
+            resized.flush()
+            del resized
+            os.replace(temp_path, path)
+        self._date_capacity = date_capacity
+        self._code_capacity = code_capacity
+        self._map()
+
+
+def _files(columns):
+    """패널 파일 이름과 타입"""
+    files = {'dates': 'datetime64[D]', 'valid': 'bool'}
+    files.update(columns)
+    return files
+
+
+def _allocate(path, shape, dtype):
+    """파일 크기를 shape에 맞게 늘림 (늘어난 부분은 0)"""
+    size = int(np.prod(shape)) * np.dtype(dtype).itemsize
+    with open(path, 'ab') as f:
+        if f.tell() < size:
+            f.truncate(size)
+
+
+def _write_meta(panel_dir, meta):
+    path = os.path.join(panel_dir, META_FILE)
+    temp_path = f'{path}.tmp'
+    with open(temp_path, 'w', encoding='utf-8') as f:
+        json.dump(meta, f)
+    os.replace(temp_path, path)
+
+
+def _missing(dtype):
+    return np.nan if np.dtype(dtype).kind == 'f' else 0
+
+
+def _to_days(values):
+    return pd.to_datetime(values).to_numpy().astype('datetime64[D]')
+
+
+def _values(series, dtype):
+    """시세 컬럼 값 → 패널 타입 (정수 컬럼의 빈 값은 0)"""
+    if np.dtype(dtype).kind == 'f':
+        return series.to_numpy(dtype='float64', na_value=np.nan)
+    return series.fillna(0).to_numpy().astype(dtype)
+
+
+def open_panel(panel_dir=PANEL_DIR, mode='r'):
+    """저장된 패널 열기 (없으면 None, mode: 'r' 읽기 전용 / 'r+' 갱신 가능)"""
+    path = os.path.join(panel_dir, META_FILE)
+    if not os.path.exists(path):
+        return None
+    with open(path, encoding='utf-8') as f:
+        meta = json.load(f)
+    return PricePanel(panel_dir, meta, mode)
+
+
+def build_panel(store, panel_dir=PANEL_DIR, codes=None, columns=None):
+    """
+    저장된 일간 시세 파일로 패널을 새로 만듦 (기존 패널은 덮어씀)
+    날짜만 먼저 읽어 거래일 축과 크기를 정한 뒤 종목별로 한 번씩 채운다.
+    """
+    codes = store.codes('daily') if codes is None else codes
+    code_dates = {}
+    for code in codes:
+        arrays = store.load_arrays(code, 'daily', ['date'])
+        if arrays is not None and len(arrays['date']):
+            code_dates[code] = np.unique(arrays['date'].astype('datetime64[D]'))
+    axis = np.unique(np.concatenate(list(code_dates.values()))) if code_dates else np.empty(0, 'datetime64[D]')
+
+    for name in os.listdir(panel_dir) if os.path.isdir(panel_dir) else []:
+        if name.endswith('.bin') or name == META_FILE:
+            os.remove(os.path.join(panel_dir, name))
+    panel = PricePanel.create(panel_dir, columns, max(MIN_DATE_CAPACITY, len(axis) + len(axis) // 4),
+                              max(MIN_CODE_CAPACITY, len(code_dates) + len(code_dates) // 4))
+    panel._add_dates(axis)
+    for code in code_dates:
+        df = store.load(code, 'daily')
+        panel._add_code(code)
+        rows = np.searchsorted(axis, _to_days(df['date']))
+        idx = panel.code_index(code)
+        for column, dtype in panel.columns.items():
+            if column in df.columns:
+                panel._maps[column][rows, idx] = _values(df[column], dtype)
+        panel._maps['valid'][rows, idx] = True
+    panel.flush()
+    return panel
+
+
+def main():
+    parser = argparse.ArgumentParser(description='전 종목 시세 패널 (메모리 맵) 도구')
+    subparsers = parser.add_subparsers(dest='command', required=True)
+
+    build_parser = subparsers.add_parser('build', help='stock_data의 일간 시세 파일로 패널 생성')
+    build_parser.add_argument('--data-dir', default='stock_data')
+    build_parser.add_argument('--format', default='csv', help='시세 저장 형식 (csv, feather, parquet)')
+    build_parser.add_argument('--columns', default='', help='기본 컬럼 외에 담을 지표 컬럼 (쉼표 구분, 예: rsi14,atr14)')
+
+    info_parser = subparsers.add_parser('info', help='패널 정보 출력')
+    info_parser.add_argument('--data-dir', default='stock_data')
+
+    args = parser.parse_args()
+    panel_dir = os.path.join(args.data_dir, 'panel')
+    if args.command == 'build':
+        extra = [column.strip() for column in args.columns.split(',') if column.strip()]
+        panel = build_panel(get_store(args.format, args.data_dir), panel_dir, columns=PANEL_COLUMNS + extra)
+    else:
+        panel = open_panel(panel_dir)
+        if panel is None:
+            print(f"패널이 없습니다: {panel_dir} (python panel.py build로 먼저 생성하세요)")
+            return
+    dates = panel.dates
+    period = f"{dates[0]} ~ {dates[-1]}" if len(dates) else '-'
+    print(f"패널: {panel_dir} ({len(panel)}개 종목, {len(dates)}거래일 {period}, 컬럼: {', '.join(panel.columns)})")
+
+
+if __name__ == '__main__':
+    main()
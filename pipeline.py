@@ -0,0 +1,200 @@
+import contextlib
+import io
+import multiprocessing
+import os
+from concurrent.futures import ProcessPoolExecutor
+from multiprocessing import shared_memory
+
+import numpy as np
+import pandas as pd
+
+from config import get_config, load_config
+from tracing import get_tracer
+
+# 공유 메모리 블록 안에서 컬럼 배열의 시작 위치 정렬 단위 (바이트)
+ALIGNMENT = 64
+
+# CPU 단계 프로세스 풀 (처음 사용할 때 생성해 두고 상주 모드에서도 재사용)
+_pool = None
+_pool_workers = None
+
+
+def share_frame(df):
+    """
+    데이터프레임의 컬럼 배열을 공유 메모리 블록 하나에 복사
+    pickle로 직렬화해 파이프로 보내는 대신 블록 이름과 컬럼 위치만 다른 프로세스에 넘긴다.
+    날짜/숫자/bool 컬럼만 지원한다. (문자열 컬럼이 있으면 TypeError)
+    반환값: (SharedMemory, 명세) - 만든 쪽은 다 쓴 뒤 close(), 마지막으로 쓴 쪽이 unlink()
+    """
+    arrays, columns, size = [], [], 0
+    for column in df.columns:
+        values = df[column].to_numpy()
+        if values.dtype.kind not in 'biufM':
+            raise TypeError(f"공유 메모리로 넘길 수 없는 컬럼입니다: {column} ({df[column].dtype})")
+        offset = -(-size // ALIGNMENT) * ALIGNMENT
+        arrays.append(values)
+        columns.append((column, values.dtype.str, offset))
+        size = offset + values.nbytes
+    shm = shared_memory.SharedMemory(create=True, size=max(size, 1))
+    for values, (_, dtype, offset) in zip(arrays, columns):
+        np.ndarray(len(values), dtype=dtype, buffer=shm.buf, offset=offset)[:] = values
+    return shm, {'name': shm.name, 'rows': len(df), 'columns': columns}
+
+
+def read_shared_frame(spec, unlink=False):
+    """
+    share_frame()의 명세로 데이터프레임 복원 (블록 내용을 한 번 복사하고 바로 닫음)
+    unlink: 읽은 뒤 공유 메모리 블록 삭제 (받는 쪽이 마지막 사용자일 때)
+    """
+    shm = shared_memory.SharedMemory(name=spec['name'])
+    try:
+        data = {column: np.ndarray(spec['rows'], dtype=dtype, buffer=shm.buf, offset=offset).copy()
+                for column, dtype, offset in spec['columns']}
+    finally:
+        shm.close()
+        if unlink:
+            shm.unlink()
+    return pd.DataFrame(data, copy=False)
+
+
+def release_shared(shm):
+    """넘겨준 공유 메모리 블록 삭제 (이미 삭제되었으면 무시)"""
+    shm.close()
+    with contextlib.suppress(FileNotFoundError):
+        shm.unlink()
+
+
+def _init_worker(environ):
+    """작업 프로세스 초기화: 부모와 같은 설정을 쓰되 시세 패널은 부모 프로세스만 갱신"""
+    config = load_config(environ)
+    config.price_panel = False
+
+
+def process_stock(code, existing_spec, pages, num_of_pages, refresh_today=False, keep_daily=False, offset=0):
+    """
+    CPU 단계 작업 단위 (작업 프로세스에서 실행)
+    조회한 페이지 파싱 → 기존 시세와 병합 → 일간/주간 MACD·지표 계산 → 파일 저장 → 시그널 검사
+    existing_spec: 기존 일간 시세의 공유 메모리 명세 (없으면 None)
+    offset: 기존 일간 시세가 최근 구간일 때 첫 행의 위치 (analysis.load_daily_window 참고)
+    pages: 조회한 일별 시세 페이지(HTML) 목록 (업데이트가 필요 없으면 None)
+    keep_daily: 갱신한 전체 일간 시세를 공유 메모리로 돌려줌 (부모가 메모리 캐시/패널을 쓸 때)
+    반환값: {'output': 콘솔 출력, 'weekly_df': 최근 4주, 'signals', 'daily': 공유 메모리 명세 또는 None,
+            'trace': 이 작업의 단계별 시간/카운터 (부모 측정기에 합침)}
+    """
+    import analysis
+
+    get_tracer().reset()
+    output = io.StringIO()
+    with contextlib.redirect_stdout(output):
+        existing_df = read_shared_frame(existing_spec) if existing_spec is not None else pd.DataFrame()
+        new_df = analysis.parse_daily_pages(pages) if pages else None
+        prefetched = {'existing_df': existing_df, 'new_df': new_df, 'offset': offset}
+        weekly_df, signals, daily_df = analysis.analyze_stock_prices(
+            code, num_of_pages, prefetched=prefetched, refresh_today=refresh_today, keep_daily=keep_daily)
+
+    daily = None
+    if daily_df is not None:
+        shm, daily = share_frame(daily_df)
+        shm.close()
+    return {'output': output.getvalue(), 'weekly_df': weekly_df, 'signals': signals, 'daily': daily,
+            'trace': get_tracer().summary()}
+
+
+def get_cpu_pool(max_workers, environ):
+    """
+    CPU 단계 프로세스 풀 (max_workers가 바뀌면 새로 만듦)
+    작업 프로세스는 spawn으로 시작한다. (부모에 HTTP/Discord 스레드가 떠 있으므로 fork하지 않음)
+    """
+    global _pool, _pool_workers
+    if _pool is None or _pool_workers != max_workers:
+        shutdown_cpu_pool()
+        _pool = ProcessPoolExecutor(max_workers=max_workers, mp_context=multiprocessing.get_context('spawn'),
+                                    initializer=_init_worker, initargs=(environ,))
+        _pool_workers = max_workers
+    return _pool
+
+
+def shutdown_cpu_pool():
+    """CPU 단계 프로세스 풀 종료"""
+    global _pool, _pool_workers
+    if _pool is not None:
+        _pool.shutdown()
+        _pool, _pool_workers = None, None
+
+
+def resolve_workers(cpu_workers):
+    """CPU_WORKERS 값 → 실제 프로세스 수 (0이면 CPU 코어 수)"""
+    return cpu_workers if cpu_workers > 0 else (os.cpu_count() or 1)
+
+
+class CpuStage:
+    """
+    I/O 단계(시세 페이지 조회)와 알림 단계 사이의 CPU 단계
+
+    조회가 끝난 종목부터 submit()으로 프로세스 풀에 넘겨, 남은 종목의 조회와 계산이 겹치도록 한다.
+    기존 시세는 공유 메모리로 넘기고, 결과는 result()로 종목 순서에 맞춰 꺼낸다.
+    (작업이 끝난 순서와 관계없이 출력/알림 순서가 항상 같음)
+    """
+
+    def __init__(self, max_workers, num_of_pages, refresh_today=False, keep_daily=False):
+        self.pool = get_cpu_pool(max_workers, get_config().environ)
+        self.num_of_pages = num_of_pages
+        self.refresh_today = refresh_today
+        self.keep_daily = keep_daily
+        self._jobs = {}
+        self._results = {}
+
+    def submit(self, code, prefetched):
+        """prefetch_stock_prices(parse=False)의 종목별 결과를 작업으로 넘김 (실패한 종목은 그대로 보관)"""
+        if isinstance(prefetched, Exception):
+            self._jobs[code] = (None, prefetched)
+            return
+        shm, spec = None, None
+        existing_df = prefetched['existing_df']
+        try:
+            if not existing_df.empty:
+                shm, spec = share_frame(existing_df)
+            future = self.pool.submit(process_stock, code, spec, prefetched['pages'], self.num_of_pages,
+                                      self.refresh_today, self.keep_daily, prefetched.get('offset', 0))
+        except Exception as e:
+            if shm is not None:
+                release_shared(shm)
+            self._jobs[code] = (None, e)
+            return
+        self._jobs[code] = (shm, future)
+
+    def result(self, code):
+        """
+        종목의 계산 결과 (끝날 때까지 대기, 작업에서 난 예외는 그대로 발생)
+        반환값: process_stock()의 결과에서 'daily'를 데이터프레임(또는 None)으로 바꾼 것
+        (같은 종목을 다시 꺼내면 처음 결과를 그대로 돌려줌)
+        """
+        if code not in self._results:
+            self._results[code] = self._collect(code)
+        outcome = self._results[code]
+        if isinstance(outcome, Exception):
+            raise outcome
+        return outcome
+
+    def _collect(self, code):
+        """작업 결과 수신 및 공유 메모리 정리 (실패하면 예외 객체 반환)"""
+        shm, future = self._jobs.pop(code)
+        if isinstance(future, Exception):
+            return future
+        try:
+            outcome = future.result()
+            get_tracer().merge(outcome['trace'])
+            if outcome['daily'] is not None:
+                outcome['daily'] = read_shared_frame(outcome['daily'], unlink=True)
+            return outcome
+        except Exception as e:
+            return e
+        finally:
+            if shm is not None:
+                release_shared(shm)
+
+    def close(self):
+        """꺼내지 않은 작업 정리 (공유 메모리 블록 삭제)"""
+        for code in list(self._jobs):
+            self._results[code] = self._collect(code)
+
@@ -0,0 +1,73 @@
+import numpy as np
+import pandas as pd
+
+OHLCV_COLUMNS = ['date', 'open', 'high', 'low', 'close', 'volume']
+
+# 지원하는 봉 단위: W(주봉, 월요일 시작), M(월봉)
+FREQUENCIES = ('W', 'M')
+
+
+def period_keys(dates, freq='W'):
+    """
+    날짜별 기간 번호 (정수)
+
+    W: 1970-01-05(월요일)부터 센 주 번호. 연도가 바뀌는 주도 하나의 주로 묶인다.
+    M: 1970-01부터 센 월 번호
+    """
+    values = pd.DatetimeIndex(dates).values
+    if freq == 'W':
+        days = values.astype('datetime64[D]').astype('int64')
+        # 1970-01-01은 목요일이므로 3일을 더해 월요일마다 번호가 바뀌도록 맞춘다
+        return (days + 3) // 7
+    if freq == 'M':
+        return values.astype('datetime64[M]').astype('int64')
+    raise ValueError(f"지원하지 않는 봉 단위입니다: {freq} (가능: {', '.join(FREQUENCIES)})")
+
+
+def resample_ohlcv(df, freq='W', by=None):
+    """
+    일간 OHLCV를 주봉/월봉으로 변환 (벡터화)
+
+    - date: 기간의 마지막 거래일
+    - open: 첫 거래일 시가, close: 마지막 거래일 종가
+    - high/low: 기간 중 최고가/최저가
+    - volume: 기간 거래량 합계
+    by: 종목코드 등 그룹 컬럼. 주어지면 여러 종목을 한 번에 변환한다.
+    """
+    columns = ([by] if by else []) + OHLCV_COLUMNS
+    if df.empty:
+        return pd.DataFrame(columns=columns)
+
+    sort_columns = [by, 'date'] if by else ['date']
+    df = df.sort_values(sort_columns, kind='stable')
+
+    # 기간(또는 종목)이 바뀌는 위치가 각 봉의 시작
+    keys = period_keys(df['date'], freq)
+    boundary = np.ones(len(df), dtype=bool)
+    boundary[1:] = keys[1:] != keys[:-1]
+    if by:
+        groups = df[by].to_numpy()
+        boundary[1:] |= groups[1:] != groups[:-1]
+    starts = np.flatnonzero(boundary)
+    ends = np.append(starts[1:], len(df)) - 1
+
+    result = {}
+    if by:
+        result[by] = groups[starts]
+    result['date'] = df['date'].to_numpy()[ends]
+    result['open'] = df['open'].to_numpy()[starts]
+    result['high'] = np.maximum.reduceat(df['high'].to_numpy(), starts)
+    result['low'] = np.minimum.reduceat(df['low'].to_numpy(), starts)
+    result['close'] = df['close'].to_numpy()[ends]
+    result['volume'] = np.add.reduceat(df['volume'].to_numpy(), starts)
+    return pd.DataFrame(result, columns=columns)
+
+
+def resample_weekly(df, by=None):
+    """일간 데이터 → 주봉"""
+    return resample_ohlcv(df, 'W', by)
+
+
+def resample_monthly(df, by=None):
+    """일간 데이터 → 월봉"""
+    return resample_ohlcv(df, 'M', by)
@@ -0,0 +1,147 @@
+import numpy as np
+import pandas as pd
+
+from macd import compute_macd, WEEKLY_PARAMS
+from resample import period_keys
+
+# 스크리너가 읽는 일간 시세 컬럼 (주봉 종가만 필요)
+SCAN_COLUMNS = ['date', 'close']
+
+
+def load_close_panel(store, codes):
+    """
+    여러 종목의 일간 종가를 이어 붙인 배열로 로드
+    종목마다 데이터프레임을 만들지 않도록 필요한 컬럼만 NumPy 배열로 읽어 합친다.
+    저장된 시세가 없는 종목은 건너뛴다.
+    반환값: (종목코드 배열, 행별 종목 번호, 날짜 배열, 종가 배열)
+    """
+    loaded, dates, closes = [], [], []
+    for code in codes:
+        arrays = store.load_arrays(code, 'daily', SCAN_COLUMNS)
+        if arrays is None or len(arrays['date']) == 0:
+            continue
+        loaded.append(code)
+        dates.append(arrays['date'].astype('datetime64[D]'))
+        closes.append(arrays['close'].astype('float64'))
+
+    counts = np.array([len(values) for values in dates], dtype='int64')
+    owner = np.repeat(np.arange(len(loaded)), counts)
+    if not loaded:
+        return np.array(loaded, dtype=object), owner, np.empty(0, dtype='datetime64[D]'), np.empty(0)
+    return np.array(loaded, dtype=object), owner, np.concatenate(dates), np.concatenate(closes)
+
+
+def load_close_matrix(panel, codes):
+    """
+    시세 패널에서 load_close_panel()과 같은 형식으로 종가 로드 (시세 파일을 열지 않음)
+    패널에 없거나 시세가 없는 종목은 건너뛴다.
+    """
+    codes = [code for code in codes if code in panel]
+    columns = np.array([panel.code_index(code) for code in codes], dtype='int64')
+    valid = panel.valid[:, columns]
+    has_rows = valid.any(axis=0)
+    owner, rows = np.nonzero(valid[:, has_rows].T)
+    columns = columns[has_rows]
+    loaded = np.array(codes, dtype=object)[has_rows]
+    return loaded, owner, panel.dates[rows], panel.matrix('close')[rows, columns[owner]].astype('float64')
+
+
+def weekly_panel(owner, dates, closes, num_codes):
+    """
+    종목별 주봉 날짜/종가를 2차원 행렬로 변환
+
+    주봉 종가는 resample_weekly()와 같이 주(월요일 시작)의 마지막 거래일 종가다.
+    각 종목의 마지막 주를 마지막 행에 맞춰 아래쪽으로 정렬한다.
+    상장 기간이 짧은 종목은 앞쪽이 NaN(날짜는 NaT)으로 채워지며, EMA 계산 시 건너뛰므로
+    종목별로 따로 계산한 결과와 같다.
+    반환값: (날짜 행렬, 종가 행렬) [주 × 종목]
+    """
+    if len(dates) == 0:
+        return np.empty((0, num_codes), dtype='datetime64[D]'), np.empty((0, num_codes))
+
+    # 종목/날짜순 정렬 후 주 번호나 종목이 바뀌기 직전 행이 각 주봉의 마지막 거래일
+    # (저장된 시세는 대부분 날짜순이므로 이미 정렬되어 있으면 정렬 생략)
+    same_owner = owner[1:] == owner[:-1]
+    if (owner[1:] < owner[:-1]).any() or (same_owner & (dates[1:] < dates[:-1])).any():
+        order = np.lexsort((dates, owner))
+        owner, dates, closes = owner[order], dates[order], closes[order]
+    keys = period_keys(dates, 'W')
+    week_end = np.ones(len(dates), dtype=bool)
+    week_end[:-1] = (keys[1:] != keys[:-1]) | (owner[1:] != owner[:-1])
+    owner, dates, closes = owner[week_end], dates[week_end], closes[week_end]
+
+    counts = np.bincount(owner, minlength=num_codes)
+    first = np.cumsum(counts) - counts
+    num_rows = counts.max()
+    position = np.arange(len(owner)) - first[owner]
+    row = num_rows - counts[owner] + position
+
+    date_matrix = np.full((num_rows, num_codes), np.datetime64('NaT'), dtype='datetime64[D]')
+    date_matrix[row, owner] = dates
+    close_matrix = np.full((num_rows, num_codes), np.nan)
+    close_matrix[row, owner] = closes
+    return date_matrix, close_matrix
+
+
+def weekly_close_matrix(owner, dates, closes, num_codes):
+    """
+    종목별 주봉 종가 행렬 (weekly_panel 참고)
+    반환값: (종목별 마지막 주 날짜, 종가 행렬[주 × 종목])
+    """
+    date_matrix, close_matrix = weekly_panel(owner, dates, closes, num_codes)
+    last_dates = pd.DatetimeIndex(date_matrix[-1] if len(date_matrix) else [])
+    return last_dates, close_matrix
+
+
+def scan_signals(codes, last_dates, close_matrix, params=WEEKLY_PARAMS):
+    """
+    전 종목의 주간 MACD 히스토그램 부호 전환을 한 번에 검사
+
+    check_macd_signals()와 같은 규칙 (직전 주 < 0 < 이번 주: BUY, 직전 주 > 0 > 이번 주: SELL)
+    strength: 히스토그램 변화폭을 종가 대비 %로 나타낸 값 (순위 기준)
+    """
+    columns = ['code', 'type', 'date', 'price', 'prev_hist', 'curr_hist', 'strength']
+    if close_matrix.shape[0] < 2:
+        return pd.DataFrame(columns=columns)
+
+    hist = compute_macd(close_matrix, **params)['macd_hist']
+    prev_hist, curr_hist = hist[-2], hist[-1]
+    buy = (prev_hist < 0) & (curr_hist > 0)
+    sell = (prev_hist > 0) & (curr_hist < 0)
+    mask = buy | sell
+
+    price = close_matrix[-1]
+    strength = np.abs(curr_hist - prev_hist) / price * 100
+    result = pd.DataFrame({
+        'code': codes[mask],
+        'type': np.where(buy[mask], 'BUY', 'SELL'),
+        'date': last_dates[mask],
+        'price': price[mask].astype('int64'),
+        'prev_hist': prev_hist[mask],
+        'curr_hist': curr_hist[mask],
+        'strength': np.round(strength[mask], 4),
+    }, columns=columns)
+    return result.sort_values('strength', ascending=False, kind='stable').reset_index(drop=True)
+
+
+def screen_universe(store, codes, names=None, params=WEEKLY_PARAMS, since=None, panel=None):
+    """
+    저장된 시세가 있는 전 종목을 대상으로 주간 MACD 매매 시그널 검색
+
+    names: {종목코드: 종목명} (결과에 종목명 컬럼 추가)
+    since: 이 날짜 이전에 마지막 주가 끝난 종목(거래정지/상장폐지 등)은 제외
+    panel: 시세 패널 (모든 종목이 패널에 있으면 시세 파일 대신 패널에서 읽음)
+    반환값: 시그널 강도순으로 정렬된 데이터프레임
+    """
+    if panel is not None and all(code in panel for code in codes):
+        codes, owner, dates, closes = load_close_matrix(panel, codes)
+    else:
+        codes, owner, dates, closes = load_close_panel(store, codes)
+    last_dates, close_matrix = weekly_close_matrix(owner, dates, closes, len(codes))
+    signals = scan_signals(codes, last_dates, close_matrix, params)
+
+    if since is not None:
+        signals = signals[signals['date'] >= pd.Timestamp(since)].reset_index(drop=True)
+    if names is not None:
+        signals.insert(1, 'name', [names.get(code, '') for code in signals['code']])
+    return signals
@@ -0,0 +1,466 @@
+import argparse
+import glob
+import io
+import itertools
+import os
+
+import numpy as np
+import pandas as pd
+
+# 일간/주간 시세 파일 컬럼과 타입
+PRICE_COLUMNS = ['date', 'open', 'high', 'low', 'close', 'diff', 'volume',
+                 'ema12', 'ema26', 'macd_line', 'signal_line', 'macd_hist']
+COLUMN_DTYPES = {
+    'open': 'int64',
+    'high': 'int64',
+    'low': 'int64',
+    'close': 'int64',
+    'diff': 'int64',
+    'volume': 'int64',
+    'ema12': 'float64',
+    'ema26': 'float64',
+    'macd_line': 'float64',
+    'signal_line': 'float64',
+    'macd_hist': 'float64',
+}
+
+TIMEFRAMES = ('daily', 'weekly')
+
+# 파일 끝부분을 거꾸로 읽을 때 한 번에 읽는 크기 (바이트)
+TAIL_BLOCK_SIZE = 1 << 16
+
+
+def coerce_dtypes(df):
+    """컬럼 타입 통일 (날짜: datetime64, 가격/거래량: int64, 지표: float64)"""
+    if 'date' in df.columns and not pd.api.types.is_datetime64_any_dtype(df['date']):
+        df['date'] = pd.to_datetime(df['date'])
+    for column, dtype in COLUMN_DTYPES.items():
+        if column in df.columns and df[column].dtype != dtype:
+            if dtype == 'int64' and df[column].isna().any():
+                continue
+            df[column] = df[column].astype(dtype)
+    return df
+
+
+def compact_dtypes(df):
+    """
+    가격 컬럼을 값 범위가 맞으면 int32로 변환 (읽기만 하는 최근 구간의 메모리 절약용)
+    거래량은 주간 합계가 int32를 넘을 수 있으므로 int64로 두고,
+    지표 컬럼은 float64로 둔다. (6자리 가격의 EMA를 소수점 4자리까지 저장하므로 float32 유효숫자로는 부족)
+    저장할 때는 coerce_dtypes()가 다시 int64로 바꾼다.
+    """
+    info = np.iinfo('int32')
+    for column, dtype in COLUMN_DTYPES.items():
+        if dtype == 'int64' and column != 'volume' and column in df.columns and df[column].dtype == 'int64' and len(df):
+            values = df[column].to_numpy()
+            if info.min <= values.min() and values.max() <= info.max:
+                df[column] = values.astype('int32')
+    return df
+
+
+def tail_rows(df, since=None, min_rows=0):
+    """날짜순 데이터프레임에서 날짜가 since(의 날짜) 이후인 행과 최소 min_rows개의 마지막 행"""
+    first = len(df)
+    if since is not None and len(df):
+        first = int(df['date'].searchsorted(pd.Timestamp(since).normalize()))
+    return df.iloc[min(first, max(len(df) - min_rows, 0)):]
+
+
+def _reverse_line_starts(f, data_start, end):
+    """바이너리 파일의 data_start~end 구간에서 줄 시작 위치를 마지막 줄부터 거꾸로 (파일 끝 줄바꿈 제외)"""
+    pos = end - 1
+    while pos > data_start:
+        block_start = max(data_start, pos - TAIL_BLOCK_SIZE)
+        f.seek(block_start)
+        block = f.read(pos - block_start)
+        idx = len(block)
+        while True:
+            idx = block.rfind(b'\n', 0, idx)
+            if idx < 0:
+                break
+            yield block_start + idx + 1
+        pos = block_start
+    if end > data_start:
+        yield data_start
+
+
+def _csv_tail(path, since=None, min_rows=0, columns=None):
+    """
+    CSV 파일 끝에서부터 거꾸로 읽어 날짜가 since 이후인 행과 최소 min_rows개의 마지막 행만 파싱
+    (날짜순으로 저장되어 있고 첫 컬럼이 날짜(YYYY-MM-DD)인 시세 파일)
+    """
+    since_key = pd.Timestamp(since).strftime('%Y-%m-%d').encode() if since is not None else None
+    with open(path, 'rb') as f:
+        header = f.readline()
+        data_start = f.tell()
+        end = f.seek(0, os.SEEK_END)
+        start, rows = end, 0
+        for line_start in _reverse_line_starts(f, data_start, end):
+            if rows >= min_rows:
+                if since_key is None:
+                    break
+                f.seek(line_start)
+                if f.read(len(since_key)) < since_key:
+                    break
+            start, rows = line_start, rows + 1
+        f.seek(start)
+        data = f.read()
+    return pd.read_csv(io.BytesIO(header + data), usecols=columns)
+
+
+class PriceStore:
+    """
+    종목별 시세 저장소 기본 클래스
+
+    파일 이름은 {종목코드}_{daily|weekly}.{확장자} 형식이다.
+    하위 클래스는 extension과 _read/_write만 구현하면 된다.
+    """
+
+    extension = None
+
+    def __init__(self, data_dir='stock_data', export_csv=False):
+        self.data_dir = data_dir
+        self.export_csv = export_csv
+
+    def path(self, code, timeframe):
+        return os.path.join(self.data_dir, f'{code}_{timeframe}.{self.extension}')
+
+    def exists(self, code, timeframe):
+        return os.path.exists(self.path(code, timeframe)) or os.path.exists(self._csv_path(code, timeframe))
+
+    def load(self, code, timeframe, columns=None):
+        """
+        시세 로드 (없으면 빈 데이터프레임)
+        아직 변환되지 않은 CSV 파일만 있으면 CSV를 읽는다.
+        columns: 읽을 컬럼 목록 (기본: 전체)
+        """
+        path = self.path(code, timeframe)
+        if os.path.exists(path):
+            df = self._read(path, columns)
+        elif os.path.exists(self._csv_path(code, timeframe)):
+            df = pd.read_csv(self._csv_path(code, timeframe), usecols=columns)
+        else:
+            return pd.DataFrame()
+        return coerce_dtypes(df)
+
+    def load_tail(self, code, timeframe, since=None, min_rows=0, columns=None):
+        """
+        시세 끝부분만 로드: 날짜가 since 이후인 행과 최소 min_rows개의 마지막 행 (없으면 빈 데이터프레임)
+        columns: 읽을 컬럼 목록 (기본: 전체), 가격/거래량은 compact_dtypes()로 줄여서 돌려준다.
+        전체 기간을 읽지 않으므로 저장된 기간이 길어져도 메모리 사용량이 늘지 않는다.
+        """
+        path = self.path(code, timeframe)
+        if os.path.exists(path):
+            df = self._read_tail(path, since, min_rows, columns)
+        elif os.path.exists(self._csv_path(code, timeframe)):
+            df = _csv_tail(self._csv_path(code, timeframe), since, min_rows, columns)
+        else:
+            return pd.DataFrame()
+        return compact_dtypes(coerce_dtypes(df.reset_index(drop=True)))
+
+    def load_arrays(self, code, timeframe, columns):
+        """
+        지정한 컬럼만 {컬럼: NumPy 배열}로 로드 (없으면 None)
+        여러 종목을 훑을 때 종목마다 데이터프레임을 만드는 비용을 줄이기 위한 용도
+        """
+        path = self.path(code, timeframe)
+        if os.path.exists(path):
+            return self._read_arrays(path, columns)
+        df = self.load(code, timeframe, columns)
+        if df.empty:
+            return None
+        return {column: df[column].to_numpy() for column in columns}
+
+    def save(self, code, timeframe, df):
+        """시세 저장 (export_csv가 켜져 있으면 CSV 사본도 함께 저장)"""
+        if not os.path.exists(self.data_dir):
+            os.makedirs(self.data_dir)
+        df = coerce_dtypes(df.reset_index(drop=True).copy())
+        self._write(df, self.path(code, timeframe))
+        if self.export_csv and self.extension != 'csv':
+            df.to_csv(self._csv_path(code, timeframe), index=False)
+
+    def replace_tail(self, code, timeframe, df, drop_rows=0):
+        """
+        저장된 시세의 마지막 drop_rows행을 df로 교체 (새 행 추가, 마지막 행 갱신용)
+        CSV는 파일 끝만 잘라내고 이어 쓰며, 그 밖의 형식이나 컬럼이 다른 파일은 전체를 다시 저장한다.
+        """
+        df = coerce_dtypes(df.reset_index(drop=True).copy())
+        path = self.path(code, timeframe)
+        if os.path.exists(path) and self._replace_tail(path, df, drop_rows):
+            return
+        existing = self.load(code, timeframe)
+        if drop_rows:
+            existing = existing.iloc[:max(len(existing) - drop_rows, 0)]
+        self.save(code, timeframe, pd.concat([existing, df], ignore_index=True) if not existing.empty else df)
+
+    def codes(self, timeframe='daily'):
+        """저장된 종목코드 목록 (CSV만 있는 종목 포함)"""
+        codes = set()
+        for extension in {self.extension, 'csv'}:
+            pattern = os.path.join(self.data_dir, f'*_{timeframe}.{extension}')
+            for path in glob.glob(pattern):
+                code = os.path.basename(path)[:-len(f'_{timeframe}.{extension}')]
+                if code.isdigit():
+                    codes.add(code)
+        return sorted(codes)
+
+    def _csv_path(self, code, timeframe):
+        return os.path.join(self.data_dir, f'{code}_{timeframe}.csv')
+
+    def _read(self, path, columns=None):
+        raise NotImplementedError
+
+    def _read_arrays(self, path, columns):
+        df = coerce_dtypes(self._read(path, columns))
+        return {column: df[column].to_numpy() for column in columns}
+
+    def _read_tail(self, path, since, min_rows, columns):
+        return tail_rows(coerce_dtypes(self._read(path, columns)), since, min_rows)
+
+    def _write(self, df, path):
+        raise NotImplementedError
+
+    def _replace_tail(self, path, df, drop_rows):
+        """파일 끝부분만 바꿀 수 있는 형식이면 바꾸고 True"""
+        return False
+
+
+class CsvStore(PriceStore):
+    """CSV 저장소 (기존 형식)"""
+
+    extension = 'csv'
+
+    def _read(self, path, columns=None):
+        return pd.read_csv(path, usecols=columns)
+
+    def _read_tail(self, path, since, min_rows, columns):
+        return _csv_tail(path, since, min_rows, columns)
+
+    def _write(self, df, path):
+        df.to_csv(path, index=False)
+
+    def _replace_tail(self, path, df, drop_rows):
+        """
+        마지막 drop_rows줄을 잘라내고 df를 이어 씀 (전체를 to_csv로 다시 쓴 것과 같은 내용)
+        헤더(컬럼)가 다르거나, 파일이 줄바꿈으로 끝나지 않거나, 행이 모자라면 False
+        """
+        header = df.iloc[:0].to_csv(index=False).encode()
+        with open(path, 'r+b') as f:
+            if f.readline() != header:
+                return False
+            data_start = f.tell()
+            end = f.seek(0, os.SEEK_END)
+            if end > data_start:
+                f.seek(end - 1)
+                if f.read(1) != b'\n':
+                    return False
+            start = end
+            if drop_rows:
+                starts = list(itertools.islice(_reverse_line_starts(f, data_start, end), drop_rows))
+                if len(starts) < drop_rows:
+                    return False
+                start = starts[-1]
+            f.seek(start)
+            f.truncate()
+            f.write(df.to_csv(index=False, header=False).encode())
+        return True
+
+
+class FeatherStore(PriceStore):
+    """Feather(Arrow IPC) 저장소 - 컬럼 타입을 그대로 보존하며 텍스트 파싱이 없음"""
+
+    extension = 'feather'
+
+    def __init__(self, data_dir='stock_data', export_csv=False):
+        _require_pyarrow()
+        super().__init__(data_dir, export_csv)
+
+    def _read(self, path, columns=None):
+        return pd.read_feather(path, columns=columns)
+
+    def _read_arrays(self, path, columns):
+        from pyarrow import feather
+        return _table_arrays(feather.read_table(path, columns=columns, memory_map=True), columns)
+
+    def _read_tail(self, path, since, min_rows, columns):
+        # 메모리 맵으로 열고 날짜 컬럼으로 시작 행을 찾은 뒤 그 뒤만 pandas로 변환
+        from pyarrow import feather
+        table = feather.read_table(path, columns=columns, memory_map=True)
+        first = table.num_rows
+        if since is not None and first:
+            dates = table.column('date').to_numpy()
+            first = int(np.searchsorted(dates, np.datetime64(pd.Timestamp(since).normalize()).astype(dates.dtype)))
+        return table.slice(min(first, max(table.num_rows - min_rows, 0))).to_pandas()
+
+    def _write(self, df, path):
+        df.to_feather(path)
+
+
+class ParquetStore(PriceStore):
+    """Parquet 저장소 - Feather보다 파일이 작음 (압축)"""
+
+    extension = 'parquet'
+
+    def __init__(self, data_dir='stock_data', export_csv=False):
+        _require_pyarrow()
+        super().__init__(data_dir, export_csv)
+
+    def _read(self, path, columns=None):
+        return pd.read_parquet(path, columns=columns)
+
+    def _read_arrays(self, path, columns):
+        from pyarrow import parquet
+        return _table_arrays(parquet.read_table(path, columns=columns), columns)
+
+    def _write(self, df, path):
+        df.to_parquet(path, index=False)
+
+
+class MemoryCachedStore:
+    """
+    읽거나 저장한 시세를 메모리에 보관하는 저장소 래퍼 (상주 실행용)
+
+    같은 종목을 다시 load()하면 파일을 읽지 않고 보관한 데이터의 복사본을 돌려준다.
+    save()는 파일에 저장한 뒤 보관한 데이터도 바꾼다.
+    그 밖의 속성(path, codes 등)은 감싼 저장소를 그대로 쓴다.
+    """
+
+    def __init__(self, store):
+        self.store = store
+        self._frames = {}
+
+    def __getattr__(self, name):
+        return getattr(self.store, name)
+
+    def load(self, code, timeframe, columns=None):
+        key = (code, timeframe)
+        if key not in self._frames:
+            self._frames[key] = self.store.load(code, timeframe)
+        df = self._frames[key]
+        if columns is not None and not df.empty:
+            df = df[columns]
+        return df.copy()
+
+    def load_arrays(self, code, timeframe, columns):
+        df = self._frames.get((code, timeframe))
+        if df is None:
+            return self.store.load_arrays(code, timeframe, columns)
+        if df.empty:
+            return None
+        return {column: df[column].to_numpy() for column in columns}
+
+    def load_tail(self, code, timeframe, since=None, min_rows=0, columns=None):
+        # 상주 실행에서는 전체 시세를 메모리에 두므로 보관한 데이터에서 잘라냄
+        key = (code, timeframe)
+        if key not in self._frames:
+            self._frames[key] = self.store.load(code, timeframe)
+        df = tail_rows(self._frames[key], since, min_rows)
+        if columns is not None and not df.empty:
+            df = df[columns]
+        return compact_dtypes(df.reset_index(drop=True))
+
+    def save(self, code, timeframe, df):
+        self.store.save(code, timeframe, df)
+        self._frames[(code, timeframe)] = coerce_dtypes(df.reset_index(drop=True).copy())
+
+    def replace_tail(self, code, timeframe, df, drop_rows=0):
+        self.store.replace_tail(code, timeframe, df, drop_rows)
+        key = (code, timeframe)
+        if key in self._frames:
+            kept = self._frames[key].iloc[:max(len(self._frames[key]) - drop_rows, 0)]
+            self._frames[key] = coerce_dtypes(pd.concat([kept, df], ignore_index=True))
+
+    def remember(self, code, timeframe, df):
+        """다른 프로세스가 파일에 저장한 시세를 메모리에만 반영"""
+        self._frames[(code, timeframe)] = coerce_dtypes(df.reset_index(drop=True).copy())
+
+    def forget(self, code=None, timeframe=None):
+        """보관한 시세 삭제 (code가 없으면 전체, timeframe을 주면 그 주기만)"""
+        for key in [key for key in self._frames
+                    if (code is None or key[0] == code) and (timeframe is None or key[1] == timeframe)]:
+            del self._frames[key]
+
+
+STORES = {
+    'csv': CsvStore,
+    'feather': FeatherStore,
+    'parquet': ParquetStore,
+}
+
+
+def _table_arrays(table, columns):
+    """pyarrow 테이블 → {컬럼: NumPy 배열} (pandas 변환 없이)"""
+    return {column: table.column(column).to_numpy() for column in columns}
+
+
+def _require_pyarrow():
+    try:
+        import pyarrow  # noqa: F401
+    except ImportError:
+        raise ImportError("Feather/Parquet 저장소를 사용하려면 pyarrow 패키지가 필요합니다. (pip install pyarrow)")
+
+
+def get_store(storage_format='csv', data_dir='stock_data', export_csv=False):
+    """저장 형식 이름으로 저장소 생성"""
+    if storage_format not in STORES:
+        raise ValueError(f"지원하지 않는 저장 형식입니다: {storage_format} (가능: {', '.join(STORES)})")
+    return STORES[storage_format](data_dir, export_csv)
+
+
+def migrate(target_format, data_dir='stock_data', remove_csv=False):
+    """
+    기존 stock_data/*.csv 시세 파일을 다른 저장 형식으로 일괄 변환
+    반환값: 변환한 파일 수
+    """
+    target = get_store(target_format, data_dir)
+    source = CsvStore(data_dir)
+    converted = 0
+    for timeframe in TIMEFRAMES:
+        for code in source.codes(timeframe):
+            df = source.load(code, timeframe)
+            target.save(code, timeframe, df)
+            converted += 1
+            if remove_csv and target_format != 'csv':
+                os.remove(source.path(code, timeframe))
+    return converted
+
+
+def export_csv(storage_format, data_dir='stock_data', codes=None):
+    """저장된 시세를 CSV로 내보내기 (codes가 없으면 전체 종목)"""
+    store = get_store(storage_format, data_dir)
+    exported = 0
+    for timeframe in TIMEFRAMES:
+        for code in codes or store.codes(timeframe):
+            if not os.path.exists(store.path(code, timeframe)):
+                continue
+            store.load(code, timeframe).to_csv(store._csv_path(code, timeframe), index=False)
+            exported += 1
+    return exported
+
+
+def main():
+    parser = argparse.ArgumentParser(description='시세 저장소 변환 도구')
+    subparsers = parser.add_subparsers(dest='command', required=True)
+
+    migrate_parser = subparsers.add_parser('migrate', help='CSV 시세 파일을 다른 형식으로 변환')
+    migrate_parser.add_argument('format', choices=[name for name in STORES if name != 'csv'])
+    migrate_parser.add_argument('--data-dir', default='stock_data')
+    migrate_parser.add_argument('--remove-csv', action='store_true', help='변환 후 CSV 파일 삭제')
+
+    export_parser = subparsers.add_parser('export', help='저장된 시세를 CSV로 내보내기')
+    export_parser.add_argument('format', choices=[name for name in STORES if name != 'csv'])
+    export_parser.add_argument('codes', nargs='*', help='내보낼 종목코드 (생략 시 전체)')
+    export_parser.add_argument('--data-dir', default='stock_data')
+
+    args = parser.parse_args()
+    if args.command == 'migrate':
+        count = migrate(args.format, args.data_dir, args.remove_csv)
+        print(f"{count}개 파일을 {args.format} 형식으로 변환했습니다.")
+    else:
+        count = export_csv(args.format, args.data_dir, args.codes)
+        print(f"{count}개 파일을 CSV로 내보냈습니다.")
+
+
+if __name__ == '__main__':
+    main()
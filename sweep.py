@@ -0,0 +1,212 @@
+import argparse
+import os
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+import pandas as pd
+
+from macd import ema_alpha, ema_many, WEEKLY_PARAMS
+from backtest import (histogram_signals, hold_positions, trade_costs, weekly_log_returns, equity_curves,
+                      max_drawdown, trade_returns, FEE, SELL_TAX, SLIPPAGE)
+from screener import load_close_panel, weekly_panel
+from storage import get_store
+
+# 기본 탐색 범위 (현재 주간 설정 12/26/9, +1.15, -1.0 포함)
+DEFAULT_GRID = {
+    'fast': [8, 10, 12, 14, 16],
+    'slow': [20, 23, 26, 30, 35],
+    'signal': [5, 7, 9, 11, 13],
+    'alpha_offset': [1.0, 1.15, 1.3],
+    'bias': [0.0, -0.5, -1.0],
+}
+
+PARAM_COLUMNS = ['fast', 'slow', 'signal', 'alpha_offset', 'bias']
+# 종목 묶음별로 계산해 합산하는 값
+SUM_COLUMNS = ['tickers', 'trades', 'closed', 'wins', 'positive', 'sum_return', 'sum_drawdown']
+RESULT_COLUMNS = PARAM_COLUMNS + ['tickers', 'trades', 'win_rate', 'mean_return',
+                                  'mean_drawdown', 'positive_ratio']
+
+
+def parse_values(text, cast=float):
+    """
+    탐색 값 목록 파싱
+    "8,10,12" → [8, 10, 12], "8:16:2" → [8, 10, 12, 14, 16] (끝값 포함)
+    """
+    if ':' in text:
+        start, stop, step = (cast(part) for part in text.split(':'))
+        values = np.arange(start, stop + step / 2, step)
+        return [cast(round(value, 10)) for value in values]
+    return [cast(part) for part in text.split(',') if part.strip()]
+
+
+def count_combinations(grid):
+    """fast < slow 조건을 만족하는 조합 수"""
+    pairs = sum(1 for fast in grid['fast'] for slow in grid['slow'] if fast < slow)
+    return pairs * len(grid['signal']) * len(grid['alpha_offset']) * len(grid['bias'])
+
+
+def _evaluate(close_matrix, hist, entry_cost, exit_cost, lag, log_returns):
+    """히스토그램 하나에 대한 종목 묶음의 성과 합계 (SUM_COLUMNS 순서)"""
+    buy, sell = histogram_signals(hist)
+    position = hold_positions(buy, sell, lag)
+    equity = equity_curves(close_matrix, position, entry_cost, exit_cost, log_returns)
+    total_return = equity[-1] - 1
+
+    _, _, _, is_open, log_return = trade_returns(close_matrix, position, entry_cost, exit_cost)
+    closed = ~is_open
+    # 백테스트 거래 목록과 같이 소수점 6자리로 반올림한 수익률로 승패 판정
+    wins = np.round(np.expm1(log_return[closed]), 6) > 0
+    return (close_matrix.shape[1], len(log_return), int(closed.sum()), int(wins.sum()),
+            int((total_return > 0).sum()), float(total_return.sum()),
+            float(max_drawdown(equity).sum()))
+
+
+def sweep_slice(close_matrix, grid, fee=FEE, sell_tax=SELL_TAX, slippage=SLIPPAGE, lag=0):
+    """
+    종목 묶음(close_matrix의 열) 하나에 대해 전체 조합 평가
+
+    - alpha_offset별로 fast/slow에 쓰이는 모든 기간의 EMA를 한 번에 계산해 조합 간에 공유
+    - (fast, slow) 쌍마다 MACD Line을 한 번 만들고 모든 signal 기간의 EMA를 한 번에 계산
+    - bias는 반올림된 MACD/Signal 차이에 더하기만 하면 되므로 마지막에 적용
+    반올림 규칙은 compute_macd()와 같다.
+    반환값: 조합별 성과 합계 행 목록
+    """
+    entry_cost, exit_cost = trade_costs(fee, sell_tax, slippage)
+    log_returns = weekly_log_returns(close_matrix)
+    spans = sorted(set(grid['fast']) | set(grid['slow']))
+    rows = []
+    for alpha_offset in grid['alpha_offset']:
+        emas = ema_many(close_matrix, [ema_alpha(span, alpha_offset) for span in spans])
+        by_span = dict(zip(spans, emas))
+        signal_alphas = [ema_alpha(signal, alpha_offset) for signal in grid['signal']]
+
+        for fast in grid['fast']:
+            for slow in grid['slow']:
+                if fast >= slow:
+                    continue
+                macd_line = by_span[fast] - by_span[slow]
+                macd_rounded = np.round(macd_line, 4)
+                signal_lines = ema_many(macd_line, signal_alphas)
+
+                for signal, signal_line in zip(grid['signal'], signal_lines):
+                    diff = macd_rounded - np.round(signal_line, 4)
+                    for bias in grid['bias']:
+                        hist = np.round(diff + bias if bias else diff, 2)
+                        metrics = _evaluate(close_matrix, hist, entry_cost, exit_cost, lag, log_returns)
+                        rows.append((fast, slow, signal, alpha_offset, bias) + metrics)
+    return rows
+
+
+def _sweep_task(args):
+    """프로세스 풀 작업 단위"""
+    close_matrix, grid, options = args
+    return sweep_slice(close_matrix, grid, **options)
+
+
+def run_sweep(close_matrix, grid=None, max_workers=None, fee=FEE, sell_tax=SELL_TAX,
+              slippage=SLIPPAGE, lag=0):
+    """
+    파라미터 조합 탐색
+
+    종목(열)을 max_workers개 묶음으로 나눠 프로세스 풀에서 병렬로 계산한 뒤 조합별로 합산한다.
+    (각 묶음 안에서는 EMA 계산을 조합 간에 공유)
+    반환값: 조합별 성과 테이블 (평균 수익률 순)
+    - win_rate: 청산된 거래 중 수익 거래 비율
+    - mean_return / mean_drawdown: 종목별 총 수익률 / 최대 낙폭의 평균
+    - positive_ratio: 총 수익률이 양수인 종목 비율
+    """
+    grid = dict(DEFAULT_GRID, **(grid or {}))
+    options = {'fee': fee, 'sell_tax': sell_tax, 'slippage': slippage, 'lag': lag}
+    num_codes = close_matrix.shape[1]
+    max_workers = max_workers or os.cpu_count() or 1
+    chunks = [chunk for chunk in np.array_split(np.arange(num_codes), max(1, min(max_workers, num_codes)))
+              if len(chunk)]
+
+    tasks = [(close_matrix[:, chunk], grid, options) for chunk in chunks]
+    if len(tasks) <= 1:
+        results = [_sweep_task(task) for task in tasks]
+    else:
+        with ProcessPoolExecutor(max_workers=len(tasks)) as executor:
+            results = list(executor.map(_sweep_task, tasks))
+
+    rows = [row for result in results for row in result]
+    if not rows:
+        return pd.DataFrame(columns=RESULT_COLUMNS)
+    totals = pd.DataFrame(rows, columns=PARAM_COLUMNS + SUM_COLUMNS)
+    totals = totals.groupby(PARAM_COLUMNS, sort=False, as_index=False)[SUM_COLUMNS].sum()
+    return _result_table(totals)
+
+
+def _result_table(totals):
+    """합계 → 비율/평균 (작은 타입으로 변환해 테이블 크기를 줄임)"""
+    tickers = totals['tickers'].clip(lower=1)
+    table = pd.DataFrame({
+        'fast': totals['fast'].astype('int16'),
+        'slow': totals['slow'].astype('int16'),
+        'signal': totals['signal'].astype('int16'),
+        'alpha_offset': totals['alpha_offset'].astype('float32'),
+        'bias': totals['bias'].astype('float32'),
+        'tickers': totals['tickers'].astype('int32'),
+        'trades': totals['trades'].astype('int32'),
+        'win_rate': (totals['wins'] / totals['closed'].where(totals['closed'] > 0)).astype('float32'),
+        'mean_return': (totals['sum_return'] / tickers).astype('float32'),
+        'mean_drawdown': (totals['sum_drawdown'] / tickers).astype('float32'),
+        'positive_ratio': (totals['positive'] / tickers).astype('float32'),
+    }, columns=RESULT_COLUMNS)
+    return table.sort_values('mean_return', ascending=False, kind='stable').reset_index(drop=True)
+
+
+def sweep_store(store, codes=None, grid=None, **kwargs):
+    """저장소의 일간 시세(전체 기간)로 주봉을 만들어 파라미터 탐색"""
+    codes = store.codes('daily') if codes is None else codes
+    codes, owner, dates, closes = load_close_panel(store, codes)
+    _, close_matrix = weekly_panel(owner, dates, closes, len(codes))
+    return run_sweep(close_matrix, grid, **kwargs)
+
+
+def main():
+    parser = argparse.ArgumentParser(description='주간 MACD 파라미터 탐색')
+    parser.add_argument('codes', nargs='*', help='종목코드 (생략 시 저장된 전체 종목)')
+    parser.add_argument('--fast', help='fast EMA 기간 (예: 8,10,12 또는 8:16:2)')
+    parser.add_argument('--slow', help='slow EMA 기간')
+    parser.add_argument('--signal', help='signal EMA 기간')
+    parser.add_argument('--alpha-offset', help='알파값 조정 (2 / (기간 + 조정값))')
+    parser.add_argument('--bias', help='히스토그램 편향 보정')
+    parser.add_argument('--workers', type=int, default=None, help='프로세스 수 (기본: CPU 코어 수)')
+    parser.add_argument('--data-dir', default='stock_data')
+    parser.add_argument('--storage-format', default='csv', help='저장 형식 (csv, feather, parquet)')
+    parser.add_argument('--fee', type=float, default=FEE)
+    parser.add_argument('--tax', type=float, default=SELL_TAX)
+    parser.add_argument('--slippage', type=float, default=SLIPPAGE)
+    parser.add_argument('--lag', type=int, default=0)
+    parser.add_argument('--top', type=int, default=20, help='출력할 상위 조합 수')
+    parser.add_argument('--output', default=None, help='전체 결과를 저장할 CSV 파일 경로')
+    args = parser.parse_args()
+
+    grid = {}
+    for name, cast in (('fast', int), ('slow', int), ('signal', int),
+                       ('alpha_offset', float), ('bias', float)):
+        value = getattr(args, name)
+        if value:
+            grid[name] = parse_values(value, cast)
+    print(f"조합 {count_combinations(dict(DEFAULT_GRID, **grid))}개 탐색 중...")
+
+    store = get_store(args.storage_format, args.data_dir)
+    table = sweep_store(store, args.codes or None, grid, max_workers=args.workers, fee=args.fee,
+                        sell_tax=args.tax, slippage=args.slippage, lag=args.lag)
+
+    if args.output:
+        table.to_csv(args.output, index=False)
+        print(f"결과 {len(table)}개 저장 완료: {args.output}")
+    print(table.head(args.top).to_string(index=False, float_format=lambda v: f'{v:.4f}'))
+
+    current = np.ones(len(table), dtype=bool)
+    for name in PARAM_COLUMNS:
+        current &= np.isclose(table[name].to_numpy(dtype='float64'), WEEKLY_PARAMS[name])
+    if current.any():
+        rank = int(np.flatnonzero(current)[0]) + 1
+        print(f"\n현재 주간 설정 순위: {rank} / {len(table)}")
+
+
+if __name__ == '__main__':
+    main()
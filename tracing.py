@@ -0,0 +1,298 @@
+import cProfile
+import io
+import json
+import os
+import pstats
+import threading
+import time
+import tracemalloc
+from contextlib import contextmanager
+from datetime import datetime
+from functools import wraps
+
+# 지원하는 프로파일링 방식
+PROFILE_MODES = ('cprofile', 'tracemalloc')
+
+
+class Tracer:
+    """
+    실행 단계별 시간 측정기
+
+    - span(): with 블록(또는 traced 데코레이터)으로 단계 시간을 기록한다. 스레드별로 중첩 가능
+    - count(): HTTP 요청 수, 처리 행 수 같은 카운터 누적
+    - summary(): 단계별 호출 수/합계/평균/최대 시간과 카운터
+    - save(): 요약과 Chrome trace 형식(traceEvents)을 JSON 하나로 저장 (chrome://tracing, Perfetto에서 열림)
+    단계별 합계는 항상 누적하고, 개별 구간은 max_spans개까지만 보관한다.
+    """
+
+    def __init__(self, enabled=True, max_spans=100_000):
+        self.enabled = enabled
+        self.max_spans = max_spans
+        self._lock = threading.Lock()
+        self._local = threading.local()
+        self.reset()
+
+    def reset(self):
+        """기록 초기화 (새 실행 시작)"""
+        with self._lock:
+            self._origin = time.perf_counter()
+            self._started = datetime.now()
+            self._spans = []
+            self._dropped = 0
+            self._stages = {}
+            self._counters = {}
+            self._threads = {}
+
+    @property
+    def started(self):
+        """기록 시작 시각"""
+        return self._started
+
+    @contextmanager
+    def span(self, name, **attrs):
+        """name 단계의 실행 시간 기록 (attrs는 trace에 함께 저장할 값)"""
+        if not self.enabled:
+            yield
+            return
+        stack = self._stack()
+        stack.append(name)
+        error = None
+        start = time.perf_counter()
+        try:
+            yield
+        except BaseException as e:
+            error = type(e).__name__
+            raise
+        finally:
+            end = time.perf_counter()
+            stack.pop()
+            self._record(name, start, end, len(stack), attrs, error)
+
+    def traced(self, name=None):
+        """함수 전체를 하나의 단계로 기록하는 데코레이터 (이름 생략 시 함수 이름)"""
+        def decorator(func):
+            stage = name or func.__name__
+
+            @wraps(func)
+            def wrapper(*args, **kwargs):
+                with self.span(stage):
+                    return func(*args, **kwargs)
+            return wrapper
+        return decorator
+
+    def count(self, name, value=1):
+        """카운터 누적"""
+        if not self.enabled:
+            return
+        with self._lock:
+            self._counters[name] = self._counters.get(name, 0) + value
+
+    def merge(self, summary):
+        """
+        다른 측정기의 summary()에서 단계별 합계와 카운터를 더함 (작업 프로세스의 측정 결과를 합칠 때)
+        개별 구간은 합치지 않는다.
+        """
+        if not self.enabled:
+            return
+        with self._lock:
+            for name, other in summary['stages'].items():
+                stats = self._stages.get(name)
+                if stats is None:
+                    stats = self._stages[name] = {'count': 0, 'total': 0.0, 'max': 0.0, 'errors': 0}
+                stats['count'] += other['count']
+                stats['total'] += other['total']
+                stats['max'] = max(stats['max'], other['max'])
+                stats['errors'] += other['errors']
+            for name, value in summary['counters'].items():
+                self._counters[name] = self._counters.get(name, 0) + value
+
+    def summary(self):
+        """단계별 통계(합계 시간 순)와 카운터"""
+        with self._lock:
+            stages = {name: dict(stats) for name, stats in self._stages.items()}
+            counters = dict(self._counters)
+            dropped = self._dropped
+            started = self._started
+            elapsed = time.perf_counter() - self._origin
+        for stats in stages.values():
+            stats['mean'] = stats['total'] / stats['count']
+            for key in ('total', 'mean', 'max'):
+                stats[key] = round(stats[key], 6)
+        return {
+            'started': started.isoformat(timespec='seconds'),
+            'elapsed': round(elapsed, 6),
+            'stages': dict(sorted(stages.items(), key=lambda item: -item[1]['total'])),
+            'counters': dict(sorted(counters.items())),
+            'dropped_spans': dropped,
+        }
+
+    def print_summary(self, limit=30):
+        """단계별 시간 요약 출력"""
+        summary = self.summary()
+        print(f"\n실행 단계별 시간 (전체 {summary['elapsed']:.2f}초)")
+        print(f"{'단계':32s} {'호출':>6s} {'합계(s)':>9s} {'평균(ms)':>9s} {'최대(ms)':>9s}")
+        for name, stats in list(summary['stages'].items())[:limit]:
+            errors = f"  오류 {stats['errors']}" if stats['errors'] else ''
+            print(f"{name:34s} {stats['count']:6d} {stats['total']:9.3f} "
+                  f"{stats['mean'] * 1000:9.2f} {stats['max'] * 1000:9.2f}{errors}")
+        if summary['counters']:
+            print("카운터: " + ', '.join(f"{name}={value:,}" for name, value in summary['counters'].items()))
+
+    def trace_events(self):
+        """Chrome trace 이벤트 목록 (완료 이벤트 'X' + 스레드 이름)"""
+        pid = os.getpid()
+        with self._lock:
+            spans = list(self._spans)
+            threads = dict(self._threads)
+        events = [{'name': 'thread_name', 'ph': 'M', 'pid': pid, 'tid': tid, 'args': {'name': thread_name}}
+                  for tid, thread_name in threads.items()]
+        for name, start, duration, tid, attrs in spans:
+            events.append({'name': name, 'ph': 'X', 'pid': pid, 'tid': tid,
+                           'ts': round(start * 1e6, 1), 'dur': round(duration * 1e6, 1), 'args': attrs})
+        return events
+
+    def save(self, path, extra=None):
+        """요약 + trace를 JSON으로 저장 (extra: 함께 저장할 실행 정보)"""
+        directory = os.path.dirname(path)
+        if directory and not os.path.exists(directory):
+            os.makedirs(directory)
+        report = {
+            'summary': self.summary(),
+            'otherData': extra or {},
+            'displayTimeUnit': 'ms',
+            'traceEvents': self.trace_events(),
+        }
+        with open(path, 'w', encoding='utf-8') as f:
+            json.dump(report, f, ensure_ascii=False, default=str)
+        return path
+
+    def _stack(self):
+        stack = getattr(self._local, 'stack', None)
+        if stack is None:
+            stack = self._local.stack = []
+        return stack
+
+    def _record(self, name, start, end, depth, attrs, error):
+        duration = end - start
+        thread = threading.current_thread()
+        with self._lock:
+            stats = self._stages.get(name)
+            if stats is None:
+                stats = self._stages[name] = {'count': 0, 'total': 0.0, 'max': 0.0, 'errors': 0}
+            stats['count'] += 1
+            stats['total'] += duration
+            stats['max'] = max(stats['max'], duration)
+            if error:
+                stats['errors'] += 1
+            if len(self._spans) >= self.max_spans:
+                self._dropped += 1
+                return
+            if error:
+                attrs = dict(attrs, error=error)
+            if depth:
+                attrs = dict(attrs, depth=depth)
+            self._threads.setdefault(thread.ident, thread.name)
+            self._spans.append((name, start - self._origin, duration, thread.ident, attrs))
+
+
+# 프로세스 전체가 공유하는 기본 측정기
+_tracer = Tracer()
+
+
+def get_tracer():
+    return _tracer
+
+
+def span(name, **attrs):
+    """기본 측정기로 단계 시간 기록 (with span('이름'): ...)"""
+    return _tracer.span(name, **attrs)
+
+
+def traced(name=None):
+    """기본 측정기로 함수 실행 시간을 기록하는 데코레이터"""
+    return _tracer.traced(name)
+
+
+def count(name, value=1):
+    """기본 측정기의 카운터 누적"""
+    _tracer.count(name, value)
+
+
+def trace_path(trace_dir, started=None, prefix='run'):
+    """실행별 trace 파일 경로 (trace_dir/run_YYYYmmdd_HHMMSS.json)"""
+    started = started or datetime.now()
+    return os.path.join(trace_dir, f"{prefix}_{started.strftime('%Y%m%d_%H%M%S')}.json")
+
+
+def parse_profile_modes(text):
+    """프로파일링 방식 문자열 파싱 ("cprofile,tracemalloc" → {'cprofile', 'tracemalloc'})"""
+    modes = {item.strip().lower() for item in (text or '').split(',') if item.strip()}
+    unknown = modes - set(PROFILE_MODES)
+    if unknown:
+        raise ValueError(f"지원하지 않는 프로파일링 방식입니다: {', '.join(sorted(unknown))} "
+                         f"(가능: {', '.join(PROFILE_MODES)})")
+    return modes
+
+
+def profile_call(func, modes, output_dir=None, top=25):
+    """
+    func()를 실행하며 프로파일링하고 결과 반환
+
+    - cprofile: 누적 시간 상위 함수 출력 (output_dir가 있으면 profile_*.prof 저장, snakeviz 등으로 확인)
+      cProfile은 호출한 스레드만 측정하므로 병렬 조회 작업은 대기 시간으로만 나타난다.
+    - tracemalloc: 실행 중 최대 메모리와 남아 있는 할당이 많은 코드 위치 출력
+      (output_dir가 있으면 allocations_*.txt 저장)
+    """
+    modes = set(modes or ())
+    stamp = datetime.now().strftime('%Y%m%d_%H%M%S')
+    if output_dir and modes and not os.path.exists(output_dir):
+        os.makedirs(output_dir)
+
+    profiler = cProfile.Profile() if 'cprofile' in modes else None
+    if 'tracemalloc' in modes:
+        tracemalloc.start(10)
+    try:
+        if profiler is not None:
+            result = profiler.runcall(func)
+        else:
+            result = func()
+    finally:
+        if 'tracemalloc' in modes:
+            snapshot = tracemalloc.take_snapshot()
+            _, peak = tracemalloc.get_traced_memory()
+            tracemalloc.stop()
+            _report_allocations(snapshot, peak, top, output_dir, stamp)
+        if profiler is not None:
+            _report_profile(profiler, top, output_dir, stamp)
+    return result
+
+
+def _report_profile(profiler, top, output_dir, stamp):
+    stream = io.StringIO()
+    stats = pstats.Stats(profiler, stream=stream)
+    stats.sort_stats('cumulative').print_stats(top)
+    print(f"\ncProfile 누적 시간 상위 {top}개 함수")
+    print(stream.getvalue())
+    if output_dir:
+        path = os.path.join(output_dir, f'profile_{stamp}.prof')
+        stats.dump_stats(path)
+        print(f"cProfile 결과 저장: {path}")
+
+
+def _report_allocations(snapshot, peak, top, output_dir, stamp):
+    snapshot = snapshot.filter_traces([
+        tracemalloc.Filter(False, tracemalloc.__file__),
+        tracemalloc.Filter(False, '<frozen importlib._bootstrap*>'),
+    ])
+    lines = [f"최대 메모리 사용량: {peak / 2 ** 20:.2f} MB",
+             f"할당이 많은 코드 위치 상위 {top}개 (실행 종료 시점 기준)"]
+    for stat in snapshot.statistics('lineno')[:top]:
+        frame = stat.traceback[0]
+        lines.append(f"{stat.size / 2 ** 10:10.1f} KB {stat.count:8d}회  {frame.filename}:{frame.lineno}")
+    text = '\n'.join(lines)
+    print('\n' + text)
+    if output_dir:
+        path = os.path.join(output_dir, f'allocations_{stamp}.txt')
+        with open(path, 'w', encoding='utf-8') as f:
+            f.write(text + '\n')
+        print(f"tracemalloc 결과 저장: {path}")
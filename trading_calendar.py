@@ -0,0 +1,165 @@
+import argparse
+import glob
+import os
+
+import numpy as np
+import pandas as pd
+
+# 휴장일 테이블 (stock_data에 함께 저장되어 실행 간에 유지됨)
+HOLIDAY_FILE = 'krx_holidays.csv'
+
+# 달력 범위
+CALENDAR_START = '2000-01-01'
+CALENDAR_END = '2035-12-31'
+
+# 아직 시세 데이터로 확인할 수 없는 앞으로의 휴장일 (공표된 일정 기준, 변경 시 갱신 필요)
+SCHEDULED_HOLIDAYS = [
+    '2026-09-24', '2026-09-25',                # 추석
+    '2026-10-05',                              # 개천절 대체공휴일
+    '2026-10-09',                              # 한글날
+    '2026-12-25',                              # 성탄절
+    '2026-12-31',                              # 연말 휴장일
+    '2027-01-01',                              # 신정
+    '2027-02-08', '2027-02-09',                # 설날, 대체공휴일
+    '2027-03-01',                              # 삼일절
+    '2027-05-05',                              # 어린이날
+    '2027-05-13',                              # 부처님오신날
+    '2027-08-16',                              # 광복절 대체공휴일
+    '2027-09-14', '2027-09-15', '2027-09-16',  # 추석
+    '2027-10-04',                              # 개천절 대체공휴일
+    '2027-10-11',                              # 한글날 대체공휴일
+    '2027-12-27',                              # 성탄절 대체공휴일
+    '2027-12-31',                              # 연말 휴장일
+]
+
+
+def _to_day(date):
+    return np.datetime64(pd.Timestamp(date).date(), 'D')
+
+
+class TradingCalendar:
+    """
+    KRX 거래일 달력
+
+    CALENDAR_START ~ CALENDAR_END 사이의 평일에서 휴장일을 뺀 거래일을
+    정렬된 배열로 들고 있으며, 모든 조회는 이진 탐색(O(log n))으로 처리한다.
+    """
+
+    def __init__(self, holidays=(), start=CALENDAR_START, end=CALENDAR_END):
+        self.holidays = np.unique(np.array([_to_day(d) for d in holidays], dtype='datetime64[D]'))
+        days = np.arange(np.datetime64(start, 'D'), np.datetime64(end, 'D') + 1)
+        weekdays = np.is_busday(days)
+        self._days = days[weekdays & ~np.isin(days, self.holidays)]
+
+    def __len__(self):
+        return len(self._days)
+
+    def is_trading_day(self, date):
+        """거래일 여부"""
+        day = _to_day(date)
+        idx = np.searchsorted(self._days, day)
+        return idx < len(self._days) and self._days[idx] == day
+
+    def next_trading_day(self, date):
+        """date 다음 거래일 (date 제외)"""
+        idx = np.searchsorted(self._days, _to_day(date), side='right')
+        return self._timestamp(idx)
+
+    def previous_trading_day(self, date):
+        """date 이전 거래일 (date 제외)"""
+        idx = np.searchsorted(self._days, _to_day(date), side='left') - 1
+        return self._timestamp(idx)
+
+    def trading_days_between(self, start, end):
+        """start 다음 날부터 end까지(end 포함)의 거래일 수"""
+        left = np.searchsorted(self._days, _to_day(start), side='right')
+        right = np.searchsorted(self._days, _to_day(end), side='right')
+        return int(max(0, right - left))
+
+    def trading_days(self, start, end):
+        """start ~ end(둘 다 포함) 사이의 거래일 목록"""
+        left = np.searchsorted(self._days, _to_day(start), side='left')
+        right = np.searchsorted(self._days, _to_day(end), side='right')
+        return pd.DatetimeIndex(self._days[left:right])
+
+    def _timestamp(self, idx):
+        if idx < 0 or idx >= len(self._days):
+            return None
+        return pd.Timestamp(self._days[idx])
+
+
+def learn_holidays(data_dir='stock_data'):
+    """
+    저장된 일간 시세 파일로 휴장일 추정
+
+    모든 종목의 거래일을 합친 뒤, 그 기간 안의 평일 중 어떤 종목도 거래하지 않은 날을 휴장일로 본다.
+    (한 종목의 거래정지일이 휴장일로 잘못 잡히지 않도록 종목 전체의 합집합 사용)
+    """
+    observed = set()
+    for path in glob.glob(os.path.join(data_dir, '*_daily.csv')):
+        code = os.path.basename(path)[:-len('_daily.csv')]
+        if not code.isdigit():
+            continue
+        dates = pd.read_csv(path, usecols=['date'])['date']
+        observed.update(pd.to_datetime(dates).values.astype('datetime64[D]'))
+    if not observed:
+        return []
+
+    observed = np.array(sorted(observed), dtype='datetime64[D]')
+    days = np.arange(observed[0], observed[-1] + 1)
+    missing = days[np.is_busday(days) & ~np.isin(days, observed)]
+    return [pd.Timestamp(day).strftime('%Y-%m-%d') for day in missing]
+
+
+def build_holiday_table(data_dir='stock_data'):
+    """관측된 휴장일 + 예정된 휴장일로 휴장일 테이블 생성 및 저장"""
+    observed = learn_holidays(data_dir)
+    last_observed = observed[-1] if observed else ''
+    scheduled = [day for day in SCHEDULED_HOLIDAYS if day > last_observed]
+
+    table = pd.DataFrame({
+        'date': observed + scheduled,
+        'source': ['observed'] * len(observed) + ['scheduled'] * len(scheduled),
+    })
+    if not os.path.exists(data_dir):
+        os.makedirs(data_dir)
+    table.to_csv(os.path.join(data_dir, HOLIDAY_FILE), index=False)
+    return table
+
+
+def load_calendar(data_dir='stock_data'):
+    """
+    거래일 달력 로드
+    휴장일 테이블이 없으면 저장된 시세로 새로 만든다.
+    테이블에 없는 예정 휴장일도 항상 포함한다.
+    """
+    path = os.path.join(data_dir, HOLIDAY_FILE)
+    if os.path.exists(path):
+        holidays = pd.read_csv(path)['date'].tolist()
+    else:
+        holidays = build_holiday_table(data_dir)['date'].tolist()
+    return TradingCalendar(holidays + SCHEDULED_HOLIDAYS)
+
+
+def main():
+    parser = argparse.ArgumentParser(description='KRX 거래일 달력 도구')
+    parser.add_argument('command', choices=['learn', 'next', 'previous'])
+    parser.add_argument('date', nargs='?', default=None, help='기준 날짜 (기본: 오늘)')
+    parser.add_argument('--data-dir', default='stock_data')
+    args = parser.parse_args()
+
+    if args.command == 'learn':
+        table = build_holiday_table(args.data_dir)
+        print(f"휴장일 {len(table)}개 저장 완료: {os.path.join(args.data_dir, HOLIDAY_FILE)}")
+        return
+
+    calendar = load_calendar(args.data_dir)
+    date = args.date or pd.Timestamp.now().strftime('%Y-%m-%d')
+    if args.command == 'next':
+        print(calendar.next_trading_day(date).strftime('%Y-%m-%d'))
+    else:
+        print(calendar.previous_trading_day(date).strftime('%Y-%m-%d'))
+
+
+if __name__ == '__main__':
+    main()